@@ -2,28 +2,41 @@
 import sys
 import logging
 import threading
+import multiprocessing
 import time
+from queue import Queue
 from pathlib import Path
 
 # Local imports
 from modules.utils.logging_setup import setup_enhanced_logging
 from modules.utils.helpers import load_config
+from modules.utils.bot_api import configure_bot_api
+from modules.utils.send_queue import QueuedBot
+from modules.utils.dispatch import CategoryDispatcher, CATEGORY_WORKERS
+from modules.utils.webhook import WebhookUpdater, UPDATE_QUEUE_SIZE
 from modules.auth.handlers import AuthHandlers
 from modules.system.power import PowerControl
 from modules.system.info import SystemInfo
 from modules.system.monitoring import SystemMonitoring
+from modules.system.jobs import JobControl
 from modules.file_manager.handlers import FileManagerHandlers
 from modules.webcam.capture import WebcamCapture
 from modules.webcam.video import WebcamVideo
 
-from telegram.ext import Updater, CommandHandler, MessageHandler, Filters
+from telegram.error import RetryAfter
+from telegram.ext import CommandHandler, MessageHandler, Filters, Defaults, JobQueue
+from telegram.utils.request import Request
 
 class TelegramBot:
     """Main bot class yang mengkoordinasikan semua modul"""
+
+    # Thread handler per kategori + dispatcher / polling, ditambah thread job dan pengirim SendQueue
+    REQUEST_POOL_SIZE = sum(CATEGORY_WORKERS.values()) + 20
     
     def __init__(self):
         self.logger = setup_enhanced_logging()
         self.config = load_config()
+        self.bot_api = configure_bot_api(self.config.BOT_API_URL, self.config.BOT_API_LOCAL_MODE)
         self.updater = None
         self.dispatcher = None
         
@@ -32,6 +45,7 @@ class TelegramBot:
         self.power = PowerControl(self.auth)
         self.system_info = SystemInfo(self.auth)
         self.monitoring = SystemMonitoring(self.auth)
+        self.job_control = JobControl(self.auth)
         self.file_manager = FileManagerHandlers(self.auth)
         self.webcam_capture = WebcamCapture(self.auth)
         self.webcam_video = WebcamVideo(self.auth)
@@ -57,6 +71,9 @@ class TelegramBot:
         # Monitoring
         self.monitoring.register_handlers(dp)
         
+        # Background jobs
+        self.job_control.register_handlers(dp)
+        
         # File management
         self.file_manager.register_handlers(dp)
         
@@ -108,7 +125,9 @@ class TelegramBot:
         message += "/battery \\- Check battery status\n"
         message += "/processes \\- View top active processes\n"
         message += "/screenshot \\- Take a screenshot\n"
-        message += "/closeapp \\- Force close foreground app\n\n"
+        message += "/closeapp \\- Force close foreground app\n"
+        message += "/jobs \\- List running background jobs\n"
+        message += "/kill \\- Cancel a background job \\(/kill <id\\>\\)\n\n"
         
         # Webcam Control
         message += "*Webcam Control* 📷\n"
@@ -118,12 +137,21 @@ class TelegramBot:
         
         # File Management Commands
         message += "*File Management Commands* 📂\n"
-        message += "/ls \\- List files in current directory\n"
+        message += "/ls \\- Browse current directory with buttons\n"
+        message += "/lsall \\- List every file in current directory as text\n"
         message += "/cd \\- Change directory\n"
-        message += "/download \\- Download file\n"
+        message += "/download \\- Download file or folder\n"
         message += "/mkdir \\- Create directory\n"
         message += "/delete \\- Delete file/folder\n"
         message += "/search \\- Search for files\n"
+        message += "/index \\- Index current folder for instant search \\(/index status\\)\n"
+        message += "/du \\- Disk usage of current folder \\(/du \\-f to rescan\\)\n"
+        message += "/dupes \\- Find duplicate files \\(/dupes min\\=10M\\)\n"
+        message += "/grep \\- Search inside files \\(/grep <regex\\> \\[path\\] \\[glob\\]\\)\n"
+        message += "/head, /tail \\- Show first/last lines of a file \\(/tail \\-n 50 app\\.log\\)\n"
+        message += "/tail \\-f \\- Follow a growing file, stop with /kill\n"
+        message += "/watch \\- Notify about changes in a folder, stop with /kill\n"
+        message += "/thumbs \\- Thumbnail contact sheet of photos and videos in a folder\n"
         message += "\\_Send any file to upload it\\_\n\n"
         
         message += "\\_Use these commands to control your laptop\\.\\_"
@@ -153,6 +181,10 @@ class TelegramBot:
     
     def error_handler(self, update, context):
         """Simple error handler"""
+        if isinstance(context.error, RetryAfter):
+            # SendQueue sudah menunggu dan mengulang; membalas di sini hanya menambah flood
+            self.logger.warning(f"Flood limit still hit after retries: retry after {context.error.retry_after}s")
+            return
         self.logger.error(f"Error occurred: {context.error}")
         if update and update.effective_message:
             try:
@@ -186,6 +218,17 @@ class TelegramBot:
         notification_thread = threading.Thread(target=notification_worker, daemon=True)
         notification_thread.start()
     
+    def start_receiving(self):
+        """Terima update lewat webhook jika WEBHOOK_URL diisi, fallback ke long polling jika gagal"""
+        self.updater.start_receiving(
+            self.config.WEBHOOK_URL,
+            listen=self.config.WEBHOOK_LISTEN,
+            port=self.config.WEBHOOK_PORT,
+            secret=self.config.WEBHOOK_SECRET,
+            polling_timeout=30,
+            read_latency=5
+        )
+
     def run(self):
         """Main run method"""
         max_retries = 5
@@ -195,16 +238,28 @@ class TelegramBot:
             try:
                 self.logger.info(f"Starting bot (attempt {retry_count + 1}/{max_retries})...")
                 
-                # Create updater
-                self.updater = Updater(token=self.config.BOT_TOKEN, use_context=True)
+                # Create updater; semua send / edit lewat SendQueue (token bucket + RetryAfter backoff)
+                # dan semua handler jalan async di executor kategorinya (CategoryDispatcher)
+                bot = QueuedBot(
+                    token=self.config.BOT_TOKEN,
+                    base_url=self.bot_api.base_url,
+                    base_file_url=self.bot_api.base_file_url,
+                    request=Request(con_pool_size=self.REQUEST_POOL_SIZE),
+                    defaults=Defaults(run_async=True)
+                )
+                job_queue = JobQueue()
+                dispatcher = CategoryDispatcher(bot, Queue(maxsize=UPDATE_QUEUE_SIZE), job_queue=job_queue)
+                job_queue.set_dispatcher(dispatcher)
+                self.updater = WebhookUpdater(dispatcher=dispatcher, workers=None)  # Worker diatur per kategori oleh dispatcher
+                if self.bot_api.local_mode:
+                    self.logger.info(f"Using local Bot API server at {self.bot_api.url} (file:// sends, 2 GB limit)")
                 self.dispatcher = self.updater.dispatcher
                 
                 # Setup handlers
                 self.setup_handlers()
                 
-                # Start polling
-                self.logger.info("Starting polling...")
-                self.updater.start_polling(timeout=30, read_latency=5)
+                # Start webhook / polling
+                self.start_receiving()
                 self.logger.info("✅ Bot started successfully!")
                 
                 # Send startup notification
@@ -263,4 +318,5 @@ def main():
             input("Press Enter to exit...")
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # Process pool /grep di build PyInstaller
     main()
\ No newline at end of file
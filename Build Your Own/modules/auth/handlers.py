@@ -27,6 +27,9 @@ class AuthHandlers:
         def wrapper(update, context, *args, **kwargs):
             user_id = update.effective_user.id
             if user_id != self.config.AUTHORIZED_USER_ID or not context.user_data.get('authenticated', False):
+                if update.callback_query:
+                    update.callback_query.answer("🔐 You need to /login first", show_alert=True)
+                    return
                 update.message.reply_text(
                     "🔐 Not so fast, sweetheart 😘\n"
                     "You need to /login first so I know it's really you 💖"
@@ -0,0 +1,282 @@
+# modules/file_manager/archive.py
+import os
+import time
+import zlib
+import queue
+import struct
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Tipe file yang sudah terkompres: disimpan (stored) tanpa deflate ulang
+COMPRESSED_EXTENSIONS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic',
+    '.mp4', '.mkv', '.avi', '.mov', '.webm', '.m4v',
+    '.mp3', '.aac', '.ogg', '.flac', '.m4a', '.opus',
+    '.zip', '.7z', '.rar', '.gz', '.bz2', '.xz', '.zst', '.cab',
+    '.docx', '.xlsx', '.pptx', '.jar', '.apk', '.msi',
+}
+
+CHUNK_SIZE = 1024 * 1024
+ZIP64_LIMIT = 0xFFFFFFFF
+METHOD_STORED = 0
+METHOD_DEFLATED = 8
+FLAG_DATA_DESCRIPTOR = 0x08
+FLAG_UTF8 = 0x800
+
+def _dos_datetime(mtime):
+    """Konversi mtime ke (dos_time, dos_date) untuk header zip"""
+    t = time.localtime(mtime)
+    if t.tm_year < 1980:
+        return 0, (0 << 9) | (1 << 5) | 1
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+class _CompressTask:
+    """Kompres satu file di worker, hasil di-stream lewat queue terbatas (memory tetap kecil)"""
+
+    DONE = object()
+
+    def __init__(self, path, method, level, max_chunks):
+        self.path = path
+        self.method = method
+        self.level = level
+        self.chunks = queue.Queue(maxsize=max_chunks)
+        self.crc = 0
+        self.size = 0
+        self.compressed_size = 0
+        self.error = None
+        self.cancelled = threading.Event()
+
+    def _put(self, item):
+        while not self.cancelled.is_set():
+            try:
+                self.chunks.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self):
+        try:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15) if self.method == METHOD_DEFLATED else None
+            with open(self.path, 'rb') as f:
+                while not self.cancelled.is_set():
+                    data = f.read(CHUNK_SIZE)
+                    if not data:
+                        break
+                    self.crc = zlib.crc32(data, self.crc)
+                    self.size += len(data)
+                    out = compressor.compress(data) if compressor else data
+                    if out:
+                        self.compressed_size += len(out)
+                        if not self._put(out):
+                            return
+            if self.cancelled.is_set():
+                return
+            if compressor:
+                tail = compressor.flush()
+                if tail:
+                    self.compressed_size += len(tail)
+                    if not self._put(tail):
+                        return
+        except Exception as e:
+            self.error = e
+        self._put(self.DONE)
+
+class StreamingZipWriter:
+    """Zip writer streaming: file dikompres paralel di thread pool, output ditulis berurutan ke sink.
+
+    Sink cukup punya method write(bytes). Offset dihitung sendiri, jadi sink tidak perlu seekable.
+    Entry memakai data descriptor dan ZIP64 jika perlu, sehingga ukuran file tidak terbatas 4 GB.
+    """
+
+    def __init__(self, sink, workers=4, level=6, max_chunks=8):
+        self.sink = sink
+        self.workers = workers
+        self.level = level
+        self.max_chunks = max_chunks
+        self.offset = 0
+        self.entries = []
+        self.skipped = []
+        self.files_done = 0
+        self.bytes_in = 0
+        self.cancelled = threading.Event()
+        self.logger = logging.getLogger(__name__)
+
+    def _write(self, data):
+        self.sink.write(data)
+        self.offset += len(data)
+
+    @staticmethod
+    def collect(root):
+        """Kumpulkan (path, arcname, stat) semua file dan folder di bawah root"""
+        base = os.path.basename(os.path.normpath(root)) or 'archive'
+        items = []
+        stack = [(root, base)]
+        while stack:
+            path, arc = stack.pop()
+            items.append((path, arc + '/', None))
+            try:
+                with os.scandir(path) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            for entry in entries:
+                arcname = f"{arc}/{entry.name}"
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, arcname))
+                    elif entry.is_file():
+                        items.append((entry.path, arcname, entry.stat()))
+                except OSError:
+                    continue
+        return items
+
+    def write_tree(self, root, on_progress=None):
+        """Tulis seluruh folder ke zip lalu tutup central directory"""
+        items = self.collect(root)
+        files = [item for item in items if item[2] is not None]
+        self.total_files = len(files)
+        self.total_bytes = sum(stats.st_size for _, _, stats in files)
+
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='zip')
+        window = []
+        pending = iter(items)
+        try:
+            def fill():
+                # Jaga maksimal `workers` file yang sedang dikompres sekaligus
+                while len(window) < self.workers:
+                    item = next(pending, None)
+                    if item is None:
+                        return
+                    path, arcname, stats = item
+                    if stats is None:
+                        window.append((item, None))
+                        continue
+                    ext = os.path.splitext(path)[1].lower()
+                    method = METHOD_STORED if ext in COMPRESSED_EXTENSIONS else METHOD_DEFLATED
+                    task = _CompressTask(path, method, self.level, self.max_chunks)
+                    executor.submit(task.run)
+                    window.append((item, task))
+
+            fill()
+            while window:
+                if self.cancelled.is_set():
+                    raise InterruptedError("Archive cancelled")
+                (path, arcname, stats), task = window.pop(0)
+                if task is None:
+                    self._add_directory(arcname)
+                else:
+                    self._add_file(arcname, stats, task)
+                    self.files_done += 1
+                    self.bytes_in += task.size
+                    if on_progress:
+                        on_progress(self)
+                fill()
+
+            self._finish()
+        finally:
+            for _, task in window:
+                if task is not None:
+                    task.cancelled.set()
+            executor.shutdown(wait=False)
+
+    def _add_directory(self, arcname):
+        name = arcname.encode('utf-8')
+        dos_time, dos_date = _dos_datetime(time.time())
+        offset = self.offset
+        self._write(struct.pack('<IHHHHHIIIHH', 0x04034b50, 20, FLAG_UTF8, METHOD_STORED,
+                                dos_time, dos_date, 0, 0, 0, len(name), 0))
+        self._write(name)
+        self.entries.append({'name': name, 'method': METHOD_STORED, 'flags': FLAG_UTF8, 'time': dos_time,
+                             'date': dos_date, 'crc': 0, 'compressed': 0, 'size': 0, 'offset': offset,
+                             'external': 0x10, 'zip64': False})
+
+    def _add_file(self, arcname, stats, task):
+        name = arcname.encode('utf-8')
+        dos_time, dos_date = _dos_datetime(stats.st_mtime)
+        zip64 = stats.st_size >= ZIP64_LIMIT - (ZIP64_LIMIT >> 4)
+        flags = FLAG_DATA_DESCRIPTOR | FLAG_UTF8
+        header_written = False
+        offset = self.offset
+
+        while True:
+            # Cek cancel per chunk: /kill tidak perlu menunggu satu file multi-GB selesai dikompres
+            if self.cancelled.is_set():
+                task.cancelled.set()  # Task ini sudah keluar dari window, worker-nya dihentikan di sini
+                raise InterruptedError("Archive cancelled")
+            try:
+                item = task.chunks.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if item is _CompressTask.DONE:
+                break
+            if not header_written:
+                self._write_local_header(name, task.method, flags, dos_time, dos_date, zip64)
+                header_written = True
+            self._write(item)
+
+        if task.error is not None:
+            if header_written:
+                raise task.error  # Data sudah setengah tertulis, archive tidak bisa diselamatkan
+            self.skipped.append((arcname, str(task.error)))
+            return
+
+        if not header_written:
+            self._write_local_header(name, task.method, flags, dos_time, dos_date, zip64)
+
+        if zip64:
+            self._write(struct.pack('<IIQQ', 0x08074b50, task.crc, task.compressed_size, task.size))
+        else:
+            self._write(struct.pack('<IIII', 0x08074b50, task.crc, task.compressed_size, task.size))
+
+        self.entries.append({'name': name, 'method': task.method, 'flags': flags, 'time': dos_time,
+                             'date': dos_date, 'crc': task.crc, 'compressed': task.compressed_size,
+                             'size': task.size, 'offset': offset, 'external': 0, 'zip64': zip64})
+
+    def _write_local_header(self, name, method, flags, dos_time, dos_date, zip64):
+        extra = struct.pack('<HHQQ', 0x0001, 16, 0, 0) if zip64 else b''
+        self._write(struct.pack('<IHHHHHIIIHH', 0x04034b50, 45 if zip64 else 20, flags, method,
+                                dos_time, dos_date, 0, 0, 0, len(name), len(extra)))
+        self._write(name)
+        self._write(extra)
+
+    def _finish(self):
+        """Tulis central directory dan end of central directory (ZIP64 jika perlu)"""
+        cd_offset = self.offset
+        for entry in self.entries:
+            extra_fields = []
+            size, compressed, offset = entry['size'], entry['compressed'], entry['offset']
+            # Ikuti keputusan local header: entry yang ditulis dengan ZIP64 juga ZIP64 di central directory
+            if entry['zip64'] or size >= ZIP64_LIMIT or compressed >= ZIP64_LIMIT:
+                extra_fields.extend((size, compressed))
+                size = compressed = ZIP64_LIMIT
+            if offset >= ZIP64_LIMIT:
+                extra_fields.append(offset)
+                offset = ZIP64_LIMIT
+            extra = b''
+            if extra_fields:
+                extra = struct.pack('<HH', 0x0001, 8 * len(extra_fields)) + \
+                    struct.pack('<' + 'Q' * len(extra_fields), *extra_fields)
+            version = 45 if extra_fields else 20
+            self._write(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, version, version, entry['flags'],
+                                    entry['method'], entry['time'], entry['date'], entry['crc'],
+                                    compressed, size, len(entry['name']), len(extra), 0, 0, 0,
+                                    entry['external'], offset))
+            self._write(entry['name'])
+            self._write(extra)
+
+        cd_size = self.offset - cd_offset
+        count = len(self.entries)
+
+        if count >= 0xFFFF or cd_offset >= ZIP64_LIMIT or cd_size >= ZIP64_LIMIT:
+            zip64_eocd_offset = self.offset
+            self._write(struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, 45, 45, 0, 0,
+                                    count, count, cd_size, cd_offset))
+            self._write(struct.pack('<IIQI', 0x07064b50, 0, zip64_eocd_offset, 1))
+            self._write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, min(count, 0xFFFF), min(count, 0xFFFF),
+                                    min(cd_size, ZIP64_LIMIT), min(cd_offset, ZIP64_LIMIT), 0))
+        else:
+            self._write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, count, count, cd_size, cd_offset, 0))
@@ -0,0 +1,254 @@
+# modules/file_manager/browser.py
+import os
+import logging
+import threading
+from collections import OrderedDict
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
+from modules.utils.helpers import format_size, format_time
+
+class PathTokenTable:
+    """Mapping token pendek <-> path supaya callback_data muat di batas 64 byte Telegram"""
+
+    def __init__(self, max_size=5000):
+        self.max_size = max_size
+        self._by_token = OrderedDict()
+        self._by_path = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _encode(number):
+        """Encode integer ke base36"""
+        digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+        result = ''
+        while True:
+            number, rem = divmod(number, 36)
+            result = digits[rem] + result
+            if number == 0:
+                return result
+
+    def token_for(self, path):
+        """Return token untuk path (buat baru jika belum ada)"""
+        with self._lock:
+            token = self._by_path.get(path)
+            if token is not None:
+                self._by_token.move_to_end(token)
+                return token
+
+            self._counter += 1
+            token = self._encode(self._counter)
+            self._by_token[token] = path
+            self._by_path[path] = token
+
+            # Evict token paling lama (LRU)
+            while len(self._by_token) > self.max_size:
+                old_token, old_path = self._by_token.popitem(last=False)
+                self._by_path.pop(old_path, None)
+
+            return token
+
+    def path_for(self, token):
+        """Return path untuk token, atau None jika sudah expired"""
+        with self._lock:
+            path = self._by_token.get(token)
+            if path is not None:
+                self._by_token.move_to_end(token)
+            return path
+
+class FileBrowser:
+    """File browser inline keyboard: satu message per browsing, di-edit setiap tap"""
+
+    PAGE_SIZE = 20
+    LABEL_MAX = 40
+    CALLBACK_PREFIX = 'fb'
+
+    def __init__(self, file_ops):
+        self.file_ops = file_ops
+        self.tokens = PathTokenTable()
+        self.logger = logging.getLogger(__name__)
+
+    def _callback(self, action, path, page=0):
+        """Buat callback_data: fb|<action>|<token>|<page>"""
+        return f"{self.CALLBACK_PREFIX}|{action}|{self.tokens.token_for(path)}|{page}"
+
+    def _label(self, text):
+        """Potong label button yang terlalu panjang"""
+        if len(text) > self.LABEL_MAX:
+            return text[:self.LABEL_MAX - 1] + '…'
+        return text
+
+    def render(self, path, page=0):
+        """Render (text, reply_markup) untuk path dan halaman tertentu"""
+        content = self.file_ops.list_directory_content(path)
+
+        if content['type'] == 'drives':
+            text = "💽 Available Drives\n\nTap a drive to open it."
+            buttons = []
+            for drive in content['drives']:
+                if drive['accessible']:
+                    label = f"💽 {drive['name']}  {drive['free_space']} free / {drive['total_space']}"
+                    buttons.append([InlineKeyboardButton(self._label(label),
+                                                         callback_data=self._callback('o', drive['path']))])
+                elif drive['state'] == 'unresponsive':
+                    buttons.append([InlineKeyboardButton(f"⏳ {drive['name']} (not responding)",
+                                                         callback_data=self._callback('w', drive['name']))])
+                else:
+                    buttons.append([InlineKeyboardButton(f"🚫 {drive['name']} (not accessible)",
+                                                         callback_data=self._callback('x', drive['name']))])
+            buttons.append([InlineKeyboardButton("🔄 Refresh",
+                                                 callback_data=self._callback('p', self.file_ops.DEFAULT_PATH))])
+            return text, InlineKeyboardMarkup(buttons)
+
+        listing = content['listing']
+        total_entries = len(listing.entries)
+        total_pages = max(1, (total_entries + self.PAGE_SIZE - 1) // self.PAGE_SIZE)
+        page = max(0, min(page, total_pages - 1))
+        start = page * self.PAGE_SIZE
+
+        buttons = []
+        for entry in listing.iter_entries(start, start + self.PAGE_SIZE):
+            entry_path = os.path.join(path, entry.name)
+            if entry.denied:
+                buttons.append([InlineKeyboardButton(self._label(f"🚫 {entry.name}/"),
+                                                     callback_data=self._callback('x', entry_path))])
+            elif entry.is_dir:
+                buttons.append([InlineKeyboardButton(self._label(f"📁 {entry.name}/"),
+                                                     callback_data=self._callback('o', entry_path))])
+            else:
+                label = f"📄 {entry.name} ({format_size(entry.size)})"
+                buttons.append([InlineKeyboardButton(self._label(label),
+                                                     callback_data=self._callback('f', entry_path))])
+
+        nav = []
+        if page > 0:
+            nav.append(InlineKeyboardButton("⬅️ Prev", callback_data=self._callback('p', path, page - 1)))
+        if page < total_pages - 1:
+            nav.append(InlineKeyboardButton("Next ➡️", callback_data=self._callback('p', path, page + 1)))
+        if nav:
+            buttons.append(nav)
+
+        buttons.append([
+            InlineKeyboardButton("⬆️ Up", callback_data=self._callback('u', path)),
+            InlineKeyboardButton("💽 Drives", callback_data=self._callback('o', self.file_ops.DEFAULT_PATH)),
+            InlineKeyboardButton("🔄 Refresh", callback_data=self._callback('p', path, page)),
+        ])
+
+        text = (
+            f"📂 {path}\n"
+            f"📊 Items: {total_entries} | Page {page + 1}/{total_pages}\n\n"
+            "Tap a folder to open it, tap a file for details."
+        )
+        return text, InlineKeyboardMarkup(buttons)
+
+    def open(self, update, context):
+        """Kirim message browser baru untuk current path (/ls)"""
+        current_path = context.user_data.get('current_path', self.file_ops.DEFAULT_PATH)
+        text, markup = self.render(current_path)
+        update.message.reply_text(text, reply_markup=markup)
+
+    def handle_callback(self, update, context):
+        """Handle tap pada button browser, edit message yang sama"""
+        query = update.callback_query
+
+        try:
+            _, action, token, page = query.data.split('|')
+            page = int(page)
+        except ValueError:
+            query.answer("❌ Invalid button")
+            return
+
+        path = self.tokens.path_for(token)
+        if path is None:
+            query.answer("⌛ This browser has expired, send /ls again", show_alert=True)
+            return
+
+        if action == 'x':
+            query.answer("🚫 Access denied", show_alert=True)
+            return
+        
+        if action == 'w':
+            query.answer("⏳ This drive did not respond in time, tap Refresh to probe it again", show_alert=True)
+            return
+
+        if action == 'f':
+            try:
+                stats = os.stat(path)
+                query.answer(
+                    f"📄 {os.path.basename(path)}\n📦 {format_size(stats.st_size)}\n🕒 {format_time(stats.st_mtime)}",
+                    show_alert=True
+                )
+            except OSError as e:
+                query.answer(f"❌ {str(e)}", show_alert=True)
+            return
+
+        if action == 'u':
+            target = self.file_ops.change_directory(path, '..')
+            page = 0
+        else:
+            target = path
+
+        try:
+            text, markup = self.render(target, page)
+        except (PermissionError, FileNotFoundError) as e:
+            query.answer(f"❌ {str(e)}", show_alert=True)
+            return
+
+        context.user_data['current_path'] = target
+        query.answer()
+
+        if action == 'o' and target != self.file_ops.DEFAULT_PATH:
+            self.file_ops.listing_cache.prefetch_children(target)
+
+        try:
+            query.edit_message_text(text, reply_markup=markup)
+        except BadRequest as e:
+            if 'not modified' not in str(e).lower():
+                raise
+
+class DiskUsageView:
+    """Tampilan /du: top-N isi folder terbesar dengan button untuk drill-down di size tree yang sudah di-scan"""
+
+    TOP_N = 15
+    BAR_WIDTH = 10
+    CALLBACK_PREFIX = 'du'
+
+    def __init__(self, usage, tokens):
+        self.usage = usage
+        self.tokens = tokens
+
+    def callback(self, action, path):
+        """Buat callback_data: du|<action>|<token>"""
+        return f"{self.CALLBACK_PREFIX}|{action}|{self.tokens.token_for(path)}"
+
+    def render(self, node):
+        """Render (text, reply_markup) untuk satu node size tree"""
+        lines = [
+            f"📊 Disk usage: {node.path}",
+            f"💾 {format_size(node.total)} in {node.total_files:,} files, {node.total_dirs:,} folders",
+        ]
+        if node.denied:
+            lines.append("🚫 Access denied for this folder")
+        lines.append("")
+
+        buttons = []
+        for size, name, child in node.largest(self.TOP_N):
+            share = size / node.total if node.total else 0
+            bar = '█' * round(share * self.BAR_WIDTH)
+            icon, suffix = ('📁', '/') if child is not None else ('📄', '')
+            lines.append(f"{icon} {name}{suffix}  {format_size(size)}  {share:.0%} {bar}")
+            if child is not None:
+                label = f"📁 {name}/  {format_size(size)}"
+                if len(label) > FileBrowser.LABEL_MAX:
+                    label = label[:FileBrowser.LABEL_MAX - 1] + '…'
+                buttons.append([InlineKeyboardButton(label, callback_data=self.callback('o', child.path))])
+
+        if not node.children and not node.top_files:
+            lines.append("📭 Empty folder")
+        lines += ["", f"🕒 Scanned {format_time(node.scanned_at)}"]
+
+        buttons.append([
+            InlineKeyboardButton("⬆️ Up", callback_data=self.callback('u', node.path)),
+            InlineKeyboardButton("🔄 Refresh", callback_data=self.callback('r', node.path)),
+        ])
+        return "\n".join(lines), InlineKeyboardMarkup(buttons)
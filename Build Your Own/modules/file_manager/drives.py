@@ -0,0 +1,145 @@
+# modules/file_manager/drives.py
+import os
+import time
+import string
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+import psutil
+from modules.utils.helpers import format_size
+
+if os.name == 'nt':
+    from ctypes import windll
+else:
+    windll = None
+
+class DriveInfo:
+    """Hasil probe satu drive / mount point"""
+
+    __slots__ = ('name', 'path', 'state', 'free', 'total', 'error', 'checked_at')
+
+    def __init__(self, name, path, state, free=None, total=None, error=None):
+        self.name = name
+        self.path = path
+        self.state = state  # 'ok', 'unresponsive', atau 'inaccessible'
+        self.free = free
+        self.total = total
+        self.error = error
+        self.checked_at = time.monotonic()
+
+    @property
+    def accessible(self):
+        return self.state == 'ok'
+
+    def to_dict(self):
+        """Format dict lama yang dipakai listing / browser"""
+        return {
+            'name': self.name,
+            'path': self.path,
+            'state': self.state,
+            'free_space': format_size(self.free) if self.accessible else 'N/A',
+            'total_space': format_size(self.total) if self.accessible else 'N/A',
+            'accessible': self.accessible,
+        }
+
+class DriveProbe:
+    """Enumerasi drive dan disk usage secara paralel dengan timeout keras dan cache TTL.
+
+    Drive yang tidak menjawab dalam timeout (network drive putus, USB yang tidur) dilaporkan
+    'unresponsive'. Probe-nya tetap jalan di background dan tidak dikirim ulang sampai selesai,
+    jadi satu drive yang hang hanya memakan satu thread.
+    """
+
+    TTL = 15.0               # Detik hasil probe dianggap masih segar
+    UNRESPONSIVE_TTL = 5.0   # Drive yang hang dicoba lagi lebih cepat
+    TIMEOUT = 2.0            # Batas tunggu total untuk satu enumerasi
+
+    def __init__(self, ttl=TTL, timeout=TIMEOUT):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='drive-probe')
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._inflight = {}
+
+    def list_drives(self):
+        """Return list (name, path): drive letter di Windows, mount point (psutil) di OS lain"""
+        if windll is not None:
+            drives = []
+            bitmask = windll.kernel32.GetLogicalDrives()
+            for letter in string.ascii_uppercase:
+                if bitmask & 1:
+                    drives.append((f"{letter}:", f"{letter}:\\"))
+                bitmask >>= 1
+            return drives
+
+        mounts = []
+        seen = set()
+        for partition in psutil.disk_partitions(all=False):
+            if partition.mountpoint not in seen:
+                seen.add(partition.mountpoint)
+                mounts.append((partition.mountpoint, partition.mountpoint))
+        return mounts
+
+    def _probe_one(self, name, path):
+        try:
+            usage = psutil.disk_usage(path)
+            return DriveInfo(name, path, 'ok', usage.free, usage.total)
+        except Exception as e:
+            return DriveInfo(name, path, 'inaccessible', error=str(e))
+
+    def _fresh(self, info):
+        ttl = self.UNRESPONSIVE_TTL if info.state == 'unresponsive' else self.ttl
+        return time.monotonic() - info.checked_at < ttl
+
+    def _store(self, future, name):
+        """Callback saat probe selesai (juga untuk probe yang sempat melewati timeout)"""
+        with self._lock:
+            self._inflight.pop(name, None)
+            if not future.cancelled() and future.exception() is None:
+                self._cache[name] = future.result()
+
+    def probe(self, refresh=False):
+        """Return list DriveInfo untuk semua drive, paling lama sekitar `timeout` detik"""
+        drives = self.list_drives()
+        pending = {}
+        results = {}
+        submitted = []
+
+        with self._lock:
+            for name, path in drives:
+                cached = self._cache.get(name)
+                if cached is not None and not refresh and self._fresh(cached):
+                    results[name] = cached
+                    continue
+                future = self._inflight.get(name)
+                if future is None:
+                    future = self._executor.submit(self._probe_one, name, path)
+                    self._inflight[name] = future
+                    submitted.append((name, future))
+                pending[name] = (path, future)
+
+        # Callback dipasang setelah lock dilepas: future yang sudah selesai menjalankan _store langsung
+        # di thread ini, dan _store butuh lock yang sama
+        for name, future in submitted:
+            future.add_done_callback(lambda f, name=name: self._store(f, name))
+
+        if pending:
+            wait([future for _, future in pending.values()], timeout=self.timeout)
+            for name, (path, future) in pending.items():
+                if future.done() and future.exception() is None:
+                    results[name] = future.result()
+                else:
+                    self.logger.warning(f"Drive {name} did not respond within {self.timeout}s")
+                    info = DriveInfo(name, path, 'unresponsive', error=f"No response within {self.timeout:.0f}s")
+                    with self._lock:
+                        if name in self._inflight:
+                            self._cache[name] = info
+                    results[name] = info
+
+        return [results[name] for name, _ in drives]
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
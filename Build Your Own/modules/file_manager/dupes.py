@@ -0,0 +1,265 @@
+# modules/file_manager/dupes.py
+import os
+import mmap
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+PARTIAL_BLOCK = 64 * 1024        # Blok awal + akhir untuk partial hash
+HASH_CHUNK = 8 * 1024 * 1024     # Ukuran slice mmap per update hash
+DEFAULT_MIN_SIZE = 64 * 1024     # File lebih kecil dari ini tidak layak dicari duplikatnya
+
+class HashCache:
+    """Cache hash persisten (SQLite) dengan key (device, inode, size, mtime)"""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self.logger = logging.getLogger(__name__)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Buka koneksi SQLite (lazy) dan buat schema jika belum ada"""
+        if self._conn is not None:
+            return self._conn
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS hashes (
+                dev INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                partial TEXT,
+                full TEXT,
+                PRIMARY KEY (dev, inode, size, mtime_ns)
+            )
+        """)
+        conn.commit()
+        self._conn = conn
+        return conn
+
+    def get(self, key):
+        """Return (partial, full) untuk key, atau (None, None)"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT partial, full FROM hashes WHERE dev = ? AND inode = ? AND size = ? AND mtime_ns = ?", key
+            ).fetchone()
+        return row or (None, None)
+
+    def put(self, key, partial=None, full=None):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO hashes (dev, inode, size, mtime_ns, partial, full) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (dev, inode, size, mtime_ns) DO UPDATE SET "
+                "partial = COALESCE(excluded.partial, partial), full = COALESCE(excluded.full, full)",
+                (*key, partial, full)
+            )
+            conn.commit()
+
+class _Candidate:
+    __slots__ = ('path', 'size', 'key')
+
+    def __init__(self, path, size, key):
+        self.path = path
+        self.size = size
+        self.key = key
+
+def partial_hash(path, size):
+    """Hash blok pertama dan terakhir file"""
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        hasher.update(f.read(PARTIAL_BLOCK))
+        if size > PARTIAL_BLOCK:
+            f.seek(max(PARTIAL_BLOCK, size - PARTIAL_BLOCK))
+            hasher.update(f.read(PARTIAL_BLOCK))
+    return hasher.hexdigest()
+
+def full_hash(path):
+    """Hash seluruh isi file lewat mmap (tanpa copy ke buffer Python; hashlib melepas GIL)"""
+    hasher = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, len(view), HASH_CHUNK):
+                    hasher.update(view[offset:offset + HASH_CHUNK])
+            finally:
+                view.release()
+    return hasher.hexdigest()
+
+class DuplicateFinder:
+    """Cari file duplikat: group by size -> partial hash (awal + akhir) -> full hash hanya untuk yang masih bentrok"""
+
+    def __init__(self, root, cache, min_size=DEFAULT_MIN_SIZE, workers=4, cancel_event=None, progress=None):
+        self.root = root
+        self.cache = cache
+        self.min_size = max(1, min_size)
+        self.workers = workers
+        self.cancel_event = cancel_event or threading.Event()
+        self.progress = progress
+        self.logger = logging.getLogger(__name__)
+
+        self.stage = 'scanning'
+        self.files_seen = 0
+        self.hashed = 0
+        self.to_hash = 0
+        self.cache_hits = 0
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def _report(self):
+        if self.progress:
+            self.progress(self)
+
+    def run(self):
+        """Return list group duplikat: {'size', 'paths', 'reclaimable'}, reclaimable terbesar dulu"""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='dupes') as executor:
+            by_size = self._collect(executor)
+            if self.cancelled:
+                return []
+
+            candidates = self._stat_candidates(by_size)
+            groups = self._refine(executor, candidates, 'partial')
+            if self.cancelled:
+                return []
+            groups = self._refine(executor, groups, 'full')
+            if self.cancelled:
+                return []
+
+        result = []
+        for group in groups:
+            size = group[0].size
+            result.append({
+                'size': size,
+                'paths': sorted(candidate.path for candidate in group),
+                'reclaimable': size * (len(group) - 1),
+            })
+        result.sort(key=lambda group: group['reclaimable'], reverse=True)
+        return result
+
+    def _collect(self, executor):
+        """Walk paralel per level folder; kumpulkan path file per ukuran"""
+        by_size = defaultdict(list)
+        level = [self.root]
+        while level and not self.cancelled:
+            next_level = []
+            for files, subdirs in executor.map(self._scan_dir, level):
+                next_level.extend(subdirs)
+                for path, size in files:
+                    by_size[size].append(path)
+                self.files_seen += len(files)
+            level = next_level
+            self._report()
+        return by_size
+
+    def _scan_dir(self, path):
+        files = []
+        subdirs = []
+        if self.cancelled:
+            return files, subdirs
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            size = entry.stat(follow_symlinks=False).st_size
+                            if size >= self.min_size:
+                                files.append((entry.path, size))
+                    except OSError:
+                        continue
+        except OSError as e:
+            self.logger.debug(f"Cannot scan {path}: {e}")
+        return files, subdirs
+
+    def _stat_candidates(self, by_size):
+        """Stat (inode, mtime) hanya untuk file yang ukurannya bentrok; hard link dihitung sekali"""
+        groups = []
+        for size, paths in by_size.items():
+            if len(paths) < 2:
+                continue
+            seen_inodes = set()
+            group = []
+            for path in paths:
+                try:
+                    stats = os.stat(path)
+                except OSError:
+                    continue
+                inode_key = (stats.st_dev, stats.st_ino)
+                if stats.st_ino and inode_key in seen_inodes:
+                    continue  # Hard link ke file yang sama, tidak memakan ruang tambahan
+                seen_inodes.add(inode_key)
+                group.append(_Candidate(path, size, (stats.st_dev, stats.st_ino, size, stats.st_mtime_ns)))
+            if len(group) > 1:
+                groups.append(group)
+        return groups
+
+    def _refine(self, executor, groups, kind):
+        """Pecah setiap group berdasarkan hash (partial / full); buang group yang tinggal satu file"""
+        self.stage = kind
+        done = []
+        if kind == 'full':
+            # Blok awal + akhir sudah mencakup seluruh isi file kecil: tidak perlu full hash
+            done = [group for group in groups if group[0].size <= 2 * PARTIAL_BLOCK]
+            groups = [group for group in groups if group[0].size > 2 * PARTIAL_BLOCK]
+        candidates = [candidate for group in groups for candidate in group]
+        with self._lock:
+            self.hashed = 0
+            self.to_hash = len(candidates)
+        self._report()
+
+        def digest(candidate):
+            if self.cancelled:
+                return None
+            # Key tanpa inode (mis. filesystem yang tidak punya inode) tidak di-cache
+            cacheable = bool(candidate.key[1])
+            cached_partial, cached_full = self.cache.get(candidate.key) if cacheable else (None, None)
+            cached = cached_partial if kind == 'partial' else cached_full
+            if cached:
+                with self._lock:
+                    self.cache_hits += 1
+                    self.hashed += 1
+                return cached
+            try:
+                if kind == 'partial':
+                    value = partial_hash(candidate.path, candidate.size)
+                else:
+                    value = full_hash(candidate.path)
+            except (OSError, ValueError) as e:
+                self.logger.debug(f"Cannot hash {candidate.path}: {e}")
+                return None
+            if cacheable:
+                self.cache.put(candidate.key, **{kind: value})
+            with self._lock:
+                self.hashed += 1
+            return value
+
+        hashes = {}
+        for candidate, value in zip(candidates, executor.map(digest, candidates)):
+            hashes[id(candidate)] = value
+            if self.hashed % 200 == 0:
+                self._report()
+
+        refined = done
+        for group in groups:
+            buckets = defaultdict(list)
+            for candidate in group:
+                value = hashes.get(id(candidate))
+                if value is not None:
+                    buckets[value].append(candidate)
+            refined.extend(bucket for bucket in buckets.values() if len(bucket) > 1)
+        return refined
@@ -0,0 +1,216 @@
+# modules/file_manager/grep.py
+import os
+import re
+import mmap
+import time
+import fnmatch
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+SNIFF_SIZE = 8192            # Bytes awal yang dicek untuk deteksi file binary
+LINE_MAX = 200               # Panjang maksimal baris yang ditampilkan
+BATCH_BYTES = 8 * 1024 * 1024
+BATCH_FILES = 64
+
+def _line_text(data, start, end):
+    text = bytes(data[start:end]).rstrip(b'\r').decode('utf-8', errors='replace')
+    return text if len(text) <= LINE_MAX else text[:LINE_MAX - 1] + '…'
+
+def grep_file(path, regex, max_matches, context):
+    """Cari regex (bytes) di satu file lewat mmap.
+
+    Return (status, matches): status 'ok', 'binary', 'empty' atau 'error'; matches berisi
+    (line_no, line, before, after) dengan before / after berupa list baris konteks.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return 'empty', []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if b'\0' in data[:SNIFF_SIZE]:
+                    return 'binary', []
+
+                matches = []
+                line_no = 1
+                counted_to = 0
+                pos = 0
+                size = len(data)
+                while len(matches) < max_matches:
+                    match = regex.search(data, pos)
+                    if match is None:
+                        break
+                    line_start = data.rfind(b'\n', 0, match.start()) + 1
+                    line_end = data.find(b'\n', match.end())
+                    if line_end < 0:
+                        line_end = size
+
+                    line_no += data[counted_to:line_start].count(b'\n')
+                    counted_to = line_start
+
+                    before = []
+                    cursor = line_start
+                    for _ in range(context):
+                        if cursor == 0:
+                            break
+                        previous = data.rfind(b'\n', 0, cursor - 1) + 1
+                        before.insert(0, _line_text(data, previous, cursor - 1))
+                        cursor = previous
+
+                    after = []
+                    cursor = line_end
+                    for _ in range(context):
+                        if cursor + 1 >= size:
+                            break
+                        following = data.find(b'\n', cursor + 1)
+                        if following < 0:
+                            following = size
+                        after.append(_line_text(data, cursor + 1, following))
+                        cursor = following
+
+                    matches.append((line_no, _line_text(data, line_start, line_end), before, after))
+                    pos = line_end + 1  # Satu hit per baris
+                    if pos >= size:
+                        break
+                return 'ok', matches
+    except (OSError, ValueError):
+        return 'error', []
+
+def grep_batch(paths, pattern, flags, max_matches, context):
+    """Task untuk process pool: grep beberapa file sekaligus (mengurangi overhead IPC file kecil)"""
+    regex = re.compile(pattern, flags)
+    results = []
+    for path in paths:
+        status, matches = grep_file(path, regex, max_matches, context)
+        results.append((path, status, matches))
+    return results
+
+class ContentSearch:
+    """Grep isi file: walk di thread pemanggil, file dibagi per batch ke process pool"""
+
+    def __init__(self, root, pattern, name_glob=None, max_total=500, max_per_file=20, context=1, workers=None):
+        self.root = root
+        self.pattern = pattern
+        self.name_glob = name_glob.lower() if name_glob else None
+        self.max_total = max_total
+        self.max_per_file = max_per_file
+        self.context = context
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.logger = logging.getLogger(__name__)
+
+        # Validasi regex di proses utama supaya error langsung terlihat
+        self.flags = re.MULTILINE
+        self.regex_bytes = pattern.encode('utf-8')
+        re.compile(self.regex_bytes, self.flags)
+
+        self.cancelled = threading.Event()
+        self.files_scanned = 0
+        self.files_skipped = 0
+        self.bytes_scanned = 0
+        self.match_count = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def limited(self):
+        return self.match_count >= self.max_total
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def _iter_files(self):
+        """Walk root (skip folder hidden, tanpa ikut symlink), filter nama dengan glob"""
+        stack = [self.root]
+        while stack and not self.cancelled.is_set():
+            path = stack.pop()
+            try:
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith('.'):
+                            stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        if self.name_glob and not fnmatch.fnmatch(entry.name.lower(), self.name_glob):
+                            continue
+                        yield entry.path, entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+
+    def _iter_batches(self):
+        batch, batch_bytes = [], 0
+        for path, size in self._iter_files():
+            batch.append(path)
+            batch_bytes += size
+            if batch_bytes >= BATCH_BYTES or len(batch) >= BATCH_FILES:
+                yield batch, batch_bytes
+                batch, batch_bytes = [], 0
+        if batch:
+            yield batch, batch_bytes
+
+    def run(self, on_file_matches, on_progress=None):
+        """Jalankan grep; on_file_matches(path, matches) dipanggil begitu hasil satu file tersedia"""
+        batches = self._iter_batches()
+        in_flight = {}
+        max_in_flight = self.workers * 2
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(in_flight) < max_in_flight and not self._stopped():
+                    batch = next(batches, None)
+                    if batch is None:
+                        exhausted = True
+                        break
+                    paths, batch_bytes = batch
+                    future = executor.submit(grep_batch, paths, self.regex_bytes, self.flags,
+                                             self.max_per_file, self.context)
+                    in_flight[future] = batch_bytes
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.bytes_scanned += in_flight.pop(future)
+                    for path, status, matches in future.result():
+                        self.files_scanned += 1
+                        if status in ('binary', 'error'):
+                            self.files_skipped += 1
+                        if matches and not self.limited:
+                            room = self.max_total - self.match_count
+                            matches = matches[:room]
+                            self.match_count += len(matches)
+                            on_file_matches(path, matches)
+                if on_progress:
+                    on_progress(self)
+                if self._stopped():
+                    for future in in_flight:
+                        future.cancel()
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _stopped(self):
+        return self.cancelled.is_set() or self.limited
+
+    def format_matches(self, path, matches):
+        """Blok text untuk satu file: path relatif, lalu baris 'no: text' dengan konteks 'no- text'"""
+        rows = {}
+        for line_no, text, before, after in matches:
+            for offset, context_line in enumerate(before, line_no - len(before)):
+                rows.setdefault(offset, (context_line, False))
+            for offset, context_line in enumerate(after, line_no + 1):
+                rows.setdefault(offset, (context_line, False))
+            rows[line_no] = (text, True)
+
+        lines = [f"📄 {os.path.relpath(path, self.root)}"]
+        previous = None
+        for number in sorted(rows):
+            if previous is not None and number > previous + 1:
+                lines.append("   --")
+            text, is_match = rows[number]
+            lines.append(f"   {number}{':' if is_match else '-'} {text}")
+            previous = number
+        return "\n".join(lines)
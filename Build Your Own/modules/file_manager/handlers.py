@@ -1,10 +1,33 @@
 # modules/file_manager/handlers.py
 import os
+import io
+import re
+import itertools
+import time
 import logging
-from telegram.ext import CommandHandler, ConversationHandler, MessageHandler, Filters
+import threading
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
+from telegram.ext import CommandHandler, ConversationHandler, MessageHandler, CallbackQueryHandler, Filters
 from modules.file_manager.operations import FileOperations
-from modules.utils.helpers import escape_md, send_long_message, escape_md_caption, format_size
+from modules.file_manager.browser import FileBrowser, DiskUsageView
+from modules.file_manager.query import parse_size, split_terms
+from modules.file_manager.transfer import SplitFile, PartWriter, PART_SIZE
+from modules.file_manager.archive import StreamingZipWriter
+from modules.file_manager.receive import DocumentReceiver
+from modules.file_manager.tail import read_head, read_tail, FileFollower
+from modules.file_manager.watch import DirectoryWatcher, CREATED, MODIFIED, DELETED
+from modules.file_manager.thumbs import ContactSheet
+from modules.utils.helpers import (escape_md, send_long_message, send_text_document, escape_md_caption,
+                                   format_size, format_time)
+from modules.utils.render import search_hit, needs_document, markdown_to_text, ROW_ESTIMATE
 from modules.utils.decorators import log_function_call
+from modules.utils.dispatch import runs_on
+from modules.utils.progress import ProgressMessage
+from modules.utils.file_cache import get_file_id_cache
+from modules.utils.upload import streaming_reply
+from modules.utils.bot_api import get_bot_api
+from modules.utils.jobs import get_job_manager, JobCancelled
 
 class FileManagerHandlers:
     """Handle file management commands dan conversations"""
@@ -16,11 +39,46 @@ class FileManagerHandlers:
     WAITING_DELETE = 4
     WAITING_SEARCH = 5
     
+    LS_MAX_ROWS = 1000  # Batas baris yang diformat dan dikirim oleh /ls
+    LS_DOCUMENT_MAX_ROWS = 50000    # Batas baris /ls jika listing dikirim sebagai file
+    SEARCH_PROGRESS_INTERVAL = 2.0  # Detik antar edit progress message search
+    PART_UPLOAD_TIMEOUT = 300       # Detik untuk upload satu part file besar
+    ARCHIVE_WORKERS = 4             # Thread kompresi paralel untuk download folder
+    DUPES_MAX_GROUPS = 50           # Group duplikat yang ditampilkan detailnya
+    GREP_FLUSH_CHARS = 3500         # Hasil /grep dikirim per message sebesar ini
+    TAIL_DEFAULT_LINES = 20         # Baris default /head dan /tail
+    TAIL_MAX_LINES = 500
+    FOLLOW_POLL_INTERVAL = 2.0      # Detik antar cek file pada /tail -f (sama dengan interval edit)
+    FOLLOW_MESSAGE_CHARS = 3500     # Message /tail -f di-edit sampai sebesar ini, lalu lanjut di message baru
+    FOLLOW_MAX_SECONDS = 3600       # /tail -f berhenti sendiri setelah ini
+    WATCH_DEFAULT_INTERVAL = 10     # Detik per ringkasan /watch (event dalam satu interval digabung)
+    WATCH_MIN_INTERVAL = 5
+    WATCH_MAX_NAMES = 10            # Nama yang ditampilkan per jenis perubahan
+    THUMBS_MAX_FILES = 120          # File media per /thumbs (30 per contact sheet)
+    
     def __init__(self, auth_handler):
         self.auth = auth_handler
         self.file_ops = FileOperations()
+        self.browser = FileBrowser(self.file_ops)
+        self.du_view = DiskUsageView(self.file_ops.usage, self.browser.tokens)
+        self.contact_sheet = ContactSheet(self.file_ops.thumb_cache)
+        self.file_ids = get_file_id_cache()
+        self.bot_api = get_bot_api()
+        self.jobs = get_job_manager()
         self.logger = logging.getLogger(__name__)
     
+    def _send_listing_document(self, update, listing, header):
+        """Listing besar: baris display langsung ditulis ke satu file, tanpa render MarkdownV2 per baris"""
+        rows = listing.iter_display(self.LS_DOCUMENT_MAX_ROWS)
+        if len(listing) > self.LS_DOCUMENT_MAX_ROWS:
+            note = [f"... showing first {self.LS_DOCUMENT_MAX_ROWS} of {len(listing)} items, use /search to find the rest"]
+        else:
+            note = []
+        lines = itertools.chain([markdown_to_text(header), ''], rows, note)
+        name = os.path.basename(listing.path.rstrip('\\/')).replace(':', '') or 'drive'
+        send_text_document(update, lines, f"ls_{name}.txt", header)
+
+    @runs_on('disk')
     @log_function_call
     def list_directory(self, update, context):
         """List directory contents"""
@@ -33,12 +91,7 @@ class FileManagerHandlers:
             if content['type'] == 'drives':
                 # Show available drives
                 message = "💽 *Available Drives*\n\n"
-                
-                for drive_info in content['drives']:
-                    if drive_info['accessible']:
-                        message += f"• {escape_md(drive_info['name'])} \\- Free: {escape_md(drive_info['free_space'])} / Total: {escape_md(drive_info['total_space'])}\n"
-                    else:
-                        message += f"• {escape_md(drive_info['name'])} \\- Not accessible\n"
+                message += self._drive_lines(content['drives'])
                 
                 message += "\n*Commands:*\n"
                 message += "• /cd \\<drive\\:\\> \\- Change to drive \\(e\\.g\\. D\\:\\)\n"
@@ -51,11 +104,14 @@ class FileManagerHandlers:
                 message = f"📂 *Current Directory: {escape_md(content['current_path'])}*\n"
                 message += f"📊 *Total Items: {content['total_items']}*\n\n"
                 
-                formatted_items = []
-                for item in content['items']:
-                    formatted_items.append(escape_md(item['display']))
+                listing = content['listing']
+                if needs_document(len(listing) * ROW_ESTIMATE):
+                    self._send_listing_document(update, listing, message.rstrip('\n'))
+                    return
+                message += "\n".join(listing.iter_markdown(self.LS_MAX_ROWS))
                 
-                message += "\n".join(formatted_items)
+                if len(listing) > self.LS_MAX_ROWS:
+                    message += f"\n\n⚠️ *Showing first {self.LS_MAX_ROWS} of {len(listing)} items, use /search to find the rest*"
                 
                 message += "\n\n*Commands:*\n"
                 message += "• /cd \\- Change directory\n"
@@ -71,24 +127,40 @@ class FileManagerHandlers:
             update.message.reply_text(error_msg, parse_mode='MarkdownV2')
             self.logger.error(f"Error in list_directory: {str(e)}")
     
+    def _drive_lines(self, drives):
+        """Baris MarkdownV2 per drive untuk /lsall dan /cd"""
+        lines = ""
+        for drive_info in drives:
+            name = escape_md(drive_info['name'])
+            if drive_info['accessible']:
+                lines += (f"• {name} \\- Free: {escape_md(drive_info['free_space'])} / "
+                          f"Total: {escape_md(drive_info['total_space'])}\n")
+            elif drive_info['state'] == 'unresponsive':
+                lines += f"• {name} \\- ⏳ Not responding\n"
+            else:
+                lines += f"• {name} \\- Not accessible\n"
+        return lines
+    
+    @log_function_call
+    def browse_directory(self, update, context):
+        """Buka file browser inline keyboard untuk current directory"""
+        try:
+            self.browser.open(update, context)
+        except Exception as e:
+            error_msg = f"❌ Error: {escape_md(str(e))}"
+            update.message.reply_text(error_msg, parse_mode='MarkdownV2')
+            self.logger.error(f"Error in browse_directory: {str(e)}")
+    
     # Conversation handlers untuk file operations
     def cd_start(self, update, context):
         """Start change directory conversation"""
         current_path = context.user_data.get('current_path', self.file_ops.DEFAULT_PATH)
         
         if current_path == self.file_ops.DEFAULT_PATH:
-            drives = self.file_ops.get_available_drives()
+            # Pakai hasil probe yang di-cache (listing sebelumnya biasanya baru saja mem-probe drive)
+            drives = self.file_ops.list_directory_content(self.file_ops.DEFAULT_PATH)['drives']
             message = "📂 *Available Drives*\n\n*Current Location:* Root\n\n*Available Drives:*\n"
-            
-            for drive in drives:
-                try:
-                    import psutil
-                    usage = psutil.disk_usage(drive)
-                    free_space = format_size(usage.free)
-                    total_space = format_size(usage.total)
-                    message += f"• {escape_md(drive)} \\- Free: {escape_md(free_space)} / Total: {escape_md(total_space)}\n"
-                except:
-                    message += f"• {escape_md(drive)} \\- Not accessible\n"
+            message += self._drive_lines(drives)
             
             message += "\n*Examples:*\n• D: \\- Change to drive D\n• E:\\\\ \\- Change to drive E\n\n_Type the drive letter or /cancel to abort_"
         else:
@@ -120,8 +192,10 @@ class FileManagerHandlers:
             resolved_path = self.file_ops.change_directory(current_path, new_path)
             context.user_data['current_path'] = resolved_path
             
-            # Show new directory contents
-            self.list_directory(update, context)
+            # Show new directory contents, lalu prefetch subfolder di background
+            self.browse_directory(update, context)
+            if resolved_path != self.file_ops.DEFAULT_PATH:
+                self.file_ops.listing_cache.prefetch_children(resolved_path)
             return ConversationHandler.END
             
         except Exception as e:
@@ -129,15 +203,20 @@ class FileManagerHandlers:
             return ConversationHandler.END
     
     def download_start(self, update, context):
-        """Start download file conversation"""
+        """Start download file conversation (atau langsung download jika nama diberikan: /download <name>)"""
+        if context.args:
+            return self.download_item(update, context, " ".join(context.args))
+        
         self.list_directory(update, context)
-        update.message.reply_text("📥 *Enter the file name to download*", parse_mode='MarkdownV2')
+        update.message.reply_text("📥 *Enter the file or folder name to download*", parse_mode='MarkdownV2')
         return self.WAITING_DOWNLOAD
     
     def handle_download_input(self, update, context):
         """Handle download file input"""
-        file_name = update.message.text.strip()
-        
+        return self.download_item(update, context, update.message.text.strip())
+    
+    def download_item(self, update, context, file_name):
+        """Kirim file, atau folder sebagai zip yang di-stream"""
         try:
             current_path = context.user_data.get('current_path', self.file_ops.DEFAULT_PATH)
             
@@ -147,23 +226,30 @@ class FileManagerHandlers:
                 
             file_path = os.path.join(current_path, file_name)
             
+            if os.path.isdir(file_path):
+                self.send_folder_archive(update, file_path)
+                return ConversationHandler.END
+            
             if os.path.exists(file_path) and os.path.isfile(file_path):
                 # Check file size
                 file_size = os.path.getsize(file_path)
-                if file_size > 50 * 1024 * 1024:  # 50 MB limit
-                    update.message.reply_text("❌ File too large! Maximum size is 50 MB.")
+                if file_size > self.bot_api.upload_limit:
+                    # Terlalu besar untuk satu upload: kirim sebagai part bernomor + manifest
+                    self.send_file_in_parts(update, file_path)
                     return ConversationHandler.END
                 
-                with open(file_path, 'rb') as file:
-                    file_name_escaped = escape_md_caption(os.path.basename(file_path))
-                    file_size_escaped = escape_md_caption(format_size(file_size))
-                    caption = f"📄 File: {file_name_escaped}\n📦 Size: {file_size_escaped}"
-                    update.message.reply_document(
-                        document=file,
-                        filename=os.path.basename(file_path),
-                        caption=caption,
-                        parse_mode='MarkdownV2'
-                    )
+                # File yang sama dengan kiriman sebelumnya dikirim ulang lewat file_id, tanpa upload
+                file_name_escaped = escape_md_caption(os.path.basename(file_path))
+                file_size_escaped = escape_md_caption(format_size(file_size))
+                caption = f"📄 File: {file_name_escaped}\n📦 Size: {file_size_escaped}"
+                self.file_ids.send(
+                    streaming_reply(update.message, 'document'),
+                    file_path,
+                    'document',
+                    filename=os.path.basename(file_path),
+                    caption=caption,
+                    parse_mode='MarkdownV2'
+                )
             else:
                 update.message.reply_text("❌ File does not exist!")
                 
@@ -172,6 +258,115 @@ class FileManagerHandlers:
         
         return ConversationHandler.END
     
+    def send_file_in_parts(self, update, file_path):
+        """Stream file besar dari disk sebagai part di bawah limit upload, lalu kirim manifest"""
+        split = SplitFile(file_path, self.bot_api.part_size or PART_SIZE)
+        progress = ProgressMessage.send(
+            update,
+            f"📦 {split.name} is {format_size(split.size)}, sending it in {split.total_parts} parts..."
+        )
+        
+        def worker(job):
+            send_document = streaming_reply(update.message, 'document')
+            try:
+                for index, part in split.iter_parts():
+                    job.check()
+                    job.update(f"📤 Sending {split.name}: part {index}/{split.total_parts}...")
+                    send_document(
+                        part,
+                        filename=part.name,
+                        caption=f"📦 {split.name} part {index}/{split.total_parts}",
+                        timeout=self.PART_UPLOAD_TIMEOUT
+                    )
+                
+                manifest = io.BytesIO(split.manifest().encode('utf-8'))
+                update.message.reply_document(
+                    document=manifest,
+                    filename=f"{split.name}.manifest.txt",
+                    caption="🧾 Manifest with SHA256 checksums and join instructions"
+                )
+                
+                if split.changed_during_transfer():
+                    job.update(f"⚠️ {split.name} changed while it was being sent, the joined file may be corrupt.",
+                               force=True)
+                else:
+                    job.update(f"✅ {split.name} sent in {split.total_parts} parts ({format_size(split.size)})",
+                               force=True)
+            
+            except JobCancelled:
+                job.update(f"⏹ Sending {split.name} cancelled after {len(split.parts)}/{split.total_parts} parts",
+                           force=True)
+            except Exception as e:
+                sent = len(split.parts)
+                job.update(f"❌ Sending {split.name} failed after {sent}/{split.total_parts} parts: {str(e)}",
+                           force=True)
+                self.logger.error(f"Error sending {file_path} in parts: {str(e)}")
+                raise
+        
+        self.jobs.submit(f"Send {split.name} in parts", worker, resource='upload',
+                         chat_id=update.effective_chat.id, progress=progress)
+    
+    def send_folder_archive(self, update, folder_path):
+        """Stream folder sebagai zip: kompresi paralel per file, dipecah per part di bawah limit upload"""
+        folder_name = os.path.basename(os.path.normpath(folder_path)) or 'archive'
+        archive_name = f"{folder_name}.zip"
+        progress = ProgressMessage.send(update, f"🗜 Collecting files in {folder_name}...")
+        
+        def worker(job):
+            def on_part(path, name, index):
+                caption = f"🗜 {archive_name}" if index == 0 else f"🗜 {archive_name} part {index}"
+                job.update(f"📤 Sending {name}...")
+                with open(path, 'rb') as part:
+                    streaming_reply(update.message, 'document')(
+                        part,
+                        filename=name,
+                        caption=caption,
+                        timeout=self.PART_UPLOAD_TIMEOUT
+                    )
+            
+            def on_progress(archive):
+                job.update(
+                    f"🗜 Compressing {folder_name}: {archive.files_done}/{archive.total_files} files, "
+                    f"{format_size(archive.bytes_in)}/{format_size(archive.total_bytes)}"
+                )
+            
+            writer = PartWriter(archive_name, on_part, self.bot_api.part_size or PART_SIZE)
+            archive = StreamingZipWriter(writer, workers=self.ARCHIVE_WORKERS)
+            job.on_cancel(archive.cancelled.set)
+            try:
+                archive.write_tree(folder_path, on_progress)
+                writer.close()
+                
+                if len(writer.parts) > 1:
+                    manifest = io.BytesIO(writer.manifest().encode('utf-8'))
+                    update.message.reply_document(
+                        document=manifest,
+                        filename=f"{archive_name}.manifest.txt",
+                        caption="🧾 Manifest with SHA256 checksums and join instructions"
+                    )
+                
+                summary = (f"✅ {archive_name}: {archive.files_done} files, "
+                           f"{format_size(archive.bytes_in)} → {format_size(writer.size)}")
+                if len(writer.parts) > 1:
+                    summary += f" in {len(writer.parts)} parts"
+                if archive.skipped:
+                    skipped = "\n".join(f"• {name}: {error}" for name, error in archive.skipped[:20])
+                    summary += f"\n\n⚠️ Skipped {len(archive.skipped)} unreadable files:\n{skipped}"
+                job.update(summary, force=True)
+            
+            except Exception as e:
+                writer.abort()
+                if job.cancelled:
+                    job.update(f"⏹ Archiving {folder_name} cancelled after {len(writer.parts)} parts", force=True)
+                    return
+                job.update(f"❌ Archiving {folder_name} failed after {len(writer.parts)} parts: {str(e)}",
+                           force=True)
+                self.logger.error(f"Error archiving {folder_path}: {str(e)}")
+                raise
+        
+        self.jobs.submit(f"Archive {folder_name}", worker, resource='upload',
+                         chat_id=update.effective_chat.id, progress=progress)
+    
     def mkdir_start(self, update, context):
         """Start create directory conversation"""
         current_path = context.user_data.get('current_path', self.file_ops.DEFAULT_PATH)
@@ -226,6 +421,11 @@ class FileManagerHandlers:
         
         try:
             current_path = context.user_data.get('current_path', self.file_ops.DEFAULT_PATH)
+            if current_path != self.file_ops.DEFAULT_PATH and os.path.isdir(os.path.join(current_path, item_name)):
+                # Hapus folder bisa lama: jalankan sebagai job supaya dispatcher tidak terblokir
+                self.start_delete_job(update, context, current_path, item_name)
+                return ConversationHandler.END
+            
             result = self.file_ops.delete_item(current_path, item_name)
             update.message.reply_text(f"✅ {result}")
             
@@ -237,6 +437,24 @@ class FileManagerHandlers:
         
         return ConversationHandler.END
     
+    def start_delete_job(self, update, context, current_path, item_name):
+        """Hapus folder di background dengan progress dan bisa di-cancel lewat /kill"""
+        progress = ProgressMessage.send(update, f"🗑 Deleting {item_name}... (/jobs to follow, /kill to stop)")
+        
+        def worker(job):
+            try:
+                result = self.file_ops.delete_item(current_path, item_name, job=job)
+                job.update(f"✅ {result}", force=True)
+                self.list_directory(update, context)
+            except JobCancelled:
+                job.update(f"⏹ Deleting {item_name} cancelled, some items were already removed", force=True)
+            except Exception as e:
+                job.update(f"❌ Error deleting item: {str(e)}", force=True)
+                raise
+        
+        self.jobs.submit(f"Delete {item_name}", worker, resource='disk',
+                         chat_id=update.effective_chat.id, progress=progress)
+    
     def search_start(self, update, context):
         """Start search files conversation"""
         message = (
@@ -244,7 +462,11 @@ class FileManagerHandlers:
             "*Examples:*\n"
             "• `document` \\- Find files/folders containing 'document'\n"
             "• `.pdf` \\- Find PDF files\n"
-            "• `project` \\- Find items with 'project' in the name\n\n"
+            "• `project` \\- Find items with 'project' in the name\n"
+            "• `report*` \\- Find items whose name starts with 'report'\n"
+            "• `*.mp4 size>500M modified<7d` \\- Large recent videos\n"
+            "• `re:^IMG_\\\\d+ type:file path:DCIM/*` \\- Regex, type and path filters\n\n"
+            "_Filters: `size` `modified` `depth` with \\<, \\>, \\=; `type:file|dir`, `ext:`, `re:`, `path:`_\n\n"
             "_Type search pattern or /cancel to abort_"
         )
         update.message.reply_text(message, parse_mode='MarkdownV2')
@@ -256,31 +478,708 @@ class FileManagerHandlers:
         
         try:
             current_path = context.user_data.get('current_path', self.file_ops.DEFAULT_PATH)
-            search_result = self.file_ops.search_files(current_path, pattern)
+            if current_path == self.file_ops.DEFAULT_PATH:
+                raise ValueError("Please select a drive first using /cd command")
             
-            escaped_pattern = escape_md(search_result['pattern'])
-            if search_result['results']:
-                message = f"🔍 *Search Results for '{escaped_pattern}'*\n"
-                message += f"📊 *Found {search_result['total_found']} items*\n\n"
-                
-                formatted_results = [escape_md(result['display']) for result in search_result['results']]
-                message += "\n".join(formatted_results)
-                
-                if search_result['search_limited']:
-                    message += f"\n\n⚠️ *Search stopped at 1000 items for performance*"
-                    
+            search_result = self.file_ops.search_index(current_path, pattern)
+            if search_result is not None:
+                self.send_search_results(update, search_result)
             else:
-                message = f"❌ No files found matching '{escaped_pattern}'"
-
-            send_long_message(update, message, 'MarkdownV2')
+                self.start_live_search(update, context, current_path, pattern)
 
         except Exception as e:
             update.message.reply_text(f"❌ Error searching files: {escape_md(str(e))}", parse_mode='MarkdownV2')
         
         return ConversationHandler.END
     
+    def send_search_results(self, update, search_result):
+        """Kirim hasil akhir search"""
+        escaped_pattern = escape_md(search_result['pattern'])
+        if search_result['results'] and needs_document(len(search_result['results']) * ROW_ESTIMATE):
+            summary = (f"🔍 *Search Results for '{escaped_pattern}'*\n"
+                       f"📊 *Found {search_result['total_found']} items*")
+            if search_result['search_limited']:
+                summary += "\n⚠️ _Search stopped at the result limit_"
+            if search_result.get('cancelled'):
+                summary += "\n⏹ _Search cancelled, results are partial_"
+            lines = itertools.chain([markdown_to_text(summary), ''],
+                                    (result['display'] for result in search_result['results']))
+            send_text_document(update, lines, "search_results.txt", summary)
+            return
+
+        if search_result['results']:
+            message = f"🔍 *Search Results for '{escaped_pattern}'*\n"
+            message += f"📊 *Found {search_result['total_found']} items*\n\n"
+            
+            message += "\n".join(search_hit(result) for result in search_result['results'])
+            
+            if search_result['search_limited']:
+                message += f"\n\n⚠️ *Search stopped at {search_result['total_found']} items for performance*"
+            
+            if search_result.get('cancelled'):
+                message += "\n\n⏹ *Search cancelled, results are partial*"
+            
+            if search_result.get('source') == 'index':
+                message += "\n\n⚡ _Served from filename index_"
+                
+        else:
+            message = f"❌ No files found matching '{escaped_pattern}'"
+
+        send_long_message(update, message, 'MarkdownV2')
+    
+    def start_live_search(self, update, context, current_path, pattern):
+        """Jalankan ParallelSearch di background dengan progress message yang di-edit"""
+        previous = context.user_data.get('active_search')
+        if previous:
+            previous.cancel()
+        
+        search = self.file_ops.create_search(current_path, pattern)
+        context.user_data['active_search'] = search
+        
+        stop_markup = InlineKeyboardMarkup([[InlineKeyboardButton("⏹ Stop", callback_data='srch|stop')]])
+        progress = ProgressMessage.send(update, f"🔍 Searching for '{pattern}' in {current_path}...",
+                                        reply_markup=stop_markup)
+        
+        def runner(job):
+            job.on_cancel(search.cancel)
+            worker = threading.Thread(target=search.run, daemon=True, name='search-run')
+            worker.start()
+            while worker.is_alive():
+                worker.join(self.SEARCH_PROGRESS_INTERVAL)
+                if worker.is_alive():
+                    job.detail = f"{search.dirs_scanned} folders scanned, {len(search.results)} found"
+                    progress.update(self._search_progress_text(search), reply_markup=stop_markup)
+            
+            if search.cancelled.is_set() and not search.limited:
+                summary = f"⏹ Search cancelled after {search.elapsed:.1f}s: {len(search.results)} items found"
+            else:
+                summary = f"✅ Search finished in {search.elapsed:.1f}s: {len(search.results)} items found"
+            progress.update(summary, force=True)
+            
+            if context.user_data.get('active_search') is search:
+                context.user_data.pop('active_search', None)
+            
+            try:
+                self.send_search_results(update, search.to_result())
+            except Exception as e:
+                self.logger.error(f"Error sending search results: {str(e)}")
+        
+        self.jobs.submit(f"Search '{pattern}'", runner, resource='disk', chat_id=update.effective_chat.id)
+    
+    def _search_progress_text(self, search):
+        """Text progress: statistik dan beberapa hit terakhir"""
+        latest = search.snapshot(last=10)
+        text = (
+            f"🔍 Searching for '{search.pattern}'...\n"
+            f"📁 Folders scanned: {search.dirs_scanned} | Found: {len(search.results)} | {search.elapsed:.0f}s\n"
+        )
+        if latest:
+            text += "\nLatest:\n" + "\n".join(result['display'] for result in latest)
+        return text
+    
+    def cancel_search(self, update, context):
+        """Stop search yang sedang berjalan (/cancel atau tombol Stop)"""
+        search = context.user_data.get('active_search')
+        
+        if update.callback_query:
+            if search:
+                search.cancel()
+                update.callback_query.answer("⏹ Stopping search...")
+            else:
+                update.callback_query.answer("No search is running")
+            return
+        
+        # /cancel juga menutup conversation lain (/login, /cd, ...): diam jika bukan owner yang sudah
+        # login atau tidak ada search, supaya tidak ada balasan kedua
+        authenticated = self.auth.is_authorized(update) and context.user_data.get('authenticated', False)
+        if authenticated and search:
+            search.cancel()
+            update.message.reply_text("⏹ Stopping search...")
+    
+    @log_function_call
+    def du_command(self, update, context):
+        """Disk usage folder: /du [-f] [path] (-f = scan ulang penuh)"""
+        args = list(context.args or [])
+        full = '-f' in args
+        if full:
+            args.remove('-f')
+        
+        current_path = context.user_data.get('current_path', self.file_ops.DEFAULT_PATH)
+        target = " ".join(args) if args else current_path
+        if args and not os.path.isabs(target):
+            if current_path == self.file_ops.DEFAULT_PATH:
+                update.message.reply_text("❌ Please select a drive first using /cd command, or give an absolute path")
+                return
+            target = os.path.join(current_path, target)
+        
+        if target == self.file_ops.DEFAULT_PATH:
+            update.message.reply_text("❌ Please select a drive first using /cd command")
+            return
+        if not os.path.isdir(target):
+            update.message.reply_text(f"❌ Not a folder: {target}")
+            return
+        
+        progress = ProgressMessage.send(update, f"📊 Scanning {target}...")
+        self.start_du_job(progress, os.path.normpath(target), full, update.effective_chat.id)
+    
+    def start_du_job(self, progress, path, full, chat_id):
+        """Scan / refresh size tree di job manager, lalu ganti progress message dengan hasilnya"""
+        def worker(job):
+            cancel_event = threading.Event()
+            job.on_cancel(cancel_event.set)
+            
+            def on_progress(run):
+                job.update(
+                    f"📊 Scanning {path}...\n"
+                    f"📁 {run.dirs_checked:,} folders checked, {run.dirs_scanned:,} read | "
+                    f"{format_size(run.bytes_seen)} | {time.monotonic() - run.started_at:.0f}s"
+                )
+            
+            node = self.file_ops.usage.scan(path, full=full, progress=on_progress, cancel_event=cancel_event)
+            if node is None:
+                job.update(f"⏹ Disk usage scan of {path} cancelled", force=True)
+                return
+            text, markup = self.du_view.render(node)
+            progress.update(text, force=True, reply_markup=markup)
+        
+        self.jobs.submit(f"Disk usage {path}", worker, resource='disk', chat_id=chat_id, progress=progress)
+    
+    def du_callback(self, update, context):
+        """Drill-down / up / refresh pada message /du"""
+        query = update.callback_query
+        
+        try:
+            _, action, token = query.data.split('|')
+        except ValueError:
+            query.answer("❌ Invalid button")
+            return
+        
+        path = self.browser.tokens.path_for(token)
+        if path is None:
+            query.answer("⌛ This view has expired, send /du again", show_alert=True)
+            return
+        
+        if action == 'u':
+            parent = os.path.dirname(os.path.normpath(path))
+            if not parent or parent == path:
+                query.answer("💽 Already at the top of the drive")
+                return
+            path = parent
+        
+        node = None if action == 'r' else self.file_ops.usage.find(path)
+        if node is None:
+            # Belum ada di tree (mis. naik di atas folder yang di-scan) atau Refresh: scan di background
+            query.answer("📊 Scanning...")
+            progress = ProgressMessage(query.bot, query.message.chat_id, query.message.message_id)
+            progress.update(f"📊 Scanning {path}...", force=True)
+            self.start_du_job(progress, path, False, query.message.chat_id)
+            return
+        
+        query.answer()
+        text, markup = self.du_view.render(node)
+        try:
+            query.edit_message_text(text, reply_markup=markup)
+        except BadRequest as e:
+            if 'not modified' not in str(e).lower():
+                raise
+    
+    @log_function_call
+    def dupes_command(self, update, context):
+        """Cari file duplikat: /dupes [min=<size>] [path]"""
+        args = list(context.args or [])
+        min_size = None
+        for arg in list(args):
+            if arg.lower().startswith('min='):
+                try:
+                    min_size = parse_size(arg[4:])
+                except ValueError as e:
+                    update.message.reply_text(f"❌ {str(e)}")
+                    return
+                args.remove(arg)
+        
+        current_path = context.user_data.get('current_path', self.file_ops.DEFAULT_PATH)
+        target = " ".join(args) if args else current_path
+        if args and not os.path.isabs(target) and current_path != self.file_ops.DEFAULT_PATH:
+            target = os.path.join(current_path, target)
+        target = os.path.normpath(target) if target != self.file_ops.DEFAULT_PATH else target
+        
+        progress = ProgressMessage.send(update, f"🔍 Looking for duplicates in {target}...")
+        
+        def worker(job):
+            cancel_event = threading.Event()
+            job.on_cancel(cancel_event.set)
+            stages = {'scanning': "📁 Scanning", 'partial': "🧩 Comparing first/last blocks", 'full': "🔑 Full hashing"}
+            
+            def on_progress(finder):
+                text = f"🔍 Duplicates in {target}\n{stages[finder.stage]}: {finder.files_seen:,} files"
+                if finder.stage != 'scanning':
+                    text += f" | {finder.hashed:,}/{finder.to_hash:,} hashed ({finder.cache_hits:,} cached)"
+                job.update(text)
+            
+            kwargs = {'min_size': min_size} if min_size is not None else {}
+            try:
+                groups = self.file_ops.find_duplicates(target, cancel_event=cancel_event,
+                                                       progress=on_progress, **kwargs)
+            except Exception as e:
+                job.update(f"❌ Error finding duplicates: {str(e)}", force=True)
+                raise
+            if job.cancelled:
+                job.update("⏹ Duplicate search cancelled", force=True)
+                return
+            
+            job.update(self._dupes_summary(target, groups), force=True)
+            if groups:
+                send_long_message(update, escape_md(self._dupes_details(target, groups)), filename='dupes.txt')
+        
+        self.jobs.submit(f"Duplicates in {target}", worker, resource='disk',
+                         chat_id=update.effective_chat.id, progress=progress)
+    
+    def _dupes_summary(self, root, groups):
+        if not groups:
+            return f"✅ No duplicate files found in {root}"
+        total = sum(group['reclaimable'] for group in groups)
+        copies = sum(len(group['paths']) for group in groups)
+        return (f"♻️ {len(groups):,} duplicate groups ({copies:,} files) in {root}\n"
+                f"💾 Reclaimable: {format_size(total)}")
+    
+    def _dupes_details(self, root, groups):
+        """Detail per group (reclaimable terbesar dulu); path relatif terhadap root"""
+        lines = []
+        for number, group in enumerate(groups[:self.DUPES_MAX_GROUPS], 1):
+            lines.append(f"{number}. {len(group['paths'])} × {format_size(group['size'])} "
+                         f"→ {format_size(group['reclaimable'])} reclaimable")
+            lines += [f"   📄 {os.path.relpath(path, root)}" for path in group['paths']]
+            lines.append("")
+        if len(groups) > self.DUPES_MAX_GROUPS:
+            lines.append(f"... and {len(groups) - self.DUPES_MAX_GROUPS} smaller groups")
+        return "\n".join(lines).strip()
+    
+    @staticmethod
+    def _split_args(text):
+        """Split argumen command seperti shell (quote didukung) tanpa memakan backslash regex"""
+        parts = text.split(None, 1)
+        if len(parts) < 2:
+            return []
+        return split_terms(parts[1])
+    
+    @log_function_call
+    def grep_command(self, update, context):
+        """Cari isi file: /grep <regex> [path] [glob]"""
+        try:
+            args = self._split_args(update.message.text or "")
+        except ValueError as e:
+            update.message.reply_text(f"❌ Cannot parse arguments: {str(e)}")
+            return
+        if not args or len(args) > 3:
+            update.message.reply_text(
+                "❌ Usage: /grep <regex> [path] [glob]\n"
+                "Example: /grep \"TODO|FIXME\" src *.py\n"
+                "Quote the regex if it contains spaces"
+            )
+            return
+        
+        pattern, rest = args[0], args[1:]
+        name_glob = None
+        if rest and (len(rest) == 2 or any(char in rest[-1] for char in '*?[')):
+            name_glob = rest.pop()
+        
+        current_path = context.user_data.get('current_path', self.file_ops.DEFAULT_PATH)
+        target = rest[0] if rest else current_path
+        if rest and not os.path.isabs(target) and current_path != self.file_ops.DEFAULT_PATH:
+            target = os.path.join(current_path, target)
+        target = os.path.normpath(target) if target != self.file_ops.DEFAULT_PATH else target
+        
+        try:
+            search = self.file_ops.create_content_search(target, pattern, name_glob)
+        except re.error as e:
+            update.message.reply_text(f"❌ Invalid regex: {str(e)}")
+            return
+        except Exception as e:
+            update.message.reply_text(f"❌ {str(e)}")
+            return
+        
+        scope = f"{target}" + (f" ({name_glob})" if name_glob else "")
+        progress = ProgressMessage.send(update, f"🔎 Grepping '{pattern}' in {scope}...")
+        
+        def worker(job):
+            job.on_cancel(search.cancel)
+            pending = []
+            pending_chars = 0
+            latest = []
+            
+            def flush():
+                nonlocal pending_chars
+                if pending:
+                    send_long_message(update, "\n\n".join(pending), parse_mode=None)
+                    pending.clear()
+                    pending_chars = 0
+            
+            def on_file_matches(path, matches):
+                nonlocal pending_chars
+                block = search.format_matches(path, matches)
+                pending.append(block)
+                pending_chars += len(block) + 2
+                latest.append(f"{os.path.relpath(path, target)}:{matches[-1][0]}")
+                del latest[:-5]
+                if pending_chars >= self.GREP_FLUSH_CHARS:
+                    flush()
+            
+            def on_progress(search):
+                job.update(self._grep_progress_text(search, scope, latest))
+            
+            try:
+                search.run(on_file_matches, on_progress)
+            except Exception as e:
+                job.update(f"❌ Error while grepping: {str(e)}", force=True)
+                raise
+            finally:
+                flush()
+            
+            elapsed = time.monotonic() - search.started_at
+            if search.cancelled.is_set():
+                headline = f"⏹ Grep cancelled after {elapsed:.1f}s"
+            elif search.limited:
+                headline = f"⚠️ Stopped at {search.max_total} matches after {elapsed:.1f}s"
+            else:
+                headline = f"✅ Grep finished in {elapsed:.1f}s"
+            job.update(
+                f"{headline}: {search.match_count:,} matches for '{pattern}' in {scope}\n"
+                f"📄 {search.files_scanned:,} files scanned ({format_size(search.bytes_scanned)}), "
+                f"{search.files_skipped:,} binary/unreadable skipped",
+                force=True
+            )
+        
+        self.jobs.submit(f"Grep '{pattern}'", worker, resource='cpu',
+                         chat_id=update.effective_chat.id, progress=progress)
+    
+    def _grep_progress_text(self, search, scope, latest):
+        text = (f"🔎 Grepping '{search.pattern}' in {scope}...\n"
+                f"📄 {search.files_scanned:,} files | {format_size(search.bytes_scanned)} | "
+                f"{search.match_count:,} matches | {time.monotonic() - search.started_at:.0f}s")
+        if latest:
+            text += "\n\nLatest:\n" + "\n".join(latest)
+        return text
+    
+    def _parse_view_args(self, update, context, command):
+        """Parse '[-f] [-n N] <file>' untuk /head dan /tail; return (path, count, follow) atau None"""
+        args = list(context.args or [])
+        follow = False
+        count = self.TAIL_DEFAULT_LINES
+        usage = f"❌ Usage: /{command} [-n lines] <file>" + (" (or /tail -f <file> to follow)" if command == 'tail' else "")
+        try:
+            while args and args[0].startswith('-') and args[0] != '-':
+                flag = args.pop(0)
+                if flag == '-f' and command == 'tail':
+                    follow = True
+                elif flag == '-n' and args:
+                    count = int(args.pop(0))
+                elif flag[1:].isdigit():
+                    count = int(flag[1:])
+                else:
+                    update.message.reply_text(usage)
+                    return None
+        except ValueError:
+            update.message.reply_text("❌ Line count must be a number")
+            return None
+        if not args:
+            update.message.reply_text(usage)
+            return None
+        
+        current_path = context.user_data.get('current_path', self.file_ops.DEFAULT_PATH)
+        path = " ".join(args)
+        if not os.path.isabs(path):
+            if current_path == self.file_ops.DEFAULT_PATH:
+                update.message.reply_text("❌ Please select a drive first using /cd command, or give an absolute path")
+                return None
+            path = os.path.join(current_path, path)
+        if not os.path.isfile(path):
+            update.message.reply_text(f"❌ Not a file: {path}")
+            return None
+        return path, max(1, min(count, self.TAIL_MAX_LINES)), follow
+    
+    @log_function_call
+    def head_command(self, update, context):
+        """Tampilkan baris pertama file: /head [-n N] <file>"""
+        parsed = self._parse_view_args(update, context, 'head')
+        if parsed:
+            path, count, _ = parsed
+            self._send_file_lines(update, path, count, read_head, "First")
+    
+    @log_function_call
+    def tail_command(self, update, context):
+        """Tampilkan baris terakhir file: /tail [-n N] <file>, atau ikuti dengan /tail -f <file>"""
+        parsed = self._parse_view_args(update, context, 'tail')
+        if not parsed:
+            return
+        path, count, follow = parsed
+        if follow:
+            self.start_follow_job(update, path, count)
+        else:
+            self._send_file_lines(update, path, count, read_tail, "Last")
+    
+    def _send_file_lines(self, update, path, count, reader, label):
+        try:
+            lines, size, is_binary = reader(path, count)
+        except OSError as e:
+            update.message.reply_text(f"❌ Cannot read file: {str(e)}")
+            return
+        if is_binary:
+            update.message.reply_text(f"❌ {os.path.basename(path)} looks like a binary file")
+            return
+        header = f"📜 {label} {len(lines)} lines of {os.path.basename(path)} ({format_size(size)})"
+        send_long_message(update, header + "\n\n" + ("\n".join(lines) or "(empty)"), parse_mode=None,
+                          filename=f"{label.lower()}_{os.path.basename(path)}.txt")
+    
+    def start_follow_job(self, update, path, count):
+        """tail -f: kirim baris terakhir lalu poll file dan tambahkan baris baru lewat edit yang di-throttle"""
+        name = os.path.basename(path)
+        try:
+            follower = FileFollower(path)
+            initial, _, is_binary = read_tail(path, count)
+        except OSError as e:
+            update.message.reply_text(f"❌ Cannot read file: {str(e)}")
+            return
+        if is_binary:
+            update.message.reply_text(f"❌ {name} looks like a binary file")
+            return
+        
+        progress = ProgressMessage.send(update, f"👀 Following {name}...")
+        
+        def worker(job):
+            header = f"👀 tail -f {name} (/kill {job.id} to stop)\n\n"
+            state = {'progress': progress, 'lines': [], 'chars': len(header)}
+            
+            def render():
+                return header + ("\n".join(state['lines']) or "(waiting for new lines)")
+            
+            def append(new_lines):
+                # Paling banyak satu message penuh per poll supaya output yang deras tidak membanjiri chat
+                budget = self.FOLLOW_MESSAGE_CHARS
+                keep = 0
+                while keep < len(new_lines) and budget - len(new_lines[-keep - 1]) - 1 > 0:
+                    budget -= len(new_lines[-keep - 1]) + 1
+                    keep += 1
+                if keep < len(new_lines):
+                    hidden = len(new_lines) - keep
+                    new_lines = [f"⏩ {hidden:,} lines not shown"] + (new_lines[-keep:] if keep else [])
+                for line in new_lines:
+                    if state['lines'] and state['chars'] + len(line) + 1 > self.FOLLOW_MESSAGE_CHARS:
+                        # Message penuh: kunci isinya lalu lanjut di message baru, tidak ada baris yang hilang
+                        state['progress'].update(render(), force=True)
+                        message = update.message.reply_text(f"👀 Following {name}...")
+                        state['progress'] = ProgressMessage(message.bot, message.chat_id, message.message_id)
+                        state['lines'] = []
+                        state['chars'] = len(header)
+                    state['lines'].append(line)
+                    state['chars'] += len(line) + 1
+            
+            append(initial)
+            state['progress'].update(render(), force=True)
+            deadline = time.monotonic() + self.FOLLOW_MAX_SECONDS
+            while not job.cancelled and time.monotonic() < deadline:
+                time.sleep(self.FOLLOW_POLL_INTERVAL)
+                lines, notices = follower.poll()
+                if notices or lines:
+                    append(notices + lines)
+                    job.detail = f"{name}: offset {follower.offset:,}"
+                # Edit di-throttle: baris dari beberapa poll digabung, sisa yang tertahan terkirim di poll berikutnya
+                state['progress'].update(render())
+            
+            reason = "stopped" if job.cancelled else f"stopped after {self.FOLLOW_MAX_SECONDS // 60} minutes"
+            header = f"⏹ tail -f {name} {reason}\n\n"
+            state['progress'].update(render(), force=True)
+        
+        self.jobs.submit(f"tail -f {name}", worker, resource='watch', chat_id=update.effective_chat.id)
+    
+    @log_function_call
+    def watch_command(self, update, context):
+        """Notifikasi perubahan di folder: /watch [-i seconds] [path], stop dengan /kill"""
+        args = list(context.args or [])
+        interval = self.WATCH_DEFAULT_INTERVAL
+        if len(args) >= 2 and args[0] == '-i':
+            try:
+                interval = max(self.WATCH_MIN_INTERVAL, int(args[1]))
+            except ValueError:
+                update.message.reply_text("❌ Interval must be a number of seconds")
+                return
+            args = args[2:]
+        
+        current_path = context.user_data.get('current_path', self.file_ops.DEFAULT_PATH)
+        target = " ".join(args) if args else current_path
+        if args and not os.path.isabs(target) and current_path != self.file_ops.DEFAULT_PATH:
+            target = os.path.join(current_path, target)
+        if target == self.file_ops.DEFAULT_PATH:
+            update.message.reply_text("❌ Please select a drive first using /cd command, or give a path")
+            return
+        target = os.path.normpath(target)
+        if not os.path.isdir(target):
+            update.message.reply_text(f"❌ Not a folder: {target}")
+            return
+        
+        try:
+            watcher = DirectoryWatcher(target, interval=interval)
+        except OSError as e:
+            update.message.reply_text(f"❌ Cannot watch {target}: {str(e)}")
+            return
+        
+        progress = ProgressMessage.send(update, f"👁 Watching {target}...")
+        
+        def worker(job):
+            job.on_cancel(watcher.stop)
+            started = time.monotonic()
+            totals = {'summaries': 0, 'changes': 0}
+            
+            def status_text(headline):
+                return (f"{headline} {target}\n"
+                        f"⚙️ {watcher.status()}\n"
+                        f"🔔 {totals['summaries']:,} notifications, {totals['changes']:,} changes | "
+                        f"{(time.monotonic() - started) / 60:.0f} min")
+            
+            def on_changes(changes):
+                totals['summaries'] += 1
+                totals['changes'] += len(changes.changes)
+                self._invalidate_changed(target, changes)
+                try:
+                    update.message.reply_text(self._watch_summary(target, interval, changes))
+                except Exception as e:
+                    self.logger.error(f"Error sending watch notification: {str(e)}")
+            
+            def on_tick():
+                job.detail = f"{totals['changes']:,} changes"
+                job.update(status_text(f"👁 Watching (/kill {job.id} to stop)"))
+            
+            on_tick()
+            watcher.run(on_changes, on_tick)
+            job.update(status_text("⏹ Stopped watching"), force=True)
+        
+        self.jobs.submit(f"Watch {target}", worker, resource='watch',
+                         chat_id=update.effective_chat.id, progress=progress)
+    
+    def _watch_summary(self, root, interval, changes):
+        """Satu message ringkasan untuk semua perubahan dalam satu interval"""
+        labels = {CREATED: "➕ Created", MODIFIED: "✏️ Modified", DELETED: "➖ Deleted"}
+        lines = [f"👁 Changes in {root} (last {interval}s)"]
+        for kind, paths in changes.by_kind().items():
+            if not paths:
+                continue
+            lines.append(f"{labels[kind]}: {len(paths):,}")
+            lines += [f"   {path}" for path in paths[:self.WATCH_MAX_NAMES]]
+            if len(paths) > self.WATCH_MAX_NAMES:
+                lines.append(f"   ... and {len(paths) - self.WATCH_MAX_NAMES:,} more")
+        if changes.overflow:
+            lines.append("⚠️ Too many changes at once, some events were lost")
+        return "\n".join(lines)
+    
+    def _invalidate_changed(self, root, changes):
+        """Buang cache listing / disk usage untuk folder yang isinya berubah"""
+        folders = {os.path.dirname(os.path.join(root, path)) for path in changes.changes}
+        for folder in folders:
+            self.file_ops.listing_cache.invalidate(folder)
+            self.file_ops.usage.invalidate(folder)
+    
+    @log_function_call
+    def thumbs_command(self, update, context):
+        """Contact sheet thumbnail foto / video di folder: /thumbs [path]"""
+        current_path = context.user_data.get('current_path', self.file_ops.DEFAULT_PATH)
+        target = " ".join(context.args) if context.args else current_path
+        if context.args and not os.path.isabs(target) and current_path != self.file_ops.DEFAULT_PATH:
+            target = os.path.join(current_path, target)
+        if target == self.file_ops.DEFAULT_PATH:
+            update.message.reply_text("❌ Please select a drive first using /cd command")
+            return
+        target = os.path.normpath(target)
+        if not os.path.isdir(target):
+            update.message.reply_text(f"❌ Not a folder: {target}")
+            return
+        
+        try:
+            files, total = self.contact_sheet.collect(target, self.THUMBS_MAX_FILES)
+        except OSError as e:
+            update.message.reply_text(f"❌ Cannot read folder: {str(e)}")
+            return
+        if not files:
+            note = "" if self.file_ops.thumb_cache.has_ffmpeg else " (videos need ffmpeg)"
+            update.message.reply_text(f"🖼 No images or videos in {target}{note}")
+            return
+        
+        progress = ProgressMessage.send(update, f"🖼 Building thumbnails for {len(files)} files in {target}...")
+        
+        def worker(job):
+            cancel_event = threading.Event()
+            job.on_cancel(cancel_event.set)
+            
+            def on_progress(done, count):
+                job.update(f"🖼 Thumbnails for {target}: {done}/{count}")
+            
+            items, hits = self.contact_sheet.thumbnails(files, cancel_event, on_progress)
+            job.check()
+            if not items:
+                job.update(f"❌ Could not create any thumbnails in {target}", force=True)
+                return
+            
+            sheets = self.contact_sheet.build(items)
+            summary = f"🖼 {len(items)} thumbnails from {target} ({hits} cached)"
+            if total > len(files):
+                summary += f"\n⚠️ Showing the first {len(files)} of {total} media files"
+            if len(items) < len(files):
+                summary += f"\n⚠️ {len(files) - len(items)} files could not be read"
+            job.update(summary, force=True)
+            
+            for sheet, first, last in sheets:
+                job.check()
+                # Sheet dari thumbnail yang sama identik byte-per-byte: dikirim ulang lewat file_id tanpa upload
+                self.file_ids.send(update.message.reply_photo, sheet, 'photo',
+                                   caption=f"🖼 {os.path.basename(target) or target}: {first}-{last} of {len(items)}")
+        
+        self.jobs.submit(f"Thumbnails {target}", worker, resource='cpu',
+                         chat_id=update.effective_chat.id, progress=progress)
+    
+    @log_function_call
+    def index_command(self, update, context):
+        """Build/refresh filename index untuk folder sekarang, atau tampilkan status"""
+        try:
+            if context.args and context.args[0].lower() == 'status':
+                roots = self.file_ops.index.list_roots()
+                if not roots:
+                    update.message.reply_text("ℹ️ No folders indexed yet. Use /index inside a folder to build one.")
+                    return
+                
+                message = "🗂 *Filename Index*\n\n"
+                for root in roots:
+                    updated = format_time(root['updated_at']) if root['updated_at'] else 'never'
+                    message += (f"• {escape_md(root['root'])}\n"
+                                f"    Status: {escape_md(root['status'])} \\| "
+                                f"Entries: {root['entries']} \\| Updated: {escape_md(updated)}\n")
+                send_long_message(update, message, 'MarkdownV2')
+                return
+            
+            current_path = context.user_data.get('current_path', self.file_ops.DEFAULT_PATH)
+            if current_path == self.file_ops.DEFAULT_PATH:
+                update.message.reply_text("❌ Please select a drive first using /cd command")
+                return
+            
+            if self.file_ops.index.build_async(current_path):
+                update.message.reply_text(
+                    f"🗂 Indexing started for {current_path}\n"
+                    "Searches fall back to a live walk until the index is ready. Check with /index status"
+                )
+            else:
+                update.message.reply_text("⏳ Index for this folder is already being built.")
+        
+        except Exception as e:
+            update.message.reply_text(f"❌ Error building index: {str(e)}")
+            self.logger.error(f"Error in index_command: {str(e)}")
+    
+    def start_background_indexing(self):
+        """Refresh index untuk root yang dikonfigurasi di SEARCH_INDEX_ROOTS"""
+        for root in getattr(self.auth.config, 'SEARCH_INDEX_ROOTS', ()):
+            if os.path.isdir(root):
+                self.file_ops.index.build_async(root)
+            else:
+                self.logger.warning(f"Configured index root not found: {root}")
+    
     def upload_file(self, update, context):
-        """Handle file upload"""
+        """Handle file upload (di-stream ke disk di worker, album didownload paralel)"""
         if not update.message.document:
             update.message.reply_text("❌ Please send a file to upload")
             return
@@ -290,23 +1189,41 @@ class FileManagerHandlers:
         if current_path == self.file_ops.DEFAULT_PATH:
             update.message.reply_text("❌ Please select a drive first using /cd command")
             return
-            
+        
+        # Dispatcher tidak menunggu: document berikutnya dari album yang sama langsung ikut didownload
+        file = update.message.document
+        self.jobs.submit(f"Receive {file.file_name}",
+                         lambda job: self.receive_document(update, context, current_path),
+                         resource='download', chat_id=update.effective_chat.id)
+    
+    def receive_document(self, update, context, current_path):
+        """Download satu document ke current_path dan laporkan hasilnya"""
         file = update.message.document
         
         try:
-            file_path = os.path.join(current_path, file.file_name)
+            result = DocumentReceiver(context.bot).receive(file, current_path)
+            self.file_ops.listing_cache.invalidate(current_path)
             
-            # Get the file from Telegram
-            file_info = context.bot.get_file(file.file_id)
-            file_info.download(file_path)
+            saved_name = os.path.basename(result['path'])
+            size = format_size(result['size'])
+            if result['status'] == 'identical':
+                message = f"☑️ {saved_name} already exists with identical content, nothing written\n📦 Size: {size}"
+            elif result['status'] == 'renamed':
+                message = f"✅ File uploaded as {saved_name} ({file.file_name} already exists)\n📦 Size: {size}"
+            else:
+                message = f"✅ File uploaded: {saved_name}\n📦 Size: {size}"
+            if result['resumed_from']:
+                message += f"\n⏯ Resumed from {format_size(result['resumed_from'])}"
+            message += f"\n🔑 SHA256: {result['sha256']}"
+            update.message.reply_text(message)
             
-            update.message.reply_text(f"✅ File uploaded: {file.file_name}\n📦 Size: {format_size(os.path.getsize(file_path))}")
-            
-            # Refresh directory listing
-            self.list_directory(update, context)
+            # Refresh directory listing (sekali saja untuk album, bukan per file)
+            if not update.message.media_group_id:
+                self.list_directory(update, context)
             
         except Exception as e:
-            update.message.reply_text(f"❌ Error uploading file: {str(e)}")
+            update.message.reply_text(f"❌ Error uploading {file.file_name}: {str(e)}")
+            raise
     
     def cancel_operation(self, update, context):
         """Cancel any file operation"""
@@ -316,7 +1233,24 @@ class FileManagerHandlers:
     def register_handlers(self, dispatcher):
         """Register semua file manager handlers"""
         # Basic commands
-        dispatcher.add_handler(CommandHandler('ls', self.auth.require_auth(self.list_directory)))
+        dispatcher.add_handler(CommandHandler('ls', self.auth.require_auth(self.browse_directory)))
+        dispatcher.add_handler(CommandHandler('lsall', self.auth.require_auth(self.list_directory)))
+        dispatcher.add_handler(CallbackQueryHandler(
+            self.auth.require_auth(self.browser.handle_callback),
+            pattern=rf'^{FileBrowser.CALLBACK_PREFIX}\|'
+        ))
+        dispatcher.add_handler(CommandHandler('index', self.auth.require_auth(self.index_command)))
+        dispatcher.add_handler(CommandHandler('du', self.auth.require_auth(self.du_command)))
+        dispatcher.add_handler(CommandHandler('dupes', self.auth.require_auth(self.dupes_command)))
+        dispatcher.add_handler(CommandHandler('grep', self.auth.require_auth(self.grep_command)))
+        dispatcher.add_handler(CommandHandler('head', self.auth.require_auth(self.head_command)))
+        dispatcher.add_handler(CommandHandler('tail', self.auth.require_auth(self.tail_command)))
+        dispatcher.add_handler(CommandHandler('watch', self.auth.require_auth(self.watch_command)))
+        dispatcher.add_handler(CommandHandler('thumbs', self.auth.require_auth(self.thumbs_command)))
+        dispatcher.add_handler(CallbackQueryHandler(
+            self.auth.require_auth(self.du_callback),
+            pattern=rf'^{DiskUsageView.CALLBACK_PREFIX}\|'
+        ))
         
         # Conversation handlers
         cd_handler = ConversationHandler(
@@ -364,7 +1298,13 @@ class FileManagerHandlers:
         )
         dispatcher.add_handler(search_handler)
         
+        # Stop live search: /cancel di group terpisah supaya tetap jalan di luar conversation
+        dispatcher.add_handler(CommandHandler('cancel', self.cancel_search), group=1)
+        dispatcher.add_handler(CallbackQueryHandler(self.auth.require_auth(self.cancel_search), pattern=r'^srch\|stop$'))
+        
         # File upload handler
         dispatcher.add_handler(MessageHandler(Filters.document, self.auth.require_auth(self.upload_file)))
         
+        self.start_background_indexing()
+        
         self.logger.info("File manager handlers registered")
\ No newline at end of file
@@ -0,0 +1,325 @@
+# modules/file_manager/index.py
+import os
+import time
+import sqlite3
+import logging
+import threading
+from modules.utils.helpers import format_size
+
+class FileIndex:
+    """Index nama file persisten (SQLite) per root untuk /search yang cepat"""
+
+    REFRESH_INTERVAL = 300  # Detik sebelum index dianggap perlu di-refresh
+    BATCH_DIRS = 200        # Commit setiap N folder saat build
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self.logger = logging.getLogger(__name__)
+        self._conn = None
+        self._lock = threading.Lock()
+        self._builders = {}
+        self._fts = False
+
+    # ------------------------------------------------------------------
+    # Database
+    # ------------------------------------------------------------------
+    def _connect(self):
+        """Buka koneksi SQLite (lazy) dan buat schema jika belum ada"""
+        if self._conn is not None:
+            return self._conn
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS roots (
+                root_key TEXT PRIMARY KEY,
+                root TEXT NOT NULL,
+                status TEXT NOT NULL,
+                updated_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS dirs (
+                path_key TEXT PRIMARY KEY,
+                root_key TEXT NOT NULL,
+                mtime REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS dirs_root ON dirs(root_key);
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                parent_key TEXT NOT NULL,
+                parent TEXT NOT NULL,
+                name TEXT NOT NULL,
+                name_lower TEXT NOT NULL,
+                ext TEXT NOT NULL,
+                is_dir INTEGER NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_parent ON entries(parent_key);
+            CREATE INDEX IF NOT EXISTS entries_name ON entries(name_lower);
+            CREATE INDEX IF NOT EXISTS entries_ext ON entries(ext);
+        """)
+
+        # Trigram FTS untuk substring search (butuh SQLite >= 3.34)
+        try:
+            conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                    name_lower, content='entries', content_rowid='id', tokenize='trigram'
+                );
+                CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+                    INSERT INTO entries_fts(rowid, name_lower) VALUES (new.id, new.name_lower);
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+                    INSERT INTO entries_fts(entries_fts, rowid, name_lower) VALUES ('delete', old.id, old.name_lower);
+                END;
+            """)
+            self._fts = True
+        except sqlite3.OperationalError as e:
+            self.logger.warning(f"Trigram FTS not available, using plain scan: {e}")
+            self._fts = False
+
+        conn.commit()
+        self._conn = conn
+        return conn
+
+    @staticmethod
+    def _key(path):
+        """Normalisasi path untuk dipakai sebagai key (case-insensitive di Windows)"""
+        return os.path.normcase(os.path.normpath(path))
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+    def find_root(self, path):
+        """Return root ter-index yang mencakup path, atau None"""
+        key = self._key(path)
+        with self._lock:
+            rows = self._connect().execute("SELECT root_key, root, status, updated_at FROM roots").fetchall()
+
+        best = None
+        for root_key, root, status, updated_at in rows:
+            if key == root_key or key.startswith(root_key.rstrip(os.sep) + os.sep):
+                if best is None or len(root_key) > len(best['root_key']):
+                    best = {'root_key': root_key, 'root': root, 'status': status, 'updated_at': updated_at}
+        return best
+
+    def is_building(self, path):
+        """Check apakah index untuk root sedang dibangun"""
+        builder = self._builders.get(self._key(path))
+        return builder is not None and builder.is_alive()
+
+    def list_roots(self):
+        """List semua root beserta jumlah entry"""
+        with self._lock:
+            conn = self._connect()
+            roots = conn.execute("SELECT root_key, root, status, updated_at FROM roots ORDER BY root").fetchall()
+            result = []
+            for root_key, root, status, updated_at in roots:
+                count = conn.execute(
+                    "SELECT COUNT(*) FROM entries WHERE parent_key = ? OR (parent_key >= ? AND parent_key < ?)",
+                    self._scope_args(root_key)
+                ).fetchone()[0]
+                result.append({
+                    'root': root,
+                    'status': 'building' if self.is_building(root) else status,
+                    'updated_at': updated_at,
+                    'entries': count
+                })
+        return result
+
+    # ------------------------------------------------------------------
+    # Build dan refresh
+    # ------------------------------------------------------------------
+    def build_async(self, root):
+        """Bangun / refresh index untuk root di background thread"""
+        root = os.path.normpath(root)
+        root_key = self._key(root)
+
+        if self.is_building(root):
+            return False
+
+        builder = threading.Thread(target=self._refresh, args=(root, root_key), daemon=True,
+                                   name=f"file-index-{root}")
+        self._builders[root_key] = builder
+        builder.start()
+        return True
+
+    def refresh_if_stale(self, root_info):
+        """Trigger refresh incremental jika index sudah lebih tua dari REFRESH_INTERVAL"""
+        updated_at = root_info.get('updated_at') or 0
+        if time.time() - updated_at > self.REFRESH_INTERVAL:
+            self.build_async(root_info['root'])
+
+    def _refresh(self, root, root_key):
+        """Walk incremental: folder yang mtime-nya tidak berubah tidak di-scan ulang"""
+        started = time.time()
+        scanned = 0
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR IGNORE INTO roots (root_key, root, status, updated_at) VALUES (?, ?, 'building', NULL)",
+                    (root_key, root)
+                )
+                known = dict(conn.execute("SELECT path_key, mtime FROM dirs WHERE root_key = ?", (root_key,)).fetchall())
+                conn.commit()
+
+            seen = set()
+            stack = [root]
+            pending = 0
+
+            while stack:
+                path = stack.pop()
+                path_key = self._key(path)
+                seen.add(path_key)
+
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    continue
+
+                if known.get(path_key) == mtime:
+                    # Folder tidak berubah: cukup turun ke subfolder yang sudah ter-index
+                    with self._lock:
+                        children = self._connect().execute(
+                            "SELECT name FROM entries WHERE parent_key = ? AND is_dir = 1", (path_key,)
+                        ).fetchall()
+                    stack.extend(os.path.join(path, name) for (name,) in children)
+                    continue
+
+                rows, subdirs = self._scan_dir(path, path_key)
+                scanned += 1
+                stack.extend(subdirs)
+
+                with self._lock:
+                    conn = self._connect()
+                    conn.execute("DELETE FROM entries WHERE parent_key = ?", (path_key,))
+                    conn.executemany(
+                        "INSERT INTO entries (parent_key, parent, name, name_lower, ext, is_dir, size) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO dirs (path_key, root_key, mtime) VALUES (?, ?, ?)",
+                        (path_key, root_key, mtime)
+                    )
+                    pending += 1
+                    if pending >= self.BATCH_DIRS:
+                        conn.commit()
+                        pending = 0
+
+            # Hapus folder yang sudah tidak ada
+            removed = [key for key in known if key not in seen]
+            with self._lock:
+                conn = self._connect()
+                for key in removed:
+                    conn.execute("DELETE FROM entries WHERE parent_key = ?", (key,))
+                    conn.execute("DELETE FROM dirs WHERE path_key = ?", (key,))
+                conn.execute(
+                    "UPDATE roots SET status = 'ready', updated_at = ? WHERE root_key = ?",
+                    (time.time(), root_key)
+                )
+                conn.commit()
+
+            self.logger.info(
+                f"Index refreshed for {root}: {scanned} dirs rescanned, {len(removed)} removed "
+                f"in {time.time() - started:.1f}s"
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error building index for {root}: {e}")
+            try:
+                with self._lock:
+                    self._connect().execute("UPDATE roots SET status = 'error' WHERE root_key = ?", (root_key,))
+                    self._connect().commit()
+            except Exception:
+                pass
+
+    def _scan_dir(self, path, path_key):
+        """Scan satu folder, return (rows untuk tabel entries, list subfolder)"""
+        rows = []
+        subdirs = []
+
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if is_dir and entry.name.startswith('.'):
+                            continue  # Skip hidden directories (sama seperti search_files)
+                        size = 0 if is_dir else entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+
+                    name_lower = entry.name.lower()
+                    ext = '' if is_dir else os.path.splitext(name_lower)[1]
+                    rows.append((path_key, path, entry.name, name_lower, ext, int(is_dir), size))
+                    if is_dir:
+                        subdirs.append(entry.path)
+        except OSError as e:
+            self.logger.debug(f"Cannot scan {path}: {e}")
+
+        return rows, subdirs
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _scope_args(path_key):
+        """Argumen untuk filter 'parent_key berada di bawah path_key'"""
+        prefix = path_key.rstrip(os.sep) + os.sep
+        return (path_key, prefix, prefix[:-1] + chr(ord(os.sep) + 1))
+
+    def search(self, current_path, pattern, max_results=1000):
+        """Cari nama di index. Pattern: '.ext' (extension), 'abc*' (prefix), selain itu substring"""
+        pattern_lower = pattern.lower().strip()
+        scope_sql = "(e.parent_key = ? OR (e.parent_key >= ? AND e.parent_key < ?))"
+        scope_args = self._scope_args(self._key(current_path))
+
+        if pattern_lower.startswith('.') and len(pattern_lower) > 1 and ' ' not in pattern_lower \
+                and '.' not in pattern_lower[1:]:
+            sql = f"SELECT e.parent, e.name, e.is_dir, e.size FROM entries e WHERE e.ext = ? AND {scope_sql}"
+            args = (pattern_lower,) + scope_args
+        elif pattern_lower.endswith('*') and len(pattern_lower) > 1:
+            prefix = pattern_lower[:-1]
+            sql = (f"SELECT e.parent, e.name, e.is_dir, e.size FROM entries e "
+                   f"WHERE e.name_lower >= ? AND e.name_lower < ? AND {scope_sql}")
+            args = (prefix, prefix + '\uffff') + scope_args
+        elif self._fts and len(pattern_lower) >= 3:
+            sql = (f"SELECT e.parent, e.name, e.is_dir, e.size FROM entries_fts f "
+                   f"JOIN entries e ON e.id = f.rowid WHERE f.name_lower MATCH ? AND {scope_sql}")
+            args = ('"' + pattern_lower.replace('"', '""') + '"',) + scope_args
+        else:
+            sql = f"SELECT e.parent, e.name, e.is_dir, e.size FROM entries e WHERE instr(e.name_lower, ?) > 0 AND {scope_sql}"
+            args = (pattern_lower,) + scope_args
+
+        with self._lock:
+            rows = self._connect().execute(sql + " LIMIT ?", args + (max_results + 1,)).fetchall()
+
+        results = []
+        for parent, name, is_dir, size in rows[:max_results]:
+            rel_path = os.path.relpath(os.path.join(parent, name), current_path)
+            if is_dir:
+                results.append({
+                    'name': name,
+                    'type': 'directory',
+                    'path': rel_path,
+                    'display': f"📁 {rel_path}/"
+                })
+            else:
+                size = format_size(size)
+                results.append({
+                    'name': name,
+                    'type': 'file',
+                    'path': rel_path,
+                    'size': size,
+                    'display': f"📄 {rel_path} ({size})"
+                })
+
+        return {
+            'results': results,
+            'total_found': len(results),
+            'search_limited': len(rows) > max_results,
+            'pattern': pattern,
+            'source': 'index'
+        }
@@ -0,0 +1,174 @@
+# modules/file_manager/listing.py
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from modules.utils.helpers import format_size, format_time
+from modules.utils.render import LISTING_PARENT, LISTING_DIR, LISTING_DENIED, LISTING_FILE
+
+class ListingEntry:
+    """Satu entry directory dalam bentuk compact (tanpa string display yang sudah diformat)"""
+
+    __slots__ = ('name', 'is_dir', 'size', 'mtime', 'denied')
+
+    def __init__(self, name, is_dir, size=0, mtime=0.0, denied=False):
+        self.name = name
+        self.is_dir = is_dir
+        self.size = size
+        self.mtime = mtime
+        self.denied = denied
+
+    @property
+    def type(self):
+        return 'directory' if self.is_dir else 'file'
+
+    def display(self):
+        """Format baris untuk ditampilkan (hanya dipanggil untuk baris yang dikirim)"""
+        if self.denied:
+            return f"🚫 {self.name}/ (Access Denied)"
+        if self.is_dir:
+            return f"📁 {self.name}/"
+        return f"📄 {self.name} ({format_size(self.size)}, {format_time(self.mtime)})"
+
+    def markdown(self):
+        """Baris MarkdownV2 dari template yang sudah di-parse (hanya field yang di-escape)"""
+        if self.denied:
+            return LISTING_DENIED.render(name=self.name)
+        if self.is_dir:
+            return LISTING_DIR.render(name=self.name)
+        return LISTING_FILE.render(name=self.name, size=format_size(self.size), modified=format_time(self.mtime))
+
+class DirectoryListing:
+    """Snapshot isi satu directory: folder dulu, lalu file, masing-masing urut nama"""
+
+    def __init__(self, path, entries, has_parent):
+        self.path = path
+        self.entries = entries
+        self.has_parent = has_parent
+
+    def __len__(self):
+        return len(self.entries) + (1 if self.has_parent else 0)
+
+    def iter_entries(self, start=0, stop=None):
+        """Yield entries secara lazy dalam range [start, stop)"""
+        stop = len(self.entries) if stop is None else min(stop, len(self.entries))
+        for i in range(start, stop):
+            yield self.entries[i]
+
+    def iter_display(self, limit=None):
+        """Yield string display secara lazy, termasuk baris parent directory"""
+        remaining = len(self) if limit is None else limit
+        if self.has_parent and remaining > 0:
+            yield '📂 .. (Parent Directory)'
+            remaining -= 1
+        for entry in self.iter_entries(0, remaining):
+            yield entry.display()
+
+    def iter_markdown(self, limit=None):
+        """Seperti iter_display, tetapi langsung dalam MarkdownV2"""
+        remaining = len(self) if limit is None else limit
+        if self.has_parent and remaining > 0:
+            yield LISTING_PARENT
+            remaining -= 1
+        for entry in self.iter_entries(0, remaining):
+            yield entry.markdown()
+
+def scan_directory(path):
+    """Scan directory dengan os.scandir, memakai stat yang sudah di-cache oleh DirEntry"""
+    logger = logging.getLogger(__name__)
+    dirs = []
+    files = []
+
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir():
+                    dirs.append(ListingEntry(entry.name, True))
+                else:
+                    stats = entry.stat()
+                    files.append(ListingEntry(entry.name, False, stats.st_size, stats.st_mtime))
+            except PermissionError:
+                dirs.append(ListingEntry(entry.name, True, denied=True))
+            except OSError as e:
+                logger.error(f"Error accessing {entry.path}: {str(e)}")
+
+    by_name = attrgetter('name')
+    dirs.sort(key=by_name)
+    files.sort(key=by_name)
+    dirs.extend(files)
+
+    return DirectoryListing(path, dirs, os.path.dirname(path) != path)
+
+class ListingCache:
+    """LRU cache snapshot listing, di-key dengan path dan mtime directory"""
+
+    def __init__(self, max_entries=200000, max_age=60, prefetch_workers=2, prefetch_limit=20):
+        self.max_entries = max_entries        # Batas total entry di semua snapshot (memory cap)
+        self.max_age = max_age                # Detik; ukuran file di dalam folder tidak mengubah mtime folder
+        self.prefetch_limit = prefetch_limit  # Maksimal subfolder yang di-prefetch per /cd
+        self.logger = logging.getLogger(__name__)
+        self._snapshots = OrderedDict()
+        self._total_entries = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix='listing-prefetch')
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.normpath(path))
+
+    def get(self, path):
+        """Return listing dari cache jika mtime folder tidak berubah, scan ulang jika berubah"""
+        key = self._key(path)
+        mtime = os.stat(path).st_mtime
+
+        with self._lock:
+            cached = self._snapshots.get(key)
+            if cached is not None:
+                cached_mtime, scanned_at, listing = cached
+                if cached_mtime == mtime and time.monotonic() - scanned_at < self.max_age:
+                    self._snapshots.move_to_end(key)
+                    return listing
+
+        listing = scan_directory(path)
+        self._store(key, mtime, listing)
+        return listing
+
+    def _store(self, key, mtime, listing):
+        """Simpan snapshot dan evict yang paling lama tidak dipakai sampai di bawah memory cap"""
+        with self._lock:
+            old = self._snapshots.pop(key, None)
+            if old is not None:
+                self._total_entries -= len(old[2].entries)
+
+            self._snapshots[key] = (mtime, time.monotonic(), listing)
+            self._total_entries += len(listing.entries)
+
+            while self._total_entries > self.max_entries and len(self._snapshots) > 1:
+                _, (_, _, evicted) = self._snapshots.popitem(last=False)
+                self._total_entries -= len(evicted.entries)
+
+    def invalidate(self, path):
+        """Buang snapshot untuk path (dipanggil setelah mkdir/delete/upload)"""
+        with self._lock:
+            old = self._snapshots.pop(self._key(path), None)
+            if old is not None:
+                self._total_entries -= len(old[2].entries)
+
+    def prefetch_children(self, path):
+        """Scan subfolder dari path di background supaya navigasi berikutnya dilayani dari memory"""
+        self._executor.submit(self._prefetch, path)
+
+    def _prefetch(self, path):
+        try:
+            listing = self.get(path)
+            children = [entry.name for entry in listing.entries if entry.is_dir and not entry.denied]
+            for name in children[:self.prefetch_limit]:
+                try:
+                    self.get(os.path.join(path, name))
+                except OSError:
+                    pass
+        except Exception as e:
+            self.logger.debug(f"Prefetch failed for {path}: {e}")
@@ -1,12 +1,18 @@
 # modules/file_manager/operations.py
 import os
-import string
 import shutil
-import psutil
 import logging
 from pathlib import Path
-from ctypes import windll
-from modules.utils.helpers import format_size, format_time
+from modules.utils.helpers import get_app_dir
+from modules.file_manager.index import FileIndex
+from modules.file_manager.drives import DriveProbe
+from modules.file_manager.listing import ListingCache
+from modules.file_manager.search import ParallelSearch
+from modules.file_manager.grep import ContentSearch
+from modules.file_manager.query import SearchQuery
+from modules.file_manager.usage import DiskUsage
+from modules.file_manager.dupes import DuplicateFinder, HashCache, DEFAULT_MIN_SIZE
+from modules.file_manager.thumbs import ThumbnailCache
 
 class FileOperations:
     """Core file operations untuk file manager"""
@@ -15,109 +21,40 @@ class FileOperations:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self.index = FileIndex(get_app_dir() / "cache" / "file_index.db")
+        self.listing_cache = ListingCache()
+        self.drives = DriveProbe()
+        self.usage = DiskUsage()
+        self.hash_cache = HashCache(get_app_dir() / "cache" / "hashes.db")
+        self.thumb_cache = ThumbnailCache(get_app_dir() / "cache" / "thumbs")
     
     def get_available_drives(self):
-        """Get list of available drives on Windows"""
-        drives = []
-        bitmask = windll.kernel32.GetLogicalDrives()
-        for letter in string.ascii_uppercase:
-            if bitmask & 1:
-                drives.append(f"{letter}:")
-            bitmask >>= 1
-        return drives
+        """Get list of available drives (drive letter di Windows, mount point di OS lain)"""
+        return [name for name, _ in self.drives.list_drives()]
     
     def list_directory_content(self, path):
         """List directory contents dengan informasi detail"""
         try:
             # Special case untuk root listing
             if path == self.DEFAULT_PATH or path == "root":
-                drives = self.get_available_drives()
-                content = {
+                # Probe paralel dengan timeout + cache TTL: drive yang hang tidak memblokir listing
+                return {
                     'type': 'drives',
-                    'drives': [],
+                    'drives': [drive.to_dict() for drive in self.drives.probe()],
                     'current_path': path
                 }
-                
-                for drive in drives:
-                    try:
-                        usage = psutil.disk_usage(drive)
-                        free_space = format_size(usage.free)
-                        total_space = format_size(usage.total)
-                        content['drives'].append({
-                            'name': drive,
-                            'free_space': free_space,
-                            'total_space': total_space,
-                            'accessible': True
-                        })
-                    except:
-                        content['drives'].append({
-                            'name': drive,
-                            'free_space': 'N/A',
-                            'total_space': 'N/A',
-                            'accessible': False
-                        })
-                
-                return content
             
             # Normal directory listing
             if not os.path.exists(path):
                 raise FileNotFoundError(f"Path does not exist: {path}")
             
-            items = []
-            
-            # Add parent directory if not in root
-            if os.path.dirname(path) != path:
-                items.append({
-                    'name': '..',
-                    'type': 'parent',
-                    'display': '📂 .. (Parent Directory)'
-                })
-            
-            # List directories and files
-            dirs = []
-            files = []
-            
-            for item in sorted(os.listdir(path)):
-                item_path = os.path.join(path, item)
-                try:
-                    stats = os.stat(item_path)
-                    
-                    if os.path.isdir(item_path):
-                        dirs.append({
-                            'name': item,
-                            'type': 'directory',
-                            'display': f"📁 {item}/",
-                            'path': item_path
-                        })
-                    else:
-                        size = format_size(stats.st_size)
-                        modified = format_time(stats.st_mtime)
-                        files.append({
-                            'name': item,
-                            'type': 'file',
-                            'display': f"📄 {item} ({size}, {modified})",
-                            'path': item_path,
-                            'size': stats.st_size
-                        })
-                except PermissionError:
-                    dirs.append({
-                        'name': item,
-                        'type': 'directory',
-                        'display': f"🚫 {item}/ (Access Denied)",
-                        'path': item_path
-                    })
-                except Exception as e:
-                    self.logger.error(f"Error accessing {item_path}: {str(e)}")
-            
-            # Combine lists
-            items.extend(dirs)
-            items.extend(files)
+            listing = self.listing_cache.get(path)
             
             return {
                 'type': 'directory',
-                'items': items,
+                'listing': listing,
                 'current_path': path,
-                'total_items': len(items)
+                'total_items': len(listing)
             }
             
         except PermissionError:
@@ -182,10 +119,11 @@ class FileOperations:
         
         dir_path = os.path.join(current_path, dir_name)
         os.makedirs(dir_path, exist_ok=True)
+        self.listing_cache.invalidate(os.path.dirname(dir_path))
         return dir_path
     
-    def delete_item(self, current_path, item_name):
-        """Delete file or directory"""
+    def delete_item(self, current_path, item_name, job=None):
+        """Delete file or directory (folder dihapus per file supaya job bisa melaporkan progress dan di-cancel)"""
         if current_path == self.DEFAULT_PATH:
             raise ValueError("Please select a drive first using /cd command")
         
@@ -196,60 +134,84 @@ class FileOperations:
         
         if os.path.isfile(item_path):
             os.remove(item_path)
+            self.listing_cache.invalidate(os.path.dirname(item_path))
             return f"File deleted: {item_name}"
         else:
-            shutil.rmtree(item_path)
+            try:
+                if job is None:
+                    shutil.rmtree(item_path)
+                else:
+                    self._remove_tree(item_path, job)
+            finally:
+                self.listing_cache.invalidate(os.path.dirname(os.path.normpath(item_path)))
+                self.listing_cache.invalidate(item_path)
             return f"Directory deleted: {item_name}"
     
+    def _remove_tree(self, path, job):
+        """rmtree bottom-up yang cek cancel dan update progress job di setiap folder"""
+        removed = 0
+        for root, dirs, files in os.walk(path, topdown=False):
+            job.check()
+            for name in files:
+                os.remove(os.path.join(root, name))
+                removed += 1
+            for name in dirs:
+                dir_path = os.path.join(root, name)
+                if os.path.islink(dir_path):
+                    os.remove(dir_path)
+                else:
+                    os.rmdir(dir_path)
+                removed += 1
+            job.update(f"🗑 Deleting {os.path.basename(path)}: {removed} items removed...")
+        os.rmdir(path)
+    
+    def search_index(self, current_path, pattern, max_results=1000):
+        """Search lewat filename index, return None jika root belum ter-index atau query butuh live walk"""
+        query = pattern if isinstance(pattern, SearchQuery) else SearchQuery(pattern)
+        if query.simple_pattern is None:
+            return None
+        pattern = query.simple_pattern
+        
+        root_info = self.index.find_root(current_path)
+        if root_info and root_info['status'] == 'ready':
+            self.index.refresh_if_stale(root_info)
+            return self.index.search(current_path, pattern, max_results)
+        return None
+    
+    def find_duplicates(self, path, min_size=DEFAULT_MIN_SIZE, cancel_event=None, progress=None):
+        """Cari file duplikat di bawah path, return list group (reclaimable terbesar dulu)"""
+        if path == self.DEFAULT_PATH:
+            raise ValueError("Please select a drive first using /cd command")
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Not a folder: {path}")
+        
+        finder = DuplicateFinder(path, self.hash_cache, min_size=min_size,
+                                 cancel_event=cancel_event, progress=progress)
+        return finder.run()
+    
+    def create_search(self, current_path, pattern, max_results=1000):
+        """Buat ParallelSearch untuk live walk (pattern di-compile ke SearchQuery)"""
+        if current_path == self.DEFAULT_PATH:
+            raise ValueError("Please select a drive first using /cd command")
+        return ParallelSearch(current_path, pattern, max_results)
+    
+    def create_content_search(self, path, pattern, name_glob=None):
+        """Buat ContentSearch (grep isi file) di bawah path; re.error jika regex tidak valid"""
+        if path == self.DEFAULT_PATH:
+            raise ValueError("Please select a drive first using /cd command")
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Not a folder: {path}")
+        return ContentSearch(path, pattern, name_glob)
+    
     def search_files(self, current_path, pattern, max_results=1000):
-        """Search for files matching pattern"""
+        """Search for files matching pattern (pakai index jika root sudah ter-index)"""
         if current_path == self.DEFAULT_PATH:
             raise ValueError("Please select a drive first using /cd command")
         
-        results = []
-        search_count = 0
-        
-        for root, dirs, files in os.walk(current_path):
-            # Skip hidden directories
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-
-            for item in dirs + files:
-                if pattern.lower() in item.lower():
-                    rel_path = os.path.relpath(os.path.join(root, item), current_path)
-                    if os.path.isdir(os.path.join(root, item)):
-                        results.append({
-                            'name': item,
-                            'type': 'directory',
-                            'path': rel_path,
-                            'display': f"📁 {rel_path}/"
-                        })
-                    else:
-                        try:
-                            size = format_size(os.path.getsize(os.path.join(root, item)))
-                            results.append({
-                                'name': item,
-                                'type': 'file',
-                                'path': rel_path,
-                                'display': f"📄 {rel_path} ({size})"
-                            })
-                        except:
-                            results.append({
-                                'name': item,
-                                'type': 'file',
-                                'path': rel_path,
-                                'display': f"📄 {rel_path} (size unknown)"
-                            })
-                    
-                    search_count += 1
-                    if search_count >= max_results:
-                        break
-            
-            if search_count >= max_results:
-                break
+        result = self.search_index(current_path, pattern, max_results)
+        if result is not None:
+            return result
         
-        return {
-            'results': results,
-            'total_found': len(results),
-            'search_limited': search_count >= max_results,
-            'pattern': pattern
-        }
\ No newline at end of file
+        search = self.create_search(current_path, pattern, max_results)
+        search.run()
+        return search.to_result()
@@ -0,0 +1,201 @@
+# modules/file_manager/query.py
+import re
+import time
+import shlex
+import fnmatch
+
+SIZE_UNITS = {
+    '': 1, 'b': 1,
+    'k': 1024, 'kb': 1024,
+    'm': 1024 ** 2, 'mb': 1024 ** 2,
+    'g': 1024 ** 3, 'gb': 1024 ** 3,
+    't': 1024 ** 4, 'tb': 1024 ** 4,
+}
+
+AGE_UNITS = {
+    's': 1,
+    'm': 60, 'min': 60,
+    'h': 3600,
+    'd': 86400,
+    'w': 7 * 86400,
+    'y': 365 * 86400,
+}
+
+OPERATORS = {
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '=': lambda a, b: a == b,
+}
+
+FILTER_PATTERN = re.compile(r'^(size|modified|mtime|depth)(>=|<=|>|<|=)(.+)$', re.IGNORECASE)
+GLOB_CHARS = re.compile(r'[*?\[]')
+
+def split_terms(text):
+    """Split seperti shell (quote didukung) tanpa escape: backslash regex dan path Windows tetap utuh"""
+    lexer = shlex.shlex(text, posix=True)
+    lexer.whitespace_split = True
+    lexer.escape = ''
+    return list(lexer)
+
+def parse_size(text):
+    """Parse ukuran seperti '500M', '1.5G', '10kb' ke bytes"""
+    match = re.match(r'^(\d+(?:\.\d+)?)\s*([a-z]*)$', text.strip().lower())
+    if not match or match.group(2) not in SIZE_UNITS:
+        raise ValueError(f"Invalid size: {text} (use e.g. 500K, 10M, 1.5G)")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+def parse_age(text):
+    """Parse umur seperti '7d', '12h', '30min' ke detik"""
+    match = re.match(r'^(\d+(?:\.\d+)?)\s*([a-z]+)$', text.strip().lower())
+    if not match or match.group(2) not in AGE_UNITS:
+        raise ValueError(f"Invalid age: {text} (use e.g. 30min, 12h, 7d, 2w)")
+    return float(match.group(1)) * AGE_UNITS[match.group(2)]
+
+class SearchQuery:
+    """Query search yang di-compile sekali menjadi matcher.
+
+    Syntax (semua term di-AND):
+        report            substring pada nama
+        *.mp4, img_??     glob pada nama
+        re:^IMG_\\d+      regex pada nama
+        ext:jpg,png       extension
+        path:src/**/*.py  glob relative path per segment (subtree yang tidak cocok tidak di-walk)
+        type:file         type:file / type:dir
+        size>500M         size >, >=, <, <=, = (K, M, G, T)
+        modified<7d       umur file (s, min, h, d, w, y); < berarti lebih baru
+        depth<=2          batas kedalaman folder
+    """
+
+    def __init__(self, text):
+        self.text = text.strip()
+        self.name_tests = []
+        self.path_segments = None
+        self.type = None
+        self.size_tests = []
+        self.age_tests = []
+        self.max_depth = None
+        self.simple_pattern = None
+        self._parse()
+
+    def _parse(self):
+        try:
+            tokens = split_terms(self.text)
+        except ValueError:
+            tokens = self.text.split()
+
+        if not tokens:
+            raise ValueError("Search pattern is empty")
+
+        for token in tokens:
+            lower = token.lower()
+            filter_match = FILTER_PATTERN.match(token)
+
+            if filter_match:
+                field, op, value = filter_match.group(1).lower(), filter_match.group(2), filter_match.group(3)
+                if field == 'size':
+                    self.size_tests.append((OPERATORS[op], parse_size(value)))
+                elif field == 'depth':
+                    depth = int(value)
+                    limit = {'<': depth - 1, '<=': depth, '=': depth}.get(op)
+                    if limit is None:
+                        raise ValueError("Only depth<, depth<= and depth= are supported")
+                    self.max_depth = limit if self.max_depth is None else min(self.max_depth, limit)
+                else:
+                    self.age_tests.append((OPERATORS[op], parse_age(value)))
+            elif lower.startswith('type:'):
+                kind = lower[5:]
+                if kind in ('file', 'f'):
+                    self.type = 'file'
+                elif kind in ('dir', 'directory', 'folder', 'd'):
+                    self.type = 'directory'
+                else:
+                    raise ValueError(f"Invalid type: {kind} (use type:file or type:dir)")
+            elif lower.startswith('ext:'):
+                exts = [e.lstrip('.') for e in lower[4:].split(',') if e]
+                regex = re.compile(r'\.(' + '|'.join(re.escape(e) for e in exts) + r')$', re.IGNORECASE)
+                self.name_tests.append(regex.search)
+            elif lower.startswith('re:'):
+                try:
+                    self.name_tests.append(re.compile(token[3:], re.IGNORECASE).search)
+                except re.error as e:
+                    raise ValueError(f"Invalid regex: {e}")
+            elif lower.startswith('path:'):
+                self._set_path_glob(lower[5:])
+            elif GLOB_CHARS.search(token):
+                self.name_tests.append(re.compile(fnmatch.translate(lower), re.IGNORECASE).match)
+            else:
+                self.name_tests.append(lambda name, needle=lower: needle in name.lower())
+
+        # Pattern lama (satu term tanpa filter) tetap bisa dilayani filename index
+        if len(tokens) == 1 and not (self.size_tests or self.age_tests or self.type or
+                                     self.path_segments or self.max_depth is not None):
+            token = tokens[0]
+            if not token.lower().startswith(('re:', 'ext:')) and (not GLOB_CHARS.search(token) or
+                                                                   (token.endswith('*') and not GLOB_CHARS.search(token[:-1]))):
+                self.simple_pattern = token
+
+    def _set_path_glob(self, pattern):
+        """Simpan glob path per segment ('**' = kedalaman berapa pun) untuk matching dan pruning"""
+        pattern = pattern.replace('\\', '/').strip('/')
+        self.path_segments = [segment.lower() for segment in pattern.split('/') if segment]
+
+    @classmethod
+    def _match_segments(cls, parts, patterns, partial):
+        """Match segment path dengan segment glob; partial=True berarti parts cukup jadi prefix"""
+        if not patterns:
+            return not parts
+        if patterns[0] == '**':
+            if cls._match_segments(parts, patterns[1:], partial):
+                return True
+            return bool(parts) and cls._match_segments(parts[1:], patterns, partial)
+        if not parts:
+            return partial
+        return fnmatch.fnmatchcase(parts[0], patterns[0]) and cls._match_segments(parts[1:], patterns[1:], partial)
+
+    @staticmethod
+    def _split(rel_path):
+        return rel_path.lower().replace('\\', '/').split('/') if rel_path else []
+
+    @property
+    def needs_stat(self):
+        """True jika filter butuh stat (size / mtime)"""
+        return bool(self.size_tests or self.age_tests)
+
+    def should_descend(self, rel_dir, depth):
+        """Return False jika folder rel_dir (pada kedalaman depth) pasti tidak punya hasil, jadi tidak perlu di-scan"""
+        if self.max_depth is not None and depth >= self.max_depth:
+            return False
+        if self.path_segments and not self._match_segments(self._split(rel_dir), self.path_segments, True):
+            return False
+        return True
+
+    def match_name(self, name, is_dir, rel_path, depth):
+        """Test murah yang tidak butuh stat"""
+        if self.type == 'file' and is_dir:
+            return False
+        if self.type == 'directory' and not is_dir:
+            return False
+        if self.max_depth is not None and depth > self.max_depth:
+            return False
+        if self.needs_stat and is_dir:
+            return False  # Filter size / mtime hanya berlaku untuk file
+        for test in self.name_tests:
+            if not test(name):
+                return False
+        if self.path_segments and not self._match_segments(self._split(rel_path), self.path_segments, False):
+            return False
+        return True
+
+    def match_stat(self, stats, now=None):
+        """Test size / mtime pada hasil stat"""
+        for op, value in self.size_tests:
+            if not op(stats.st_size, value):
+                return False
+        if self.age_tests:
+            age = (now or time.time()) - stats.st_mtime
+            for op, value in self.age_tests:
+                if not op(age, value):
+                    return False
+        return True
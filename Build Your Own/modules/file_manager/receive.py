@@ -0,0 +1,146 @@
+# modules/file_manager/receive.py
+import os
+import hashlib
+import logging
+from urllib import parse as urllib_parse
+from telegram.error import NetworkError, TimedOut
+from telegram.utils.helpers import is_local_file
+from telegram.vendor.ptb_urllib3 import urllib3
+from modules.file_manager.transfer import READ_CHUNK
+
+RECEIVE_TIMEOUT = 60  # Read timeout per chunk dari server file Telegram
+
+def hash_file(path, hasher=None):
+    """SHA256 isi file, dibaca per chunk"""
+    hasher = hasher or hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(READ_CHUNK)
+            if not data:
+                break
+            hasher.update(data)
+    return hasher
+
+def unique_path(path):
+    """'name.ext' -> 'name (1).ext', 'name (2).ext', ... sampai tidak ada yang bentrok"""
+    base, ext = os.path.splitext(path)
+    counter = 1
+    candidate = path
+    while os.path.exists(candidate):
+        candidate = f"{base} ({counter}){ext}"
+        counter += 1
+    return candidate
+
+class DocumentReceiver:
+    """Terima document Telegram ke disk secara streaming.
+
+    Data ditulis per chunk ke file .part di folder tujuan sambil di-hash, lalu di-rename atomik.
+    File .part dari transfer yang terputus dilanjutkan dengan HTTP Range. File identik yang sudah
+    ada tidak ditulis ulang, dan file berbeda dengan nama sama tidak ditimpa.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.logger = logging.getLogger(__name__)
+
+    def receive(self, document, target_dir):
+        """Download document ke target_dir. Return dict: path, size, sha256, status, resumed_from"""
+        file_name = os.path.basename(document.file_name or document.file_unique_id)
+        target = os.path.join(target_dir, file_name)
+        part_path = os.path.join(target_dir, f".{file_name}.{document.file_unique_id}.part")
+
+        tg_file = self.bot.get_file(document.file_id)
+
+        if is_local_file(tg_file.file_path):
+            resumed_from, hasher = self._copy_local(tg_file.file_path, part_path)
+        else:
+            resumed_from, hasher = self._stream(self._encoded_url(tg_file.file_path), part_path)
+
+        size = os.path.getsize(part_path)
+        expected = document.file_size or tg_file.file_size
+        if expected and size != expected:
+            if size > expected:
+                os.unlink(part_path)  # .part rusak, jangan dilanjutkan lagi
+            raise IOError(f"Incomplete download: {size} of {expected} bytes (send the file again to resume)")
+
+        sha256 = hasher.hexdigest()
+        status = 'saved'
+
+        if os.path.isfile(target):
+            if os.path.getsize(target) == size and hash_file(target).hexdigest() == sha256:
+                os.unlink(part_path)
+                return {'path': target, 'size': size, 'sha256': sha256, 'status': 'identical',
+                        'resumed_from': resumed_from}
+            target = unique_path(target)
+            status = 'renamed'
+
+        os.replace(part_path, target)
+        return {'path': target, 'size': size, 'sha256': sha256, 'status': status, 'resumed_from': resumed_from}
+
+    @staticmethod
+    def _encoded_url(file_path):
+        """URL-encode karakter non-ASCII di path (sama seperti File.download)"""
+        parts = urllib_parse.urlsplit(file_path)
+        return urllib_parse.urlunsplit(parts._replace(path=urllib_parse.quote(parts.path)))
+
+    @staticmethod
+    def _resume_state(part_path):
+        """Return (offset, hasher) dari data yang sudah ada di .part"""
+        if not os.path.exists(part_path):
+            return 0, hashlib.sha256()
+        return os.path.getsize(part_path), hash_file(part_path)
+
+    def _copy_local(self, source, part_path):
+        """Bot API server lokal: file sudah ada di disk, cukup copy per chunk"""
+        offset, hasher = self._resume_state(part_path)
+        with open(source, 'rb') as src, open(part_path, 'ab') as dst:
+            src.seek(offset)
+            while True:
+                data = src.read(READ_CHUNK)
+                if not data:
+                    break
+                hasher.update(data)
+                dst.write(data)
+        return offset, hasher
+
+    def _stream(self, url, part_path):
+        """GET per chunk (tanpa buffer seluruh payload), lanjutkan dari offset .part jika ada"""
+        offset, hasher = self._resume_state(part_path)
+        headers = {'connection': 'keep-alive'}
+        if offset:
+            headers['range'] = f"bytes={offset}-"
+
+        # Request.retrieve membaca seluruh body ke memory, jadi pakai connection pool-nya langsung
+        pool = self.bot.request._con_pool
+        timeout = urllib3.Timeout(connect=self.bot.request._connect_timeout, read=RECEIVE_TIMEOUT)
+        try:
+            response = pool.request('GET', url, headers=headers, timeout=timeout, preload_content=False)
+        except urllib3.exceptions.TimeoutError as e:
+            raise TimedOut() from e
+        except urllib3.exceptions.HTTPError as e:
+            raise NetworkError(f"urllib3 HTTPError {e}") from e
+
+        try:
+            if response.status == 416 and offset:
+                return offset, hasher  # .part sudah lengkap
+            if response.status == 200 and offset:
+                # Server mengabaikan Range: mulai dari awal
+                self.logger.info(f"Range not honoured, restarting {os.path.basename(part_path)}")
+                offset = 0
+                hasher = hashlib.sha256()
+                mode = 'wb'
+            elif response.status in (200, 206):
+                mode = 'ab'
+            else:
+                raise NetworkError(f"File download failed with HTTP {response.status}")
+
+            with open(part_path, mode) as f:
+                try:
+                    for data in response.stream(READ_CHUNK):
+                        hasher.update(data)
+                        f.write(data)
+                except urllib3.exceptions.HTTPError as e:
+                    raise NetworkError(f"Download interrupted, send the file again to resume: {e}") from e
+        finally:
+            response.release_conn()
+        return offset, hasher
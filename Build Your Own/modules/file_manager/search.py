@@ -0,0 +1,164 @@
+# modules/file_manager/search.py
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from modules.utils.helpers import format_size
+from modules.file_manager.query import SearchQuery
+
+class ParallelSearch:
+    """Search nama file yang walk-nya dibagi per subtree ke thread pool, bisa di-cancel"""
+
+    def __init__(self, root, query, max_results=1000, workers=8):
+        self.root = root
+        self.query = query if isinstance(query, SearchQuery) else SearchQuery(query)
+        self.pattern = self.query.text
+        self.max_results = max_results
+        self.workers = workers
+        self.logger = logging.getLogger(__name__)
+
+        self.results = []
+        self.dirs_scanned = 0
+        self.started_at = None
+        self.finished_at = None
+        self.cancelled = threading.Event()
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._done = threading.Event()
+        self._executor = None
+
+    @property
+    def limited(self):
+        return len(self.results) >= self.max_results
+
+    @property
+    def elapsed(self):
+        end = self.finished_at or time.monotonic()
+        return end - (self.started_at or end)
+
+    def cancel(self):
+        """Hentikan search; worker berhenti setelah folder yang sedang di-scan selesai"""
+        self.cancelled.set()
+
+    def run(self):
+        """Jalankan search sampai selesai, di-cancel, atau mencapai max_results (blocking)"""
+        self.started_at = time.monotonic()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='search')
+        try:
+            self._submit(self.root, '', 0)
+            self._done.wait()
+        finally:
+            self._executor.shutdown(wait=False)
+            self.finished_at = time.monotonic()
+        return self.results
+
+    def snapshot(self, last=None):
+        """Copy hasil saat ini (thread-safe) untuk progress update"""
+        with self._lock:
+            return list(self.results if last is None else self.results[-last:])
+
+    def _submit(self, path, rel_dir, depth):
+        with self._lock:
+            self._pending += 1
+        try:
+            self._executor.submit(self._scan, path, rel_dir, depth)
+        except RuntimeError:
+            self._finish_one()
+
+    def _finish_one(self):
+        with self._lock:
+            self._pending -= 1
+            if self._pending == 0:
+                self._done.set()
+
+    def _stopped(self):
+        return self.cancelled.is_set() or self.limited
+
+    def _scan(self, path, rel_dir, depth):
+        """Scan satu folder: catat hit, submit subfolder yang lolos pruning sebagai task baru"""
+        try:
+            if self._stopped():
+                return
+
+            query = self.query
+            child_depth = depth + 1
+            now = time.time()
+            hits = []
+            subdirs = []
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)  # Sama dengan os.walk: tidak ikut symlink
+                        except OSError:
+                            continue
+                        if is_dir and entry.name.startswith('.'):
+                            continue  # Skip hidden directories
+                        rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                        if query.match_name(entry.name, is_dir, rel_path, child_depth):
+                            # stat hanya untuk kandidat yang lolos test nama, dan hanya jika ada filter size/mtime
+                            stats = None
+                            if query.needs_stat:
+                                try:
+                                    stats = entry.stat()
+                                except OSError:
+                                    stats = None
+                            if not query.needs_stat or (stats is not None and query.match_stat(stats, now)):
+                                hits.append(self._make_result(entry, is_dir, rel_path, stats))
+                        if is_dir and query.should_descend(rel_path, child_depth):
+                            # Subfolder yang ditolak path glob / depth tidak pernah di-submit atau di-scandir
+                            subdirs.append((entry.path, rel_path))
+            except OSError as e:
+                self.logger.debug(f"Cannot scan {path}: {e}")
+
+            with self._lock:
+                self.dirs_scanned += 1
+                room = self.max_results - len(self.results)
+                self.results.extend(hits[:max(room, 0)])
+
+            for subdir, rel_subdir in subdirs:
+                if self._stopped():
+                    break
+                self._submit(subdir, rel_subdir, child_depth)
+
+        except Exception as e:
+            self.logger.error(f"Search worker error in {path}: {e}")
+        finally:
+            self._finish_one()
+
+    def _make_result(self, entry, is_dir, rel_path, stats=None):
+        if is_dir:
+            return {
+                'name': entry.name,
+                'type': 'directory',
+                'path': rel_path,
+                'display': f"📁 {rel_path}/"
+            }
+        if stats is not None:
+            size = format_size(stats.st_size)
+            display = f"📄 {rel_path} ({size})"
+        else:
+            # Tanpa filter size / mtime tidak ada stat sama sekali: hit ditampilkan tanpa ukuran
+            size = None
+            display = f"📄 {rel_path}"
+        return {
+            'name': entry.name,
+            'type': 'file',
+            'path': rel_path,
+            'size': size,
+            'display': display
+        }
+
+    def to_result(self):
+        """Hasil dalam format yang sama dengan FileOperations.search_files"""
+        results = sorted(self.snapshot(), key=lambda r: r['path'].lower())
+        return {
+            'results': results,
+            'total_found': len(results),
+            'search_limited': self.limited,
+            'pattern': self.pattern,
+            'source': 'walk',
+            'cancelled': self.cancelled.is_set() and not self.limited
+        }
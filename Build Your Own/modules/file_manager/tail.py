@@ -0,0 +1,146 @@
+# modules/file_manager/tail.py
+import os
+import logging
+
+BLOCK_SIZE = 64 * 1024         # Ukuran blok baca (maju untuk head, mundur untuk tail)
+MAX_WINDOW = 1024 * 1024       # Maksimal bytes yang dibaca untuk satu /head atau /tail
+FOLLOW_READ_MAX = 256 * 1024   # Maksimal bytes baru yang dibaca per poll follow
+LINE_MAX = 500                 # Panjang maksimal baris yang ditampilkan
+
+def _decode_lines(raw_lines):
+    lines = []
+    for raw in raw_lines:
+        text = raw.rstrip(b'\r').decode('utf-8', errors='replace')
+        lines.append(text if len(text) <= LINE_MAX else text[:LINE_MAX - 1] + '…')
+    return lines
+
+def read_head(path, count, max_bytes=MAX_WINDOW):
+    """Baca `count` baris pertama dalam blok; return (lines, size, is_binary)"""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        chunks = []
+        read = 0
+        newlines = 0
+        while newlines < count and read < max_bytes:
+            chunk = f.read(min(BLOCK_SIZE, max_bytes - read))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            read += len(chunk)
+            newlines += chunk.count(b'\n')
+
+    data = b''.join(chunks)
+    if b'\0' in data[:8192]:
+        return [], size, True
+    raw_lines = data.split(b'\n')
+    if len(raw_lines) > count:
+        raw_lines = raw_lines[:count]
+    elif raw_lines and raw_lines[-1] == b'':
+        raw_lines.pop()
+    return _decode_lines(raw_lines), size, False
+
+def read_tail(path, count, max_bytes=MAX_WINDOW):
+    """Baca `count` baris terakhir: seek dari akhir file dan scan blok mundur sampai cukup newline.
+
+    Return (lines, size, is_binary). Hanya bytes di sekitar akhir file yang dibaca, berapa pun ukuran file.
+    """
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        pos = size
+        chunks = []
+        newlines = 0
+        # Butuh count + 1 newline: satu untuk batas awal baris pertama (newline penutup file tidak dihitung)
+        while pos > 0 and newlines <= count and size - pos < max_bytes:
+            step = min(BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            chunks.append(chunk)
+            newlines += chunk.count(b'\n')
+            if pos + step == size and chunk.endswith(b'\n'):
+                newlines -= 1
+
+    data = b''.join(reversed(chunks))
+    if b'\0' in data[-8192:]:
+        return [], size, True
+    if data.endswith(b'\n'):
+        data = data[:-1]
+    raw_lines = data.split(b'\n')
+    if pos > 0 and len(raw_lines) > 1:
+        raw_lines = raw_lines[1:]  # Baris pertama terpotong di tengah blok
+    if not data and size == 0:
+        raw_lines = []
+    return _decode_lines(raw_lines[-count:]), size, False
+
+class FileFollower:
+    """Ikuti file yang terus ditulis (tail -f) dengan menyimpan byte offset.
+
+    File dibuka ulang setiap poll (tidak ditahan terbuka) supaya program lain di Windows tetap bisa
+    rename / rotate log-nya. Rotasi terdeteksi dari identity (device, inode) path yang berubah,
+    truncate dari ukuran file yang lebih kecil dari offset.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        stats = os.stat(path)
+        self.identity = self._identity(stats)
+        self.offset = stats.st_size
+        self.missing = False
+        self._partial = b''
+
+    @staticmethod
+    def _identity(stats):
+        return (stats.st_dev, stats.st_ino)
+
+    def poll(self):
+        """Return (lines, notices): baris lengkap baru sejak poll terakhir dan event seperti rotasi / truncate"""
+        notices = []
+        try:
+            stats = os.stat(self.path)
+        except FileNotFoundError:
+            if not self.missing:
+                self.missing = True
+                notices.append("⚠️ File disappeared, waiting for it to come back...")
+            return [], notices
+
+        if self.missing or (stats.st_ino and self._identity(stats) != self.identity):
+            notices.append("🔄 File was rotated or replaced, following the new file from the start")
+            self.identity = self._identity(stats)
+            self.offset = 0
+            self._partial = b''
+            self.missing = False
+        elif stats.st_size < self.offset:
+            notices.append(f"✂️ File was truncated ({self.offset:,} → {stats.st_size:,} bytes), following from the start")
+            self.offset = 0
+            self._partial = b''
+
+        if stats.st_size == self.offset:
+            return [], notices
+
+        skipped = stats.st_size - self.offset - FOLLOW_READ_MAX
+        if skipped > 0:
+            # Penulis lebih cepat dari yang bisa ditampilkan: loncat ke dekat akhir, jangan tertinggal terus
+            notices.append(f"⏩ Skipped {skipped:,} bytes of fast output")
+            self.offset += skipped
+            self._partial = b''
+
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                data = f.read(FOLLOW_READ_MAX)
+        except OSError as e:
+            self.logger.debug(f"Cannot read {self.path}: {e}")
+            return [], notices
+        self.offset += len(data)
+        if skipped > 0 and b'\n' in data:
+            data = data[data.index(b'\n') + 1:]  # Buang baris yang terpotong oleh loncatan
+
+        data = self._partial + data
+        raw_lines = data.split(b'\n')
+        self._partial = raw_lines.pop()
+        if len(self._partial) > FOLLOW_READ_MAX:
+            # Baris tanpa newline yang terlalu panjang tetap ditampilkan
+            raw_lines.append(self._partial)
+            self._partial = b''
+        return _decode_lines(raw_lines), notices
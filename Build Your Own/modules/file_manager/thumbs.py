@@ -0,0 +1,211 @@
+# modules/file_manager/thumbs.py
+import os
+import uuid
+import shutil
+import hashlib
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageDraw, ImageOps
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tif', '.tiff'}
+VIDEO_EXTENSIONS = {'.mp4', '.mkv', '.avi', '.mov', '.wmv', '.webm', '.flv', '.m4v', '.3gp'}
+
+THUMB_SIZE = 240          # Sisi terpanjang thumbnail (px)
+LABEL_HEIGHT = 18         # Tinggi area nama file di bawah thumbnail
+VIDEO_SEEK = 3            # Detik; ambil keyframe setelah intro / frame hitam di awal
+FFMPEG_TIMEOUT = 20
+
+def media_kind(name):
+    ext = os.path.splitext(name)[1].lower()
+    if ext in IMAGE_EXTENSIONS:
+        return 'image'
+    if ext in VIDEO_EXTENSIONS:
+        return 'video'
+    return None
+
+class ThumbnailCache:
+    """Thumbnail JPEG di disk, nama file dari hash (path, size, mtime) sehingga file yang berubah otomatis dibuat ulang"""
+
+    def __init__(self, cache_dir, size=THUMB_SIZE):
+        self.cache_dir = str(cache_dir)
+        self.size = size
+        self.logger = logging.getLogger(__name__)
+        self._ffmpeg = shutil.which('ffmpeg')
+
+    @property
+    def has_ffmpeg(self):
+        return self._ffmpeg is not None
+
+    def key(self, path, stats):
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(os.path.normcase(os.path.abspath(path)).encode('utf-8', 'surrogatepass'))
+        hasher.update(f"|{stats.st_size}|{stats.st_mtime_ns}|{self.size}".encode())
+        return hasher.hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.jpg")
+
+    def get_or_create(self, path):
+        """Return (thumb_path, cached) atau (None, False) jika thumbnail tidak bisa dibuat"""
+        try:
+            stats = os.stat(path)
+        except OSError:
+            return None, False
+        thumb = self.path_for(self.key(path, stats))
+        if os.path.exists(thumb):
+            return thumb, True
+
+        os.makedirs(os.path.dirname(thumb), exist_ok=True)
+        temp = f"{thumb}.{uuid.uuid4().hex}.tmp"  # Unik per panggilan: thread lain bisa membuat thumbnail yang sama
+        try:
+            if media_kind(path) == 'video':
+                created = self._video_thumb(path, temp)
+            else:
+                created = self._image_thumb(path, temp)
+            if not created:
+                return None, False
+            os.replace(temp, thumb)
+            return thumb, False
+        except Exception as e:
+            self.logger.debug(f"Cannot create thumbnail for {path}: {e}")
+            return None, False
+        finally:
+            if os.path.exists(temp):
+                try:
+                    os.remove(temp)
+                except OSError:
+                    pass
+
+    def _image_thumb(self, path, dest):
+        with Image.open(path) as image:
+            # draft() membuat decoder JPEG langsung men-decode di skala 1/2..1/8: jauh lebih cepat untuk foto besar
+            image.draft('RGB', (self.size, self.size))
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((self.size, self.size))
+            image.convert('RGB').save(dest, 'JPEG', quality=80)
+        return True
+
+    def _video_thumb(self, path, dest):
+        """Keyframe lewat ffmpeg: -ss sebelum -i seek ke keyframe, -skip_frame nokey hanya decode keyframe"""
+        if not self._ffmpeg:
+            return False
+        scale = f"scale={self.size}:{self.size}:force_original_aspect_ratio=decrease"
+        for seek in (VIDEO_SEEK, 0):  # Video yang lebih pendek dari VIDEO_SEEK: ambil dari awal
+            command = [self._ffmpeg, '-v', 'error', '-y', '-ss', str(seek), '-skip_frame', 'nokey',
+                       '-i', path, '-frames:v', '1', '-vf', scale, '-q:v', '4', '-f', 'image2', dest]
+            try:
+                subprocess.run(command, capture_output=True, timeout=FFMPEG_TIMEOUT,
+                               creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+            except subprocess.TimeoutExpired:
+                return False
+            if os.path.exists(dest) and os.path.getsize(dest) > 0:
+                return True
+        return False
+
+class ContactSheet:
+    """Buat thumbnail paralel lalu susun menjadi satu atau beberapa gambar grid"""
+
+    def __init__(self, cache, columns=5, rows=6, workers=4):
+        self.cache = cache
+        self.columns = columns
+        self.rows = rows
+        self.workers = workers
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def per_sheet(self):
+        return self.columns * self.rows
+
+    def collect(self, folder, limit):
+        """File media di folder (tidak rekursif), urut nama; return (files, total)"""
+        files = []
+        with os.scandir(folder) as it:
+            for entry in it:
+                try:
+                    if entry.is_file() and media_kind(entry.name):
+                        if media_kind(entry.name) == 'video' and not self.cache.has_ffmpeg:
+                            continue
+                        files.append(entry.path)
+                except OSError:
+                    continue
+        files.sort(key=lambda path: os.path.basename(path).lower())
+        return files[:limit], len(files)
+
+    def thumbnails(self, paths, cancel_event=None, progress=None):
+        """Return list (path, thumb_path) yang berhasil, plus jumlah yang diambil dari cache"""
+        results = []
+        hits = 0
+
+        def make(path):
+            if cancel_event is not None and cancel_event.is_set():
+                return path, None, False
+            return (path, *self.cache.get_or_create(path))
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='thumbs') as executor:
+            for done, (path, thumb, cached) in enumerate(executor.map(make, paths), 1):
+                if thumb:
+                    results.append((path, thumb))
+                    hits += cached
+                if progress:
+                    progress(done, len(paths))
+        return results, hits
+
+    def render(self, items, dest, first=1):
+        """Susun (path, thumb_path) menjadi grid dengan nomor + nama file di bawah setiap thumbnail"""
+        size = self.cache.size
+        cell_h = size + LABEL_HEIGHT
+        columns = min(self.columns, len(items))
+        rows = (len(items) + columns - 1) // columns
+        sheet = Image.new('RGB', (columns * size, rows * cell_h), (24, 24, 24))
+        draw = ImageDraw.Draw(sheet)
+
+        for index, (path, thumb) in enumerate(items):
+            x = (index % columns) * size
+            y = (index // columns) * cell_h
+            try:
+                with Image.open(thumb) as image:
+                    sheet.paste(image, (x + (size - image.width) // 2, y + (size - image.height) // 2))
+            except OSError:
+                continue
+            label = self._fit_label(draw, f"{first + index}. {os.path.basename(path)}", size - 6)
+            draw.text((x + 3, y + size + 3), label, fill=(230, 230, 230))
+
+        sheet.save(dest, 'JPEG', quality=85)
+        return dest
+
+    @staticmethod
+    def _fit_label(draw, label, width):
+        """Potong label supaya muat di bawah thumbnail; font bitmap bawaan Pillow hanya mendukung Latin-1"""
+        try:
+            draw.textlength(label)
+        except UnicodeError:
+            label = label.encode('latin-1', 'replace').decode('latin-1')
+        if draw.textlength(label) <= width:
+            return label
+        while label and draw.textlength(label + '...') > width:
+            label = label[:-1]
+        return label + '...'
+
+    def sheet_path(self, items, first):
+        """Path sheet di cache berdasarkan thumbnail penyusunnya: folder yang tidak berubah memakai file yang sama"""
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(f"{first}|{self.columns}\n".encode())
+        for path, thumb in items:
+            hasher.update(f"{os.path.basename(path)}|{os.path.basename(thumb)}\n".encode('utf-8', 'surrogatepass'))
+        key = hasher.hexdigest()
+        return os.path.join(self.cache.cache_dir, 'sheets', f"{key}.jpg")
+
+    def build(self, items):
+        """Return list path sheet (per_sheet thumbnail per gambar), dibuat hanya jika belum ada di cache"""
+        sheets = []
+        for start in range(0, len(items), self.per_sheet):
+            chunk = items[start:start + self.per_sheet]
+            dest = self.sheet_path(chunk, start + 1)
+            if not os.path.exists(dest):
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                temp = f"{dest}.{uuid.uuid4().hex}.tmp"
+                self.render(chunk, temp, start + 1)
+                os.replace(temp, dest)
+            sheets.append((dest, start + 1, start + len(chunk)))
+        return sheets
@@ -0,0 +1,220 @@
+# modules/file_manager/transfer.py
+import os
+import hashlib
+import tempfile
+import logging
+
+UPLOAD_LIMIT = 50 * 1024 * 1024   # Batas upload Bot API (api.telegram.org)
+PART_SIZE = 48 * 1024 * 1024      # Sedikit di bawah limit, sisakan ruang untuk overhead multipart
+READ_CHUNK = 1024 * 1024
+
+class FileSlice:
+    """File-like object read-only untuk range [offset, offset + length) dari sebuah file.
+
+    Data di-hash saat dibaca, jadi part bisa dikirim langsung dari disk tanpa salinan sementara.
+    """
+
+    def __init__(self, path, offset, length, name, total_hasher=None):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.name = name
+        self.sha256 = hashlib.sha256()
+        self._total_hasher = total_hasher
+        self._remaining = length
+        self._file = open(path, 'rb')
+        self._file.seek(offset)
+
+    def read(self, size=-1):
+        if self._remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        self.sha256.update(data)
+        if self._total_hasher is not None:
+            self._total_hasher.update(data)
+        return data
+
+    def drain(self):
+        """Baca sisa data yang belum dibaca (supaya hash tetap lengkap jika pembaca berhenti lebih awal)"""
+        while self.read(READ_CHUNK):
+            pass
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class SplitFile:
+    """Bagi file besar menjadi part bernomor (name.001, name.002, ...) yang di-stream dari disk"""
+
+    def __init__(self, path, part_size=PART_SIZE):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.part_size = part_size
+        stats = os.stat(path)
+        self.size = stats.st_size
+        self.mtime = stats.st_mtime
+        self.total_parts = max(1, (self.size + part_size - 1) // part_size)
+        self.total_hasher = hashlib.sha256()
+        self.parts = []
+        self.logger = logging.getLogger(__name__)
+
+    def part_name(self, index):
+        return f"{self.name}.{index:03d}"
+
+    def iter_parts(self):
+        """Yield FileSlice per part secara berurutan; hash part dicatat setelah part selesai dibaca"""
+        for index in range(1, self.total_parts + 1):
+            offset = (index - 1) * self.part_size
+            length = min(self.part_size, self.size - offset)
+            part = FileSlice(self.path, offset, length, self.part_name(index), self.total_hasher)
+            try:
+                yield index, part
+                part.drain()
+            finally:
+                part.close()
+            self.parts.append({'name': part.name, 'size': length, 'sha256': part.sha256.hexdigest()})
+
+    def changed_during_transfer(self):
+        """True jika file berubah selama dikirim (hasil join tidak akan valid)"""
+        try:
+            stats = os.stat(self.path)
+        except OSError:
+            return True
+        return stats.st_size != self.size or stats.st_mtime != self.mtime
+
+    def manifest(self):
+        """Text manifest dengan checksum dan cara menggabungkan part"""
+        return build_manifest(self.name, self.size, self.total_hasher.hexdigest(), self.parts)
+
+def build_manifest(name, size, sha256, parts):
+    """Text manifest: checksum per part, checksum total, dan perintah untuk menggabungkan part"""
+    windows_parts = "+".join(f'"{part["name"]}"' for part in parts)
+    unix_parts = " ".join(f"'{part['name']}'" for part in parts)
+    lines = [
+        f"File: {name}",
+        f"Size: {size} bytes",
+        f"Parts: {len(parts)}",
+        f"SHA256: {sha256}",
+        "",
+        "Parts:",
+    ]
+    for part in parts:
+        lines.append(f"  {part['name']}  {part['size']} bytes  sha256={part['sha256']}")
+    lines += [
+        "",
+        "Join on Windows (cmd):",
+        f'  copy /b {windows_parts} "{name}"',
+        f'  certutil -hashfile "{name}" SHA256',
+        "",
+        "Join on Linux / macOS:",
+        f"  cat {unix_parts} > '{name}'",
+        f"  sha256sum '{name}'",
+        "",
+    ]
+    return "\n".join(lines)
+
+class PartWriter:
+    """Sink yang menulis stream ke part file sementara dan memanggil on_part setiap part penuh.
+
+    Hanya satu part (maksimal part_size) yang ada di disk pada satu waktu.
+    """
+
+    def __init__(self, name, on_part, part_size=PART_SIZE, temp_dir=None):
+        self.name = name
+        self.on_part = on_part
+        self.part_size = part_size
+        self.temp_dir = temp_dir
+        self.total_hasher = hashlib.sha256()
+        self.size = 0
+        self.parts = []
+        self._file = None
+        self._part_hasher = None
+        self._part_written = 0
+        self._pending = None
+
+    def _open_part(self):
+        handle, path = tempfile.mkstemp(prefix='part-', dir=self.temp_dir)
+        self._file = os.fdopen(handle, 'wb')
+        self._path = path
+        self._part_hasher = hashlib.sha256()
+        self._part_written = 0
+
+    def write(self, data):
+        view = memoryview(data)
+        while len(view):
+            if self._file is None:
+                self._flush_pending()  # Ada data lagi: part sebelumnya pasti bernomor
+                self._open_part()
+            room = self.part_size - self._part_written
+            chunk = view[:room]
+            self._file.write(chunk)
+            self._part_hasher.update(chunk)
+            self.total_hasher.update(chunk)
+            self._part_written += len(chunk)
+            self.size += len(chunk)
+            view = view[len(chunk):]
+            if self._part_written >= self.part_size:
+                self._finish_part()
+        return len(data)
+
+    def _finish_part(self):
+        """Tutup part sekarang; dikirim saat data berikutnya datang atau saat close"""
+        self._file.close()
+        self._file = None
+        self._pending = {'path': self._path, 'size': self._part_written, 'sha256': self._part_hasher.hexdigest()}
+
+    def _flush_pending(self):
+        """Kirim part yang tertunda sebagai part bernomor"""
+        if self._pending is None:
+            return
+        part = self._pending
+        self._pending = None
+        index = len(self.parts) + 1
+        part['name'] = f"{self.name}.{index:03d}"
+        self._emit(part, index)
+
+    def _emit(self, part, index):
+        try:
+            self.on_part(part['path'], part['name'], index)
+        finally:
+            try:
+                os.unlink(part['path'])
+            except OSError:
+                pass
+        self.parts.append({'name': part['name'], 'size': part['size'], 'sha256': part['sha256']})
+
+    def close(self):
+        """Kirim part terakhir. Jika hanya ada satu part, pakai nama asli tanpa nomor"""
+        if self._file is not None:
+            self._finish_part()
+        if self._pending is not None:
+            if not self.parts:
+                self._pending['name'] = self.name
+                part = self._pending
+                self._pending = None
+                self._emit(part, 0)
+            else:
+                self._flush_pending()
+
+    def abort(self):
+        """Buang part sementara tanpa mengirim"""
+        if self._file is not None:
+            self._file.close()
+            self._pending = {'path': self._path}
+        if self._pending is not None:
+            try:
+                os.unlink(self._pending['path'])
+            except OSError:
+                pass
+            self._pending = None
+
+    def manifest(self):
+        return build_manifest(self.name, self.size, self.total_hasher.hexdigest(), self.parts)
@@ -0,0 +1,263 @@
+# modules/file_manager/usage.py
+import os
+import time
+import heapq
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+TOP_FILES = 10  # File terbesar yang diingat per folder
+
+class SizeNode:
+    """Satu folder dalam size tree; total sudah termasuk semua subfolder"""
+
+    __slots__ = ('path', 'name', 'parent', 'mtime', 'files_size', 'file_count', 'total', 'total_files',
+                 'total_dirs', 'children', 'top_files', 'denied', 'scanned_at')
+
+    def __init__(self, path, parent=None):
+        self.path = path
+        self.name = os.path.basename(os.path.normpath(path)) or path
+        self.parent = parent
+        self.mtime = None
+        self.files_size = 0
+        self.file_count = 0
+        self.total = 0
+        self.total_files = 0
+        self.total_dirs = 0
+        self.children = {}
+        self.top_files = []  # [(size, name)], terbesar dulu
+        self.denied = False
+        self.scanned_at = 0.0
+
+    def largest(self, n):
+        """Top-N anak (folder dan file) terbesar: list (size, name, node_or_None)"""
+        candidates = [(child.total, name, child) for name, child in self.children.items()]
+        candidates += [(size, name, None) for size, name in self.top_files]
+        return heapq.nlargest(n, candidates, key=lambda item: item[0])
+
+class DiskUsage:
+    """Size tree per root yang di-scan paralel dan di-refresh incremental berdasarkan mtime folder.
+
+    Mtime folder hanya berubah jika isi langsungnya (nama file / subfolder) berubah, jadi refresh
+    cukup stat setiap folder dan hanya membaca ulang folder yang mtime-nya berubah. Perubahan ukuran
+    file tanpa rename baru terlihat setelah scan penuh (/du -f).
+    """
+
+    def __init__(self, workers=8):
+        self.workers = workers
+        self.logger = logging.getLogger(__name__)
+        self._trees = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.normpath(path))
+
+    def find(self, path):
+        """Node untuk path dari tree yang sudah di-scan, atau None"""
+        key = self._key(path)
+        with self._lock:
+            trees = list(self._trees.items())
+        for root_key, root in trees:
+            if key == root_key:
+                return root
+            prefix = root_key.rstrip(os.sep) + os.sep
+            if key.startswith(prefix):
+                node = root
+                for part in key[len(prefix):].split(os.sep):
+                    node = next((child for name, child in node.children.items()
+                                 if os.path.normcase(name) == part), None)
+                    if node is None:
+                        return None
+                return node
+        return None
+
+    def scan(self, path, full=False, progress=None, cancel_event=None):
+        """Scan (atau refresh) path dan return node-nya.
+
+        Jika path sudah ada di tree, hanya folder yang mtime-nya berubah yang dibaca ulang, kecuali full=True.
+        """
+        node = self.find(path)
+        is_new = node is None
+        if is_new:
+            node = SizeNode(path)
+        run = _ScanRun(self, progress, cancel_event, self.workers)
+        old_total, old_files, old_dirs = node.total, node.total_files, node.total_dirs
+        run.execute(node, full or is_new)
+
+        if run.cancelled:
+            # Tree setengah jadi tidak boleh dipakai untuk drill-down
+            self.discard(node)
+            return None
+
+        _recompute(node)
+        if is_new:
+            with self._lock:
+                # Tree lama yang ada di dalam path ini sudah di-graft ke tree baru
+                for key in [key for key in self._trees if key.startswith(self._key(path).rstrip(os.sep) + os.sep)]:
+                    self._trees.pop(key)
+                self._trees[self._key(path)] = node
+        else:
+            _propagate(node.parent, node.total - old_total, node.total_files - old_files,
+                       node.total_dirs - old_dirs)
+        return node
+
+    def take_subtree(self, path):
+        """Ambil tree yang root-nya tepat path (untuk di-graft ke tree induk yang sedang di-scan)"""
+        with self._lock:
+            return self._trees.pop(self._key(path), None)
+
+    def discard(self, node):
+        """Buang seluruh tree yang berisi node"""
+        root = node
+        while root.parent is not None:
+            root = root.parent
+        with self._lock:
+            self._trees.pop(self._key(root.path), None)
+
+    def invalidate(self, path):
+        """Tandai folder berubah (mis. setelah delete / upload) supaya refresh berikutnya membacanya ulang"""
+        node = self.find(path)
+        if node is not None:
+            node.mtime = None
+
+class _ScanRun:
+    """Satu kali scan / refresh: task per folder di thread pool, seperti ParallelSearch"""
+
+    def __init__(self, usage, progress, cancel_event, workers):
+        self.usage = usage
+        self.progress = progress
+        self.cancel_event = cancel_event or threading.Event()
+        self.workers = workers
+        self.dirs_scanned = 0
+        self.dirs_checked = 0
+        self.bytes_seen = 0
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._done = threading.Event()
+        self._executor = None
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def execute(self, node, full):
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='du')
+        try:
+            self._submit(node, full)
+            while not self._done.wait(1.0):
+                if self.progress:
+                    self.progress(self)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    def _submit(self, node, full):
+        with self._lock:
+            self._pending += 1
+        try:
+            self._executor.submit(self._visit, node, full)
+        except RuntimeError:
+            self._finish_one()
+
+    def _finish_one(self):
+        with self._lock:
+            self._pending -= 1
+            if self._pending == 0:
+                self._done.set()
+
+    def _visit(self, node, full):
+        """Baca ulang folder jika full / mtime berubah, lalu lanjut ke subfolder"""
+        try:
+            if self.cancelled:
+                return
+            try:
+                mtime = os.stat(node.path).st_mtime
+            except OSError:
+                mtime = None
+
+            if full or mtime is None or mtime != node.mtime:
+                targets = self._rescan(node, mtime, full)
+            else:
+                targets = [(child, False) for child in node.children.values()]
+
+            with self._lock:
+                self.dirs_checked += 1
+            for child, child_full in targets:
+                if self.cancelled:
+                    break
+                self._submit(child, child_full)
+        except Exception as e:
+            self.usage.logger.error(f"du worker error in {node.path}: {e}")
+        finally:
+            self._finish_one()
+
+    def _rescan(self, node, mtime, full):
+        """Hitung ulang file langsung di folder ini; return subfolder yang perlu dikunjungi"""
+        files_size = 0
+        file_count = 0
+        top_files = []
+        seen = {}
+        targets = []
+        try:
+            with os.scandir(node.path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            child = node.children.get(entry.name)
+                            if child is None:
+                                # Folder baru: pakai tree yang sudah pernah di-scan jika ada
+                                child = self.usage.take_subtree(entry.path)
+                                child_full = child is None
+                                if child is None:
+                                    child = SizeNode(entry.path, node)
+                                child.parent = node
+                            else:
+                                child_full = full
+                            seen[entry.name] = child
+                            targets.append((child, child_full))
+                        else:
+                            size = entry.stat(follow_symlinks=False).st_size
+                            files_size += size
+                            file_count += 1
+                            if len(top_files) < TOP_FILES:
+                                heapq.heappush(top_files, (size, entry.name))
+                            elif size > top_files[0][0]:
+                                heapq.heapreplace(top_files, (size, entry.name))
+                    except OSError:
+                        continue
+            node.denied = False
+        except OSError:
+            node.denied = True
+
+        node.mtime = mtime
+        node.files_size = files_size
+        node.file_count = file_count
+        node.top_files = sorted(top_files, reverse=True)
+        node.children = seen
+        node.scanned_at = time.time()
+        with self._lock:
+            self.dirs_scanned += 1
+            self.bytes_seen += files_size
+        return targets
+
+def _recompute(root):
+    """Hitung total subtree secara post-order (iteratif, aman untuk tree yang dalam)"""
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children.values())
+            continue
+        node.total = node.files_size + sum(child.total for child in node.children.values())
+        node.total_files = node.file_count + sum(child.total_files for child in node.children.values())
+        node.total_dirs = len(node.children) + sum(child.total_dirs for child in node.children.values())
+
+def _propagate(node, size_delta, files_delta, dirs_delta):
+    """Terapkan perubahan total subtree ke semua folder induknya"""
+    while node is not None:
+        node.total += size_delta
+        node.total_files += files_delta
+        node.total_dirs += dirs_delta
+        node = node.parent
@@ -0,0 +1,353 @@
+# modules/file_manager/watch.py
+import os
+import sys
+import time
+import errno
+import ctypes
+import ctypes.util
+import select
+import struct
+import logging
+import threading
+from modules.file_manager.listing import scan_directory
+
+if os.name == 'nt':
+    try:
+        import pywintypes
+        import win32con
+        import win32event
+        import win32file
+    except ImportError:
+        win32file = None
+else:
+    win32file = None
+
+CREATED, MODIFIED, DELETED = 'created', 'modified', 'deleted'
+
+class ChangeSet:
+    """Kumpulan perubahan per path yang digabung (coalesce) selama satu interval"""
+
+    def __init__(self):
+        self.changes = {}      # path relatif -> (kind, is_dir)
+        self.overflow = False  # Backend kehilangan event; isi changes mungkin tidak lengkap
+        self.raw_events = 0
+
+    def __bool__(self):
+        return bool(self.changes) or self.overflow
+
+    def add(self, path, kind, is_dir=False):
+        """Gabungkan event baru dengan yang sudah tercatat untuk path yang sama"""
+        self.raw_events += 1
+        previous = self.changes.get(path)
+        if previous is None:
+            self.changes[path] = (kind, is_dir)
+            return
+        before = previous[0]
+        if before == CREATED and kind == DELETED:
+            del self.changes[path]               # Muncul lalu hilang lagi (file temp): tidak dilaporkan
+        elif before == CREATED:
+            self.changes[path] = (CREATED, is_dir)
+        elif before == DELETED and kind == CREATED:
+            self.changes[path] = (MODIFIED, is_dir)  # Diganti (mis. save lewat rename)
+        else:
+            self.changes[path] = (kind, is_dir)
+
+    def by_kind(self):
+        grouped = {CREATED: [], MODIFIED: [], DELETED: []}
+        for path, (kind, is_dir) in sorted(self.changes.items()):
+            grouped[kind].append(path + (os.sep if is_dir else ''))
+        return grouped
+
+class _InotifyBackend:
+    """inotify lewat ctypes (Linux): satu watch per folder, folder baru ikut di-watch"""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+            | IN_DELETE_SELF | IN_ONLYDIR)
+    EVENT = struct.Struct('iIII')
+
+    name = 'inotify'
+
+    def __init__(self, root, max_watches):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._libc = libc
+        self.root = root
+        self.max_watches = max_watches
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        self.unwatched = 0
+        self._add_tree(root)
+        if root not in self.watches.values():
+            self.close()
+            raise OSError(errno.EACCES, f"Cannot watch {root}")
+
+    def _add_watch(self, path):
+        if len(self.watches) >= self.max_watches:
+            self.unwatched += 1
+            return False
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            self.unwatched += 1
+            return False
+        self.watches[wd] = path
+        return True
+
+    def _add_tree(self, path, changes=None):
+        """Watch path dan semua subfolder. Untuk folder baru (changes diberikan), isi yang sudah
+        terlanjur dibuat sebelum watch terpasang ikut dilaporkan sebagai created."""
+        stack = [path]
+        while stack:
+            folder = stack.pop()
+            if not self._add_watch(folder):
+                continue
+            try:
+                with os.scandir(folder) as it:
+                    for entry in it:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if is_dir:
+                            stack.append(entry.path)
+                        if changes is not None:
+                            changes.add(os.path.relpath(entry.path, self.root), CREATED, is_dir)
+            except OSError:
+                continue
+
+    def read(self, changes, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return
+        try:
+            data = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        while offset + self.EVENT.size <= len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                changes.overflow = True
+                continue
+            if mask & self.IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            folder = self.watches.get(wd)
+            if folder is None or not name:
+                continue
+
+            path = os.path.join(folder, name)
+            relative = os.path.relpath(path, self.root)
+            is_dir = bool(mask & self.IN_ISDIR)
+            if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                changes.add(relative, CREATED, is_dir)
+                if is_dir:
+                    self._add_tree(path, changes)
+            elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                changes.add(relative, DELETED, is_dir)
+            elif mask & (self.IN_MODIFY | self.IN_CLOSE_WRITE) and not is_dir:
+                changes.add(relative, MODIFIED)
+
+    def status(self):
+        text = f"inotify, {len(self.watches):,} folders"
+        if self.unwatched:
+            text += f" ({self.unwatched:,} not watched: watch limit reached or access denied)"
+        return text
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+class _WindowsBackend:
+    """ReadDirectoryChangesW (pywin32) secara overlapped supaya bisa dihentikan dengan timeout"""
+
+    FILE_LIST_DIRECTORY = 0x0001
+    ACTIONS = {1: CREATED, 2: DELETED, 3: MODIFIED, 4: DELETED, 5: CREATED}
+
+    name = 'ReadDirectoryChangesW'
+
+    def __init__(self, root):
+        self.root = root
+        self.handle = win32file.CreateFile(
+            root,
+            self.FILE_LIST_DIRECTORY,
+            win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE | win32con.FILE_SHARE_DELETE,
+            None,
+            win32con.OPEN_EXISTING,
+            win32con.FILE_FLAG_BACKUP_SEMANTICS | win32con.FILE_FLAG_OVERLAPPED,
+            None
+        )
+        self.filter = (win32con.FILE_NOTIFY_CHANGE_FILE_NAME | win32con.FILE_NOTIFY_CHANGE_DIR_NAME
+                       | win32con.FILE_NOTIFY_CHANGE_SIZE | win32con.FILE_NOTIFY_CHANGE_LAST_WRITE)
+        self.buffer = win32file.AllocateReadBuffer(64 * 1024)
+        self.overlapped = pywintypes.OVERLAPPED()
+        self.overlapped.hEvent = win32event.CreateEvent(None, True, False, None)
+        self._issue()
+
+    def _issue(self):
+        win32event.ResetEvent(self.overlapped.hEvent)
+        win32file.ReadDirectoryChangesW(self.handle, self.buffer, True, self.filter, self.overlapped)
+
+    def read(self, changes, timeout):
+        result = win32event.WaitForSingleObject(self.overlapped.hEvent, int(timeout * 1000))
+        if result != win32event.WAIT_OBJECT_0:
+            return
+        size = win32file.GetOverlappedResult(self.handle, self.overlapped, True)
+        if size == 0:
+            changes.overflow = True  # Buffer kernel penuh: event hilang
+        else:
+            for action, name in win32file.FILE_NOTIFY_INFORMATION(self.buffer, size):
+                kind = self.ACTIONS.get(action)
+                if kind is None:
+                    continue
+                path = os.path.join(self.root, name)
+                is_dir = kind != DELETED and os.path.isdir(path)
+                if kind == MODIFIED and is_dir:
+                    continue  # Isi folder berubah: file-nya sendiri sudah dilaporkan
+                changes.add(name, kind, is_dir)
+        self._issue()
+
+    def status(self):
+        return "ReadDirectoryChangesW (recursive)"
+
+    def close(self):
+        try:
+            win32file.CancelIo(self.handle)
+        except pywintypes.error:
+            pass
+        self.handle.Close()
+
+class _PollingBackend:
+    """Fallback: snapshot berkala (scan_directory dari listing) lalu diff dengan snapshot sebelumnya"""
+
+    name = 'polling'
+
+    def __init__(self, root, max_entries, interval=10.0):
+        self.root = root
+        self.max_entries = max_entries
+        self.interval = interval
+        self.truncated = False
+        self.snapshot = self._snapshot()
+        self._next_scan = time.monotonic() + self.interval
+
+    def _snapshot(self):
+        """Dict path relatif -> (is_dir, size, mtime); berhenti di max_entries supaya memory terbatas"""
+        snapshot = {}
+        stack = ['']
+        self.truncated = False
+        while stack:
+            relative = stack.pop()
+            try:
+                listing = scan_directory(os.path.join(self.root, relative))
+            except OSError:
+                continue
+            for entry in listing.entries:
+                if len(snapshot) >= self.max_entries:
+                    self.truncated = True
+                    return snapshot
+                path = os.path.join(relative, entry.name)
+                snapshot[path] = (entry.is_dir, entry.size, entry.mtime)
+                if entry.is_dir and not entry.denied:
+                    stack.append(path)
+        return snapshot
+
+    def read(self, changes, timeout):
+        delay = self._next_scan - time.monotonic()
+        if delay > timeout:
+            time.sleep(timeout)
+            return
+        time.sleep(max(0.0, delay))
+        self._next_scan = time.monotonic() + self.interval
+
+        current = self._snapshot()
+        previous = self.snapshot
+        for path, (is_dir, size, mtime) in current.items():
+            old = previous.get(path)
+            if old is None:
+                changes.add(path, CREATED, is_dir)
+            elif not is_dir and (old[1] != size or old[2] != mtime):
+                changes.add(path, MODIFIED)
+        for path, (is_dir, _, _) in previous.items():
+            if path not in current:
+                changes.add(path, DELETED, is_dir)
+        self.snapshot = current
+
+    def status(self):
+        text = f"polling every {self.interval:.0f}s, {len(self.snapshot):,} entries"
+        if self.truncated:
+            text += f" (capped at {self.max_entries:,})"
+        return text
+
+    def close(self):
+        self.snapshot = {}
+
+class DirectoryWatcher:
+    """Watch folder (rekursif) dan laporkan perubahan yang sudah di-coalesce, satu ChangeSet per interval.
+
+    Backend dipilih otomatis: inotify di Linux, ReadDirectoryChangesW di Windows, selain itu polling.
+    """
+
+    def __init__(self, root, interval=10.0, max_watches=8192, max_entries=200000, force_polling=False):
+        self.root = root
+        self.interval = interval
+        self.logger = logging.getLogger(__name__)
+        self.stopped = threading.Event()
+        self.backend = self._open_backend(max_watches, max_entries, force_polling)
+
+    def _open_backend(self, max_watches, max_entries, force_polling):
+        if not force_polling:
+            if win32file is not None:
+                try:
+                    return _WindowsBackend(self.root)
+                except Exception as e:
+                    self.logger.warning(f"ReadDirectoryChangesW unavailable for {self.root}: {e}")
+            elif sys.platform.startswith('linux'):
+                try:
+                    return _InotifyBackend(self.root, max_watches)
+                except (OSError, AttributeError) as e:
+                    self.logger.warning(f"inotify unavailable for {self.root}: {e}")
+        return _PollingBackend(self.root, max_entries, self.interval)
+
+    @property
+    def backend_name(self):
+        return self.backend.name
+
+    def status(self):
+        return self.backend.status()
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self, on_changes, on_tick=None):
+        """Loop sampai stop(): kumpulkan event, panggil on_changes(changeset) paling sering sekali per interval"""
+        changes = ChangeSet()
+        window_end = time.monotonic() + self.interval
+        try:
+            while not self.stopped.is_set():
+                self.backend.read(changes, min(1.0, max(0.05, window_end - time.monotonic())))
+                if time.monotonic() >= window_end:
+                    if changes:
+                        on_changes(changes)
+                        changes = ChangeSet()
+                    if on_tick:
+                        on_tick()
+                    window_end = time.monotonic() + self.interval
+        finally:
+            self.backend.close()
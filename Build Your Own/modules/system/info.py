@@ -5,6 +5,8 @@ import datetime
 import logging
 from telegram.ext import CommandHandler
 from modules.utils.decorators import log_function_call
+from modules.utils.dispatch import runs_on
+from modules.utils.render import STATUS_REPORT, BATTERY_REPORT, RESOURCE_REPORT, PROCESS_ROW
 
 class SystemInfo:
     """Handle system information commands"""
@@ -17,16 +19,9 @@ class SystemInfo:
     def status(self, update, context):
         """Get basic system information"""
         uname = platform.uname()
-        info = (
-            f"🖥️ *System Information*\n\n"
-            f"🔹 *OS:* {uname.system}\n"
-            f"🔹 *Computer Name:* {uname.node}\n"
-            f"🔹 *OS Version:* {uname.release}\n"
-            f"🔹 *Build:* {uname.version}\n"
-            f"🔹 *Architecture:* {uname.machine}\n"
-            f"🔹 *Processor:* {uname.processor}"
-        )
-        update.message.reply_text(info, parse_mode='Markdown')
+        info = STATUS_REPORT.render(system=uname.system, node=uname.node, release=uname.release,
+                                    version=uname.version, machine=uname.machine, processor=uname.processor)
+        update.message.reply_text(info, parse_mode='MarkdownV2')
     
     @log_function_call
     def battery(self, update, context):
@@ -35,16 +30,12 @@ class SystemInfo:
         if battery:
             status = "🔌 Plugged In" if battery.power_plugged else "🔋 On Battery"
             time_left = str(datetime.timedelta(seconds=battery.secsleft)) if battery.secsleft > 0 else "N/A"
-            info = (
-                f"🔋 *Battery Status*\n\n"
-                f"• Level: {battery.percent}%\n"
-                f"• Status: {status}\n"
-                f"• Time Left: {time_left}"
-            )
-            update.message.reply_text(info, parse_mode='Markdown')
+            info = BATTERY_REPORT.render(percent=battery.percent, status=status, time_left=time_left)
+            update.message.reply_text(info, parse_mode='MarkdownV2')
         else:
             update.message.reply_text("❌ No battery detected (desktop PC?)")
     
+    @runs_on('cpu')
     @log_function_call
     def system_info(self, update, context):
         """Get detailed system resource information"""
@@ -52,21 +43,17 @@ class SystemInfo:
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
         
-        info = (
-            f"💻 *System Resources*\n\n"
-            f"*CPU:*\n"
-            f"• Usage: {cpu_percent}%\n\n"
-            f"*Memory:*\n"
-            f"• Total: {memory.total / (1024**3):.1f} GB\n"
-            f"• Used: {memory.used / (1024**3):.1f} GB ({memory.percent}%)\n"
-            f"• Free: {memory.available / (1024**3):.1f} GB\n\n"
-            f"*Disk:*\n"
-            f"• Total: {disk.total / (1024**3):.1f} GB\n"
-            f"• Used: {disk.used / (1024**3):.1f} GB ({disk.percent}%)\n"
-            f"• Free: {disk.free / (1024**3):.1f} GB"
+        gb = 1024 ** 3
+        info = RESOURCE_REPORT.render(
+            cpu=cpu_percent,
+            mem_total=memory.total / gb, mem_used=memory.used / gb,
+            mem_percent=memory.percent, mem_free=memory.available / gb,
+            disk_total=disk.total / gb, disk_used=disk.used / gb,
+            disk_percent=disk.percent, disk_free=disk.free / gb,
         )
-        update.message.reply_text(info, parse_mode='Markdown')
+        update.message.reply_text(info, parse_mode='MarkdownV2')
     
+    @runs_on('cpu')
     @log_function_call
     def processes(self, update, context):
         """Get top active processes"""
@@ -83,13 +70,12 @@ class SystemInfo:
         processes.sort(key=lambda x: x['cpu_percent'], reverse=True)
         processes = processes[:10]  # Top 10 processes
         
+        # Nama proses seperti "svc_host" dulu merusak parser Markdown lama; template meng-escape setiap field
         info = "🔄 *Top 10 Active Processes*\n\n"
-        for proc in processes:
-            info += (f"• *{proc['name']}*\n"
-                    f"  CPU: {proc['cpu_percent']:.1f}% | "
-                    f"RAM: {proc['memory_percent']:.1f}%\n")
+        info += "\n".join(PROCESS_ROW.render(name=proc['name'], cpu=proc['cpu_percent'], ram=proc['memory_percent'])
+                          for proc in processes)
         
-        update.message.reply_text(info, parse_mode='Markdown')
+        update.message.reply_text(info, parse_mode='MarkdownV2')
     
     def register_handlers(self, dispatcher):
         """Register semua system info handlers"""
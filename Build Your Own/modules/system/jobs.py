@@ -0,0 +1,60 @@
+# modules/system/jobs.py
+import logging
+from telegram.ext import CommandHandler
+from modules.utils.decorators import log_function_call
+from modules.utils.jobs import get_job_manager
+
+class JobControl:
+    """Handle /jobs dan /kill untuk operasi panjang yang jalan di background"""
+
+    def __init__(self, auth_handler):
+        self.auth = auth_handler
+        self.jobs = get_job_manager()
+        self.logger = logging.getLogger(__name__)
+
+    @log_function_call
+    def list_jobs(self, update, context):
+        """Tampilkan job yang sedang jalan / antre dan beberapa yang baru selesai"""
+        active = self.jobs.active_jobs()
+        recent = self.jobs.recent_jobs()
+
+        if not active and not recent:
+            update.message.reply_text("💤 No background jobs")
+            return
+
+        message = ""
+        if active:
+            message += "⚙️ Active jobs:\n" + "\n".join(job.describe() for job in active) + "\n\n"
+        else:
+            message += "💤 No active jobs\n\n"
+        if recent:
+            message += "🕘 Recent:\n" + "\n".join(job.describe() for job in reversed(recent)) + "\n\n"
+        if active:
+            message += "Use /kill <id> to cancel a job"
+        update.message.reply_text(message.strip())
+
+    @log_function_call
+    def kill_job(self, update, context):
+        """Cancel job berdasarkan id: /kill 3"""
+        if not context.args:
+            update.message.reply_text("❌ Usage: /kill <job id> (see /jobs)")
+            return
+
+        try:
+            job_id = int(context.args[0].lstrip('#'))
+        except ValueError:
+            update.message.reply_text("❌ Job id must be a number (see /jobs)")
+            return
+
+        job = self.jobs.cancel(job_id)
+        if job is None:
+            update.message.reply_text(f"❌ No active job #{job_id}")
+        else:
+            update.message.reply_text(f"⏹ Cancelling job #{job.id}: {job.title}")
+
+    def register_handlers(self, dispatcher):
+        """Register job control handlers"""
+        dispatcher.add_handler(CommandHandler('jobs', self.auth.require_auth(self.list_jobs)))
+        dispatcher.add_handler(CommandHandler('kill', self.auth.require_auth(self.kill_job)))
+
+        self.logger.info("Job control handlers registered")
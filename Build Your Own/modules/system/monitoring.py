@@ -9,7 +9,9 @@ import win32process
 from PIL import ImageGrab
 from telegram.ext import CommandHandler, ConversationHandler, MessageHandler, Filters
 from modules.utils.decorators import log_function_call
+from modules.utils.dispatch import runs_on
 from modules.utils.helpers import escape_md
+from modules.utils.file_cache import get_file_id_cache
 
 class SystemMonitoring:
     """Handle system monitoring commands (screenshot, close apps, etc.)"""
@@ -20,7 +22,9 @@ class SystemMonitoring:
     def __init__(self, auth_handler):
         self.auth = auth_handler
         self.logger = logging.getLogger(__name__)
+        self.file_ids = get_file_id_cache()
     
+    @runs_on('device')
     @log_function_call
     def screenshot(self, update, context):
         """Take a screenshot"""
@@ -39,9 +43,9 @@ class SystemMonitoring:
             # Save screenshot
             screenshot.save(temp_filename)
             
-            # Send screenshot
-            with open(temp_filename, 'rb') as photo:
-                update.message.reply_photo(photo, caption="🖥️ Here's your screenshot!")
+            # Send screenshot (layar yang tidak berubah dikirim ulang lewat file_id)
+            self.file_ids.send(update.message.reply_photo, temp_filename, 'photo',
+                               caption="🖥️ Here's your screenshot!")
             
         except Exception as e:
             update.message.reply_text(f"❌ Error taking screenshot: {str(e)}")
@@ -169,6 +173,7 @@ class SystemMonitoring:
             update.message.reply_text(error_msg, parse_mode='MarkdownV2')
             return ConversationHandler.END
     
+    @runs_on('cpu')
     @log_function_call
     def handle_closeapp_input(self, update, context):
         """Handle close app input"""
@@ -0,0 +1,76 @@
+# modules/utils/bot_api.py
+import os
+import threading
+from pathlib import Path
+
+DEFAULT_API_URL = "https://api.telegram.org"
+CLOUD_UPLOAD_LIMIT = 50 * 1024 * 1024      # Batas upload api.telegram.org
+LOCAL_UPLOAD_LIMIT = 2000 * 1024 * 1024    # Batas upload Bot API server lokal (--local)
+LOCAL_PART_SIZE = 1990 * 1024 * 1024
+
+class BotApiEndpoint:
+    """URL Bot API yang dipakai bot dan kemampuan yang ikut dengannya.
+
+    Dengan Bot API server lokal (telegram-bot-api --local) file dikirim sebagai URI file:// :
+    server membaca file langsung dari disk, bot tidak membaca satu byte pun, dan limit naik ke 2 GB.
+    """
+
+    def __init__(self, url=None, local_mode=None):
+        self.url = (url or DEFAULT_API_URL).rstrip('/')
+        if local_mode is None:
+            local_mode = self.url != DEFAULT_API_URL
+        self.local_mode = bool(local_mode)
+
+    @property
+    def base_url(self):
+        return f"{self.url}/bot"
+
+    @property
+    def base_file_url(self):
+        return f"{self.url}/file/bot"
+
+    @property
+    def upload_limit(self):
+        return LOCAL_UPLOAD_LIMIT if self.local_mode else CLOUD_UPLOAD_LIMIT
+
+    @property
+    def part_size(self):
+        """Ukuran part untuk file di atas upload_limit (None = default transfer.PART_SIZE)"""
+        return LOCAL_PART_SIZE if self.local_mode else None
+
+    def local_input(self, media):
+        """URI file:// untuk path atau file object yang dibuka dari disk, None jika harus di-upload.
+
+        File object hanya dipakai jika posisinya masih di awal, supaya FileSlice / stream yang sudah
+        dibaca sebagian tetap di-upload apa adanya.
+        """
+        if not self.local_mode:
+            return None
+        if isinstance(media, (str, Path)):
+            path = media
+        else:
+            path = getattr(media, 'name', None)
+            if not isinstance(path, str) or hasattr(media, 'offset'):
+                return None
+            try:
+                if media.tell() != 0:
+                    return None
+            except (OSError, ValueError, AttributeError):
+                return None
+        if not os.path.isfile(path) or os.path.getsize(path) > self.upload_limit:
+            return None
+        return Path(path).resolve().as_uri()
+
+_shared_endpoint = BotApiEndpoint()
+_shared_lock = threading.Lock()
+
+def configure_bot_api(url=None, local_mode=None):
+    """Set endpoint Bot API bersama (dipanggil sekali dari main sebelum Updater dibuat)"""
+    global _shared_endpoint
+    with _shared_lock:
+        _shared_endpoint = BotApiEndpoint(url, local_mode)
+    return _shared_endpoint
+
+def get_bot_api():
+    """Endpoint Bot API bersama untuk semua modul"""
+    return _shared_endpoint
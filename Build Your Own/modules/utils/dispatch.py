@@ -0,0 +1,175 @@
+# modules/utils/dispatch.py
+import logging
+import warnings
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from telegram import Update
+from telegram.ext import Dispatcher, DispatcherHandlerStop, ConversationHandler
+from telegram.ext.utils.promise import Promise
+
+# Thread per kategori handler; handler tanpa tanda @runs_on jalan sebagai 'interactive'
+CATEGORY_WORKERS = {
+    'interactive': 4,   # Command cepat (/lock, /cd, tombol browser), urut per chat
+    'cpu': 2,           # Sampling psutil, kontrol proses
+    'disk': 2,          # Listing / format ribuan baris langsung di handler
+    'device': 1,        # Webcam, screenshot, deteksi device lewat ffmpeg
+}
+
+def runs_on(category):
+    """Tandai handler yang memblokir dengan kategori executor-nya (dibaca CategoryDispatcher)"""
+    if category not in CATEGORY_WORKERS:
+        raise ValueError(f"Unknown dispatch category: {category}")
+
+    def decorator(func):
+        func.dispatch_category = category
+        return func
+    return decorator
+
+class _Resume:
+    """Penanda di update queue: langkah conversation chat ini selesai, backlog-nya boleh diproses"""
+
+    __slots__ = ('chat',)
+
+    def __init__(self, chat):
+        self.chat = chat
+
+class CategoryDispatcher(Dispatcher):
+    """Dispatcher yang menjalankan setiap handler di executor sesuai kategorinya.
+
+    Dipakai dengan Defaults(run_async=True): thread dispatcher hanya memilih handler, lalu setiap
+    callback masuk lane chat-nya. Lane menjalankan handler interaktif satu per satu (urutan /cd lalu
+    /ls tetap terjaga) dan meneruskan handler cpu / disk / device ke pool masing-masing tanpa
+    menunggu, jadi /webcamvideo atau /sysinfo tidak pernah menahan /lock.
+
+    Selama langkah ConversationHandler sebuah chat belum selesai, update berikutnya dari chat itu
+    ditahan di backlog chat tersebut dan baru dipilihkan handler setelah langkahnya selesai. Tanpa ini
+    balasan cepat (mis. path setelah /cd) dicocokkan dengan state lama lalu dibuang. Chat lain tetap
+    dilayani langsung: thread dispatcher tidak pernah menunggu.
+    """
+
+    def __init__(self, bot, update_queue, workers=None, **kwargs):
+        # Pool bawaan PTB tidak dipakai: semua promise lewat lane dan executor kategori
+        with warnings.catch_warnings():
+            warnings.filterwarnings('ignore', message='Asynchronous callbacks can not be processed')
+            super().__init__(bot, update_queue, workers=0, **kwargs)
+        self.category_workers = dict(CATEGORY_WORKERS, **(workers or {}))
+        self._executors = {
+            category: ThreadPoolExecutor(max_workers=count, thread_name_prefix=f"handler-{category}")
+            for category, count in self.category_workers.items()
+        }
+        self._lanes = {}
+        self._lanes_lock = threading.Lock()
+        self._held = {}      # chat -> deque update yang menunggu langkah conversation (hanya thread dispatcher)
+        self._watched = {}   # promise langkah conversation -> chat yang di-resume saat promise selesai
+        self.logger = logging.getLogger(__name__)
+
+    def process_update(self, update):
+        if isinstance(update, _Resume):
+            self._resume(update.chat)
+            return
+        chat = update.effective_chat.id if isinstance(update, Update) and update.effective_chat else None
+        held = self._held.get(chat) if chat is not None else None
+        if held is not None:
+            held.append(update)  # Langkah conversation chat ini belum selesai
+            return
+        self._route(update, chat)
+
+    def _route(self, update, chat):
+        """Pilih handler untuk update; tahan chat-nya jika update ini memulai langkah conversation async"""
+        super().process_update(update)
+        if chat is None:
+            return
+        promise = self._pending_conversation(update)
+        if promise is None:
+            return
+        with self._lanes_lock:
+            if promise.done.is_set():
+                return
+            self._watched[promise] = chat
+        self._held[chat] = deque()
+
+    def _resume(self, chat):
+        """Langkah conversation selesai: proses backlog chat berurutan sampai ada langkah baru yang pending"""
+        held = self._held.pop(chat, None) or deque()
+        while held:
+            self._route(held.popleft(), chat)
+            if chat in self._held:
+                self._held[chat].extend(held)
+                return
+
+    def _pending_conversation(self, update):
+        """Promise state ConversationHandler yang masih jalan untuk chat / user update ini, atau None"""
+        for handlers in self.handlers.values():
+            for handler in handlers:
+                if not isinstance(handler, ConversationHandler):
+                    continue
+                if handler.per_message and not update.callback_query:
+                    continue
+                key = handler._get_key(update)
+                with handler._conversations_lock:
+                    state = handler.conversations.get(key)
+                if isinstance(state, tuple) and len(state) == 2 and isinstance(state[1], Promise):
+                    if not state[1].done.is_set():
+                        return state[1]
+        return None
+
+    def _run_async(self, func, *args, update=None, error_handling=True, **kwargs):
+        promise = Promise(func, args, kwargs, update=update, error_handling=error_handling)
+        category = getattr(func, 'dispatch_category', 'interactive')
+        chat = update.effective_chat.id if isinstance(update, Update) and update.effective_chat else None
+
+        with self._lanes_lock:
+            lane = self._lanes.get(chat)
+            if lane is not None:
+                lane.append((category, promise))  # Drainer lane ini masih jalan, cukup antre
+                return promise
+            self._lanes[chat] = deque([(category, promise)])
+        self._executors['interactive'].submit(self._drain, chat)
+        return promise
+
+    def _drain(self, chat):
+        """Jalankan antrean satu chat berurutan; handler lambat diteruskan ke pool kategorinya"""
+        while True:
+            with self._lanes_lock:
+                lane = self._lanes[chat]
+                if not lane:
+                    del self._lanes[chat]
+                    return
+                category, promise = lane.popleft()
+            if category == 'interactive':
+                self._run_promise(promise)
+            else:
+                self._executors[category].submit(self._run_promise, promise)
+
+    def _run_promise(self, promise):
+        """Sama dengan Dispatcher._pooled untuk satu promise: jalankan lalu teruskan error ke error handler"""
+        promise.run()
+        with self._lanes_lock:
+            chat = self._watched.pop(promise, _Resume)
+        if chat is not _Resume:
+            # Lewat antrean update supaya backlog chat diproses di thread dispatcher, urut dengan update baru
+            self.update_queue.put(_Resume(chat))
+
+        if not promise.exception:
+            self.update_persistence(update=promise.update)
+            return
+        if isinstance(promise.exception, DispatcherHandlerStop):
+            self.logger.warning(f"DispatcherHandlerStop is not supported with async handlers: "
+                                f"{promise.pooled_function.__name__}")
+            return
+        if promise.pooled_function in self.error_handlers:
+            self.logger.error("An uncaught error was raised while handling the error.")
+            return
+        if not promise.error_handling:
+            self.logger.error("A promise with deactivated error handling raised an error.")
+            return
+        try:
+            self.dispatch_error(promise.update, promise.exception, promise=promise)
+        except Exception:
+            self.logger.exception("An uncaught error was raised while handling the error.")
+
+    def stop(self):
+        super().stop()
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,160 @@
+# modules/utils/file_cache.py
+import os
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from telegram.error import BadRequest
+from modules.utils.helpers import get_app_dir
+from modules.utils.bot_api import get_bot_api
+
+SAMPLE_SIZE = 1024 * 1024            # Ukuran sampel head / middle / tail untuk hash cepat
+FULL_HASH_LIMIT = 3 * SAMPLE_SIZE    # File sekecil ini di-hash penuh
+
+class FileIdCache:
+    """Cache persisten (SQLite) dari identitas isi file ke file_id Telegram.
+
+    File kecil di-hash penuh sehingga isi yang sama di path lain (mis. screenshot yang tidak berubah)
+    tetap cocok. File besar hanya di-hash sampelnya, jadi path, size dan mtime juga harus sama.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self.logger = logging.getLogger(__name__)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        """Buka koneksi SQLite (lazy) dan buat schema jika belum ada"""
+        if self._conn is not None:
+            return self._conn
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS file_ids (
+                kind TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                full INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                file_id TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (kind, size, digest)
+            )
+        """)
+        conn.commit()
+        self._conn = conn
+        return conn
+
+    @staticmethod
+    def fingerprint(path):
+        """Return (size, mtime_ns, digest, full) untuk file; hash cepat berbasis sampel untuk file besar"""
+        stats = os.stat(path)
+        size = stats.st_size
+        hasher = hashlib.blake2b(digest_size=20)
+        hasher.update(size.to_bytes(8, 'little'))
+        full = size <= FULL_HASH_LIMIT
+        with open(path, 'rb') as f:
+            if full:
+                hasher.update(f.read())
+            else:
+                for offset in (0, size // 2 - SAMPLE_SIZE // 2, size - SAMPLE_SIZE):
+                    f.seek(offset)
+                    hasher.update(f.read(SAMPLE_SIZE))
+        return size, stats.st_mtime_ns, hasher.hexdigest(), full
+
+    def lookup(self, kind, path, fingerprint):
+        """Cari file_id untuk isi file ini, None jika belum pernah di-upload"""
+        size, mtime_ns, digest, full = fingerprint
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT file_id, path, mtime_ns FROM file_ids WHERE kind = ? AND size = ? AND digest = ?",
+                (kind, size, digest)
+            ).fetchone()
+        if row is None:
+            return None
+        file_id, cached_path, cached_mtime = row
+        if not full and (os.path.normcase(cached_path) != os.path.normcase(path) or cached_mtime != mtime_ns):
+            return None  # Hash sampel saja tidak cukup untuk menganggap isi file sama
+        if kind == 'document' and os.path.basename(cached_path) != os.path.basename(path):
+            return None  # Document yang dikirim ulang lewat file_id membawa nama file lama
+        return file_id
+
+    def store(self, kind, path, fingerprint, file_id):
+        size, mtime_ns, digest, full = fingerprint
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO file_ids (kind, size, digest, full, path, mtime_ns, file_id, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, size, digest, int(full), path, mtime_ns, file_id, time.time())
+            )
+            conn.commit()
+
+    def forget(self, file_id):
+        """Hapus file_id yang ditolak Telegram (expired / bot token berubah)"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM file_ids WHERE file_id = ?", (file_id,))
+            conn.commit()
+
+    def send(self, send_method, path, kind, **kwargs):
+        """Kirim file lewat send_method (mis. message.reply_document), pakai file_id cache jika ada.
+
+        kind adalah nama field media di Message: 'document', 'photo', 'video', 'audio'.
+        """
+        local_uri = get_bot_api().local_input(path)
+        if local_uri and os.path.getsize(path) > FULL_HASH_LIMIT:
+            # Server lokal membaca file besar sendiri: hash sampel pun tidak perlu dibaca oleh bot
+            return send_method(local_uri, **kwargs)
+
+        try:
+            fingerprint = self.fingerprint(path)
+            file_id = self.lookup(kind, path, fingerprint)
+        except (OSError, sqlite3.Error) as e:
+            self.logger.warning(f"file_id cache unavailable for {path}: {e}")
+            fingerprint, file_id = None, None
+
+        if file_id:
+            try:
+                return send_method(file_id, **kwargs)
+            except BadRequest as e:
+                self.logger.info(f"Cached file_id rejected, uploading again: {e}")
+                self.forget(file_id)
+
+        if local_uri:
+            # Bot API server lokal membaca file langsung dari disk
+            message = send_method(local_uri, **kwargs)
+        else:
+            with open(path, 'rb') as f:
+                message = send_method(f, **kwargs)
+
+        new_file_id = self._extract_file_id(message, kind)
+        if fingerprint is not None and new_file_id:
+            try:
+                self.store(kind, path, fingerprint, new_file_id)
+            except sqlite3.Error as e:
+                self.logger.warning(f"Cannot store file_id for {path}: {e}")
+        return message
+
+    @staticmethod
+    def _extract_file_id(message, kind):
+        media = getattr(message, kind, None)
+        if isinstance(media, list):
+            media = media[-1] if media else None  # Photo: ukuran terbesar
+        return getattr(media, 'file_id', None)
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+def get_file_id_cache():
+    """Cache file_id bersama untuk semua modul"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = FileIdCache(get_app_dir() / "cache" / "file_ids.db")
+        return _shared_cache
@@ -1,12 +1,16 @@
 # modules/utils/helpers.py
+import io
 import os
 import sys
-import re
 import importlib.util
 import datetime
 from pathlib import Path
 from dataclasses import dataclass
 
+from modules.utils.render import (escape_md, split_markdown, MAX_MESSAGE_LENGTH, needs_document,
+                                  markdown_to_text, summary_of)
+from modules.utils.send_queue import send_options, BULK
+
 @dataclass
 class BotConfig:
     """Configuration class untuk bot"""
@@ -15,6 +19,19 @@ class BotConfig:
     BOT_PASSWORD: str
     WEBCAM_VIDEO_DEVICE: str = "HD User Facing"
     WEBCAM_AUDIO_DEVICE: str = "Microphone Array (Realtek(R) Audio)"
+    SEARCH_INDEX_ROOTS: tuple = ()
+    BOT_API_URL: str = ""          # Kosong = api.telegram.org
+    BOT_API_LOCAL_MODE: bool = None  # None = otomatis (True jika BOT_API_URL diisi)
+    WEBHOOK_URL: str = ""          # Kosong = long polling
+    WEBHOOK_LISTEN: str = "127.0.0.1"
+    WEBHOOK_PORT: int = 8443
+    WEBHOOK_SECRET: str = ""       # Kosong = dibuat acak setiap start
+
+def get_app_dir():
+    """Folder aplikasi (folder exe saat frozen, root project saat dari source)"""
+    if getattr(sys, 'frozen', False):
+        return Path(sys.executable).parent
+    return Path(__file__).parent.parent.parent
 
 def load_config():
     """Load config dengan auto-create template jika tidak ada"""
@@ -66,7 +83,14 @@ def load_config():
             AUTHORIZED_USER_ID=config_module.AUTHORIZED_USER_ID,
             BOT_PASSWORD=config_module.BOT_PASSWORD,
             WEBCAM_VIDEO_DEVICE=getattr(config_module, 'WEBCAM_VIDEO_DEVICE', "HD User Facing"),
-            WEBCAM_AUDIO_DEVICE=getattr(config_module, 'WEBCAM_AUDIO_DEVICE', "Microphone Array")
+            WEBCAM_AUDIO_DEVICE=getattr(config_module, 'WEBCAM_AUDIO_DEVICE', "Microphone Array"),
+            SEARCH_INDEX_ROOTS=tuple(getattr(config_module, 'SEARCH_INDEX_ROOTS', ())),
+            BOT_API_URL=getattr(config_module, 'BOT_API_URL', ""),
+            BOT_API_LOCAL_MODE=getattr(config_module, 'BOT_API_LOCAL_MODE', None),
+            WEBHOOK_URL=getattr(config_module, 'WEBHOOK_URL', ""),
+            WEBHOOK_LISTEN=getattr(config_module, 'WEBHOOK_LISTEN', "127.0.0.1"),
+            WEBHOOK_PORT=int(getattr(config_module, 'WEBHOOK_PORT', 8443)),
+            WEBHOOK_SECRET=getattr(config_module, 'WEBHOOK_SECRET', "")
         )
         
     except Exception as e:
@@ -107,20 +131,39 @@ BOT_PASSWORD = 'your_password_here'
 # Run /detectdevices command to find correct names
 WEBCAM_VIDEO_DEVICE = "HD User Facing"
 WEBCAM_AUDIO_DEVICE = "Microphone Array (Realtek(R) Audio)"
+
+# =================================================
+# OPTIONAL: Filename Search Index
+# =================================================
+# Folders indexed in the background for instant /search (e.g. ['D:\\', 'E:\\Data'])
+SEARCH_INDEX_ROOTS = []
+
+# =================================================
+# OPTIONAL: Self-hosted Bot API Server
+# =================================================
+# URL of a local telegram-bot-api server started with --local (e.g. 'http://localhost:8081').
+# Files are then sent straight from disk via file:// paths and the upload limit is 2 GB.
+# Leave empty to use api.telegram.org (50 MB limit).
+BOT_API_URL = ''
+
+# =================================================
+# OPTIONAL: Webhook Mode
+# =================================================
+# Public URL that forwards to the local listener below (HTTPS reverse proxy / tunnel, or a plain
+# http:// URL when using a local Bot API server). Telegram then pushes updates instead of the bot
+# polling for them. Leave empty to use long polling; polling is also used if registration fails.
+WEBHOOK_URL = ''
+WEBHOOK_LISTEN = '127.0.0.1'
+WEBHOOK_PORT = 8443
+WEBHOOK_SECRET = ''   # Empty = random secret generated on every start
 '''
     
     with open(config_path, 'w', encoding='utf-8') as f:
         f.write(template)
 
-def escape_md(text):
-    """Escape MarkdownV2 special characters"""
-    escape_chars = '_*[]()~`>#+-=|{}.!\\'
-    return ''.join(['\\' + c if c in escape_chars else c for c in str(text)])
-
 def escape_md_caption(text):
-    """Escape karakter spesial MarkdownV2 untuk caption"""
-    pattern = r'([_\*\[\]\(\)~`>#+\-=|{}\.!])'
-    return re.sub(pattern, r'\\\1', str(text))
+    """Escape karakter spesial MarkdownV2 untuk caption (tabel yang sama dengan escape_md, termasuk backslash)"""
+    return escape_md(text)
 
 def format_size(size):
     """Format file size dengan humanize"""
@@ -145,40 +188,43 @@ def format_time(timestamp):
         dt = datetime.datetime.fromtimestamp(timestamp)
         return dt.strftime("%Y-%m-%d %H:%M:%S")
 
-def send_long_message(update, message, parse_mode='MarkdownV2'):
-    """Mengirim pesan panjang dengan membaginya jika perlu"""
-    max_length = 4000
-    
-    if len(message) <= max_length:
-        update.message.reply_text(message, parse_mode=parse_mode)
-        return
-    
-    parts = []
-    current_part = ""
-    lines = message.split('\n')
-    
+def send_text_document(update, lines, filename, summary=None, parse_mode='MarkdownV2'):
+    """Tulis lines (teks biasa) ke satu file di memory lalu kirim sebagai document dengan caption ringkas"""
+    count = 0
+    buffer = io.BytesIO()
     for line in lines:
-        if len(current_part) + len(line) + 1 > max_length:
-            if current_part:
-                parts.append(current_part)
-                current_part = line
-            else:
-                while len(line) > max_length:
-                    parts.append(line[:max_length])
-                    line = line[max_length:]
-                current_part = line
-        else:
-            if current_part:
-                current_part += "\n" + line
+        buffer.write(line.encode('utf-8', 'replace'))
+        buffer.write(b'\n')
+        count += line.count('\n') + 1
+    buffer.seek(0)
+
+    if parse_mode == 'MarkdownV2':
+        note = f"📎 _Full output \\({count} lines\\) in the attached file_"
+    else:
+        note = f"📎 Full output ({count} lines) in the attached file"
+    caption = f"{summary}\n\n{note}" if summary else note
+    update.message.reply_document(buffer, filename=filename, caption=caption, parse_mode=parse_mode)
+
+def send_long_message(update, message, parse_mode='MarkdownV2', filename='output.txt'):
+    """Mengirim pesan panjang dengan membaginya jika perlu.
+
+    Dipotong lewat split_markdown: tidak pernah di tengah escape atau entity, panjang dihitung dalam UTF-16.
+    Output yang akan menjadi DOCUMENT_MIN_PARTS message atau lebih dikirim sebagai satu file .txt dengan
+    paragraf pertama sebagai caption: dua API call, bukan puluhan.
+    """
+    markdown = parse_mode == 'MarkdownV2'
+    if needs_document(len(message)):
+        text = markdown_to_text(message) if markdown else message
+        send_text_document(update, [text], filename, summary_of(message, markdown), parse_mode)
+        return
+    parts = split_markdown(message, MAX_MESSAGE_LENGTH, markdown=markdown)
+
+    update.message.reply_text(parts[0], parse_mode=parse_mode)
+    # Lanjutan lewat SendQueue sebagai bulk: command lain tidak perlu menunggu listing panjang selesai
+    with send_options(priority=BULK):
+        for i, part in enumerate(parts[1:], 2):
+            if markdown:
+                continuation_part = f"*\\.\\.\\. lanjutan {i}/{len(parts)} \\.\\.\\.*\n\n{part}"
             else:
-                current_part = line
-    
-    if current_part:
-        parts.append(current_part)
-    
-    for i, part in enumerate(parts):
-        if i == 0:
-            update.message.reply_text(part, parse_mode=parse_mode)
-        else:
-            continuation_part = f"*\\.\\.\\. lanjutan {i+1}/{len(parts)} \\.\\.\\.*\n\n{part}"
+                continuation_part = f"... lanjutan {i}/{len(parts)} ...\n\n{part}"
             update.message.reply_text(continuation_part, parse_mode=parse_mode)
\ No newline at end of file
@@ -0,0 +1,187 @@
+# modules/utils/jobs.py
+import time
+import logging
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from modules.utils.send_queue import send_options, BULK
+
+# Maksimal job yang boleh jalan bersamaan per resource; sisanya antre
+RESOURCE_LIMITS = {
+    'disk': 2,       # Walk / delete / hashing yang berat di disk
+    'upload': 2,     # Kirim file ke Telegram (bandwidth uplink)
+    'download': 4,   # Terima file dari Telegram
+    'cpu': 2,        # Encode / kompresi
+    'device': 1,     # Webcam / microphone hanya bisa dipakai satu job
+    'watch': 4,      # Job yang jalan lama tapi ringan (tail -f, watch folder)
+}
+
+class JobCancelled(Exception):
+    """Dilempar oleh Job.check() setelah job di-cancel lewat /kill"""
+
+class Job:
+    """Satu operasi panjang yang jalan di pool JobManager"""
+
+    def __init__(self, job_id, title, resource, fn, chat_id=None):
+        self.id = job_id
+        self.title = title
+        self.resource = resource
+        self.chat_id = chat_id
+        self.status = 'queued'
+        self.detail = ''
+        self.error = None
+        self.created_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.progress = None
+        self._fn = fn
+        self._cancel_event = threading.Event()
+        self._cancel_hooks = []
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def on_cancel(self, hook):
+        """Daftarkan callback yang dipanggil saat job di-cancel (mis. search.cancel)"""
+        self._cancel_hooks.append(hook)
+        if self.cancelled:
+            hook()
+
+    def check(self):
+        """Lempar JobCancelled jika job sudah di-cancel; panggil di titik aman dalam loop"""
+        if self.cancelled:
+            raise JobCancelled(f"Job {self.id} cancelled")
+
+    def update(self, text, force=False):
+        """Catat status terbaru dan edit progress message (throttled) jika ada"""
+        self.detail = text
+        if self.progress is not None:
+            self.progress.update(text, force=force)
+
+    def cancel(self):
+        if self._cancel_event.is_set():
+            return
+        self._cancel_event.set()
+        for hook in self._cancel_hooks:
+            try:
+                hook()
+            except Exception as e:
+                logging.getLogger(__name__).error(f"Cancel hook of job {self.id} failed: {e}")
+
+    def describe(self):
+        """Satu baris untuk /jobs"""
+        line = f"#{self.id} [{self.status}] {self.title} ({self.resource}"
+        if self.started_at is not None:
+            line += f", {self.elapsed:.0f}s"
+        line += ")"
+        if self.detail and self.status == 'running':
+            line += f"\n    {self.detail.splitlines()[0][:100]}"
+        if self.error and self.status == 'failed':
+            line += f"\n    {self.error[:100]}"
+        return line
+
+class JobManager:
+    """Jalankan operasi panjang di luar thread dispatcher, dengan batas concurrency per resource"""
+
+    HISTORY_SIZE = 20
+
+    def __init__(self, limits=None):
+        self.limits = dict(RESOURCE_LIMITS, **(limits or {}))
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=sum(self.limits.values()), thread_name_prefix='job')
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._queues = {resource: deque() for resource in self.limits}
+        self._running = {resource: 0 for resource in self.limits}
+        self._active = {}
+        self._history = deque(maxlen=self.HISTORY_SIZE)
+
+    def submit(self, title, fn, resource='disk', chat_id=None, progress=None):
+        """Antrekan fn(job). Return Job; job mulai jalan begitu resource-nya punya slot kosong"""
+        if resource not in self.limits:
+            raise ValueError(f"Unknown job resource: {resource}")
+        with self._lock:
+            job = Job(next(self._ids), title, resource, fn, chat_id)
+            job.progress = progress
+            self._active[job.id] = job
+            self._queues[resource].append(job)
+        self._schedule()
+        return job
+
+    def _schedule(self):
+        """Mulai job antrean selama masih ada slot pada resource-nya"""
+        with self._lock:
+            ready = []
+            for resource, pending in self._queues.items():
+                while pending and self._running[resource] < self.limits[resource]:
+                    job = pending.popleft()
+                    if job.cancelled:
+                        self._finish(job, 'cancelled')
+                        continue
+                    self._running[resource] += 1
+                    job.status = 'running'
+                    job.started_at = time.monotonic()
+                    ready.append(job)
+        for job in ready:
+            self._executor.submit(self._run, job)
+
+    def _run(self, job):
+        status = 'done'
+        try:
+            with send_options(priority=BULK):  # Kiriman job mengalah ke balasan interaktif
+                job._fn(job)
+            if job.cancelled:
+                status = 'cancelled'
+        except JobCancelled:
+            status = 'cancelled'
+        except Exception as e:
+            status = 'failed'
+            job.error = str(e)
+            self.logger.error(f"Job {job.id} ({job.title}) failed: {e}")
+        with self._lock:
+            self._running[job.resource] -= 1
+            self._finish(job, status)
+        self._schedule()
+
+    def _finish(self, job, status):
+        """Pindahkan job ke history (dipanggil dengan lock)"""
+        job.status = status
+        job.finished_at = time.monotonic()
+        self._active.pop(job.id, None)
+        self._history.append(job)
+
+    def cancel(self, job_id):
+        """Cancel job aktif; return Job atau None jika tidak ditemukan"""
+        with self._lock:
+            job = self._active.get(job_id)
+        if job is not None:
+            job.cancel()
+            self._schedule()  # Job antrean yang di-cancel langsung dibuang
+        return job
+
+    def active_jobs(self):
+        with self._lock:
+            return sorted(self._active.values(), key=lambda job: job.id)
+
+    def recent_jobs(self, limit=5):
+        with self._lock:
+            return list(self._history)[-limit:]
+
+_shared_manager = None
+_shared_lock = threading.Lock()
+
+def get_job_manager():
+    """JobManager bersama untuk semua modul"""
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = JobManager()
+        return _shared_manager
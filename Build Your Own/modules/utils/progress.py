@@ -0,0 +1,65 @@
+# modules/utils/progress.py
+import time
+import logging
+import threading
+from telegram.error import BadRequest, RetryAfter
+from modules.utils.send_queue import send_options
+
+class ProgressMessage:
+    """Satu message progress yang di-edit in place dengan rate yang dibatasi"""
+
+    def __init__(self, bot, chat_id, message_id, min_interval=2.0, parse_mode=None):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.min_interval = min_interval
+        self.parse_mode = parse_mode
+        self.logger = logging.getLogger(__name__)
+        self._last_text = None
+        self._last_edit = 0.0
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def send(cls, update, text, min_interval=2.0, parse_mode=None, reply_markup=None):
+        """Kirim message awal lalu return ProgressMessage untuk message tersebut"""
+        message = update.message.reply_text(text, parse_mode=parse_mode, reply_markup=reply_markup)
+        progress = cls(message.bot, message.chat_id, message.message_id, min_interval, parse_mode)
+        progress._last_text = text
+        progress._last_edit = time.monotonic()
+        return progress
+
+    def update(self, text, force=False, reply_markup=None):
+        """Edit message jika interval sudah lewat (atau force) dan text berubah. Return True jika terkirim.
+
+        Edit biasa tidak menunggu: masuk SendQueue dan digantikan edit berikutnya jika belum sempat terkirim.
+        Edit force (status akhir) menunggu sampai terkirim; RetryAfter sudah diulang oleh SendQueue.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if text == self._last_text and reply_markup is None:
+                return False
+            if not force and (now - self._last_edit < self.min_interval or now < self._blocked_until):
+                return False
+
+            try:
+                with send_options(wait=force):
+                    self.bot.edit_message_text(
+                        chat_id=self.chat_id,
+                        message_id=self.message_id,
+                        text=text,
+                        parse_mode=self.parse_mode,
+                        reply_markup=reply_markup
+                    )
+            except RetryAfter as e:
+                self._blocked_until = time.monotonic() + e.retry_after
+                self.logger.warning(f"Progress edit throttled for {e.retry_after}s")
+                return False
+            except BadRequest as e:
+                if 'not modified' not in str(e).lower():
+                    self.logger.error(f"Progress edit failed: {e}")
+                    return False
+
+            self._last_text = text
+            self._last_edit = now
+            return True
@@ -0,0 +1,265 @@
+# modules/utils/render.py
+import re
+import string
+from bisect import bisect_right
+
+MAX_MESSAGE_LENGTH = 4000   # Di bawah limit 4096 Telegram, sisakan ruang untuk header lanjutan
+DOCUMENT_MIN_PARTS = 4      # Output yang butuh sebanyak ini message dikirim sebagai satu file
+ROW_ESTIMATE = 64           # Perkiraan panjang satu baris listing / hasil search (karakter, sudah di-escape)
+CAPTION_LIMIT = 900         # Di bawah limit caption 1024, sisakan ruang untuk baris keterangan file
+
+MD_SPECIAL = '_*[]()~`>#+-=|{}.!\\'
+_MD_REPLACE = tuple((char, '\\' + char) for char in MD_SPECIAL.replace('\\', ''))
+
+def escape_md(text):
+    """Escape karakter spesial MarkdownV2.
+
+    Satu str.replace per karakter yang memang ada di text: setiap replace adalah satu pass di C, dan
+    str.translate dengan pengganti 2 karakter justru jatuh ke jalur lambat per karakter.
+    """
+    text = str(text)
+    if '\\' in text:
+        text = text.replace('\\', '\\\\')
+    for char, escaped in _MD_REPLACE:
+        if char in text:
+            text = text.replace(char, escaped)
+    return text
+
+class Raw(str):
+    """Teks yang sudah berupa MarkdownV2; Template tidak meng-escape-nya lagi"""
+
+class Template:
+    """Format string MarkdownV2 yang di-parse sekali.
+
+    Literal ditulis apa adanya (sudah MarkdownV2 yang valid), setiap field di-escape saat render:
+    Template("📄 {name} \\\\({size}\\\\)").render(name="a.txt", size="1 kB")
+    """
+
+    __slots__ = ('source', '_format', '_names', '_specs')
+
+    def __init__(self, source):
+        self.source = source
+        pieces = []
+        self._names = []
+        specs = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            pieces.append(literal.replace('{', '{{').replace('}', '}}'))
+            if field is not None:
+                pieces.append('{}')
+                self._names.append(field)
+                specs.append((spec or '', conversion))
+        self._format = ''.join(pieces)
+        # None jika tidak ada field dengan !r / format spec: jalur render paling umum tanpa format() per field
+        self._specs = specs if any(spec or conversion for spec, conversion in specs) else None
+
+    def render(self, **values):
+        args = [values[name] for name in self._names]
+        if self._specs is not None:
+            args = [value if type(value) is Raw else format(repr(value) if conversion == 'r' else value, spec)
+                    for value, (spec, conversion) in zip(args, self._specs)]
+        if Raw in map(type, args):
+            return self._format.format(*(value if type(value) is Raw else escape_md(value) for value in args))
+        # Semua field di-escape dalam satu panggilan: gabung dengan NUL (tidak pernah di-escape) lalu pecah lagi
+        joined = '\x00'.join(map(str, args))
+        if joined.count('\x00') == len(args) - 1:
+            return self._format.format(*escape_md(joined).split('\x00'))
+        return self._format.format(*map(escape_md, args))
+
+    __call__ = render
+
+# Baris listing / search
+LISTING_PARENT = Raw("📂 \\.\\. \\(Parent Directory\\)")
+LISTING_DIR = Template("📁 {name}/")
+LISTING_DENIED = Template("🚫 {name}/ \\(Access Denied\\)")
+LISTING_FILE = Template("📄 {name} \\({size}, {modified}\\)")
+SEARCH_DIR = Template("📁 {path}/")
+SEARCH_FILE = Template("📄 {path} \\({size}\\)")
+
+# Laporan resource (/status, /battery, /sysinfo, /processes)
+STATUS_REPORT = Template(
+    "🖥️ *System Information*\n\n"
+    "🔹 *OS:* {system}\n"
+    "🔹 *Computer Name:* {node}\n"
+    "🔹 *OS Version:* {release}\n"
+    "🔹 *Build:* {version}\n"
+    "🔹 *Architecture:* {machine}\n"
+    "🔹 *Processor:* {processor}"
+)
+BATTERY_REPORT = Template(
+    "🔋 *Battery Status*\n\n"
+    "• Level: {percent}%\n"
+    "• Status: {status}\n"
+    "• Time Left: {time_left}"
+)
+RESOURCE_REPORT = Template(
+    "💻 *System Resources*\n\n"
+    "*CPU:*\n"
+    "• Usage: {cpu:.1f}%\n\n"
+    "*Memory:*\n"
+    "• Total: {mem_total:.1f} GB\n"
+    "• Used: {mem_used:.1f} GB \\({mem_percent:.1f}%\\)\n"
+    "• Free: {mem_free:.1f} GB\n\n"
+    "*Disk:*\n"
+    "• Total: {disk_total:.1f} GB\n"
+    "• Used: {disk_used:.1f} GB \\({disk_percent:.1f}%\\)\n"
+    "• Free: {disk_free:.1f} GB"
+)
+PROCESS_ROW = Template("• *{name}*\n  CPU: {cpu:.1f}% \\| RAM: {ram:.1f}%")
+
+def search_hit(result):
+    """Baris MarkdownV2 untuk satu hasil search (ParallelSearch atau index)"""
+    if result['type'] == 'directory':
+        return SEARCH_DIR.render(path=result['path'])
+    if result.get('size'):
+        return SEARCH_FILE.render(path=result['path'], size=result['size'])
+    return escape_md(result['display'])
+
+def needs_document(length):
+    """True jika output sepanjang ini (perkiraan boleh) lebih baik dikirim sebagai satu file"""
+    return length > MAX_MESSAGE_LENGTH * (DOCUMENT_MIN_PARTS - 1)
+
+_MD_STRIP = re.compile(r'\\(.)|```|`|\*|__|_|~|\|\|', re.DOTALL)
+
+def markdown_to_text(text):
+    """MarkdownV2 -> teks biasa: escape dibuka, marker entity dibuang (untuk isi file .txt)"""
+    return _MD_STRIP.sub(lambda match: match.group(1) or '', text)
+
+def summary_of(text, markdown=True, limit=CAPTION_LIMIT):
+    """Paragraf pertama text sebagai ringkasan, dipotong aman supaya muat di caption"""
+    head = text.split('\n\n', 1)[0]
+    return split_markdown(head, limit, markdown=markdown)[0]
+
+# Marker entity MarkdownV2 yang bisa ditutup di akhir part lalu dibuka lagi di part berikutnya
+_CLOSE = {'*': '*', '_': '_', '__': '__', '~': '~', '||': '||', '`': '`', '```': '\n```'}
+_OPEN = {'*': '*', '_': '_', '__': '__', '~': '~', '||': '||', '`': '`', '```': '```\n'}
+# Satu match = teks biasa + escape (dilewati di C) lalu opsional satu marker entity di group 1
+_MD_MARKER = re.compile(r'(?:[^\\`*_~|\[\])]+|\\.|\](?!\()|\|(?!\|))*(```|`|\*|__|_|~|\|\||\[|\]\(|\))?', re.DOTALL)
+_NO_CUT_AFTER = set(MD_SPECIAL)
+_HARD_CUT_RESERVE = 16   # Ruang untuk penutup entity saat kata harus dipotong paksa
+
+def utf16_len(text):
+    """Panjang dalam UTF-16 code unit, satuan yang dipakai Telegram untuk limit message"""
+    return len(text.encode('utf-16-le')) // 2
+
+def _apply(token, stack):
+    """Update stack entity untuk satu marker"""
+    top = stack[-1] if stack else None
+    if top in ('`', '```'):
+        if token == top:
+            stack.pop()
+    elif top == '(':
+        if token == ')':
+            stack.pop()
+    elif token in ('```', '`', '['):
+        stack.append(token)
+    elif token in ('*', '__', '_', '~', '||'):
+        if token == top:
+            stack.pop()
+        elif token in stack:
+            stack.remove(token)
+        else:
+            stack.append(token)
+    elif token == '](' and top == '[':
+        stack[-1] = '('
+
+def _can_cut(stack, newline):
+    """Boleh dipotong di sini? Tidak di dalam inline code / link, di dalam blok pre hanya per baris"""
+    if not stack:
+        return True
+    if stack[-1] == '```':
+        return newline
+    return all(marker in _CLOSE and marker != '`' for marker in stack)
+
+def _escaped(text, pos):
+    """True jika karakter di pos didahului backslash escape (jumlah backslash ganjil)"""
+    count = 0
+    while pos > 0 and text[pos - 1] == '\\':
+        count += 1
+        pos -= 1
+    return count % 2 == 1
+
+def _window_end(text, start, budget):
+    """Index terjauh sehingga text[start:end] <= budget UTF-16 unit"""
+    end = min(len(text), start + budget)
+    excess = utf16_len(text[start:end]) - budget
+    while excess > 0:
+        end -= (excess + 1) // 2   # Setiap code point paling banyak 2 unit
+        excess = utf16_len(text[start:end]) - budget
+    return end
+
+def _scan(text, start, end, opened):
+    """Posisi akhir setiap marker di [start, end) dan stack entity sesudahnya (stacks[0] = kondisi awal)"""
+    stack = list(opened)
+    ends = []
+    stacks = [tuple(stack)]
+    for match in _MD_MARKER.finditer(text, start, end):
+        token = match.group(1)
+        if token:
+            _apply(token, stack)
+            ends.append(match.end())
+            stacks.append(tuple(stack))
+    return ends, stacks
+
+def split_markdown(text, limit=MAX_MESSAGE_LENGTH, markdown=True):
+    """Pecah text menjadi part <= limit (UTF-16, sudah termasuk escape).
+
+    Dipotong di newline, atau di spasi jika satu baris terlalu panjang, dan tidak pernah di tengah escape.
+    Entity yang masih terbuka (bold, code, pre, ...) ditutup di akhir part dan dibuka lagi di part
+    berikutnya, jadi setiap part tetap MarkdownV2 yang valid. Per part hanya window-nya yang di-scan,
+    dan teks biasa + escape dilewati regex di C; hanya marker entity yang diproses di Python.
+    """
+    if utf16_len(text) <= limit:
+        return [text]
+
+    parts = []
+    start = 0
+    opened = ()
+    while True:
+        prefix = ''.join(_OPEN[marker] for marker in opened)
+        budget = limit - len(prefix)
+        end = _window_end(text, start, budget)
+        if end >= len(text):
+            parts.append(prefix + text[start:])
+            return parts
+
+        if markdown:
+            ends, stacks = _scan(text, start, end, opened)
+        else:
+            ends, stacks = [], [()]
+        cut = _find_cut(text, start, end, budget, ends, stacks, markdown)
+        if cut is not None:
+            body_end, stack = cut
+            resume = body_end + 1   # Separator (newline / spasi) tidak ikut dikirim
+        else:
+            body_end = _hard_cut(text, start, end, markdown)
+            stack = tuple(marker for marker in stacks[bisect_right(ends, body_end)] if marker in _CLOSE)
+            resume = body_end
+
+        parts.append(prefix + text[start:body_end] + ''.join(_CLOSE[marker] for marker in reversed(stack)))
+        start, opened = resume, stack
+
+def _find_cut(text, start, end, budget, ends, stacks, markdown):
+    """Newline terakhir yang aman di window, atau spasi jika tidak ada; return (pos, stack) atau None"""
+    for separator in ('\n', ' '):
+        pos = text.rfind(separator, start + 1, end)
+        while pos > start:
+            if not (markdown and _escaped(text, pos)):
+                stack = stacks[bisect_right(ends, pos)]
+                if _can_cut(stack, separator == '\n'):
+                    close = sum(len(_CLOSE[marker]) for marker in stack)
+                    if close == 0 or utf16_len(text[start:pos]) + close <= budget:
+                        return pos, stack
+            pos = text.rfind(separator, start + 1, pos)
+    return None
+
+def _hard_cut(text, start, end, markdown):
+    """Potong kata yang lebih panjang dari satu message, mundur supaya tidak di tengah escape / marker"""
+    if not markdown:
+        return end
+    end = max(start + 1, end - _HARD_CUT_RESERVE)
+    limit = max(start + 1, end - _HARD_CUT_RESERVE)
+    while end > limit and text[end - 1] in _NO_CUT_AFTER:
+        end -= 1
+    if end > start + 1 and _escaped(text, end):
+        end -= 1   # Jangan tinggalkan backslash escape sendirian di akhir part
+    return end
@@ -0,0 +1,314 @@
+# modules/utils/send_queue.py
+import time
+import logging
+import itertools
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from telegram.error import BadRequest, RetryAfter
+from telegram.ext import ExtBot
+from telegram.utils.helpers import DEFAULT_NONE
+
+# Prioritas antrean (angka kecil dilayani dulu)
+INTERACTIVE = 0   # Balasan langsung untuk command / tombol
+PROGRESS = 1      # Edit progress message dari job; edit lama untuk message yang sama digabung
+BULK = 2          # Output panjang dan kiriman dari job di background
+
+GLOBAL_RATE = 25.0        # Message per detik ke semua chat (limit Telegram ~30/s)
+GLOBAL_BURST = 25
+CHAT_RATE = 1.0           # Message per detik per private chat
+CHAT_BURST = 4
+GROUP_RATE = 20 / 60.0    # Group / channel: 20 message per menit
+GROUP_BURST = 5
+MAX_RETRY_AFTER = 3       # Berapa kali request diulang setelah RetryAfter sebelum error diteruskan
+ASYNC_WORKERS = 2         # Thread pengirim untuk edit fire-and-forget
+
+EDIT_ENDPOINTS = {'editMessageText', 'editMessageCaption', 'editMessageReplyMarkup', 'editMessageMedia'}
+UNLIMITED_ENDPOINTS = {'sendChatAction'}
+
+_local = threading.local()
+
+@contextmanager
+def send_options(priority=None, wait=None):
+    """Set prioritas / mode tunggu untuk semua kiriman dari thread ini di dalam blok with"""
+    previous = (getattr(_local, 'priority', None), getattr(_local, 'wait', None))
+    if priority is not None:
+        _local.priority = priority
+    if wait is not None:
+        _local.wait = wait
+    try:
+        yield
+    finally:
+        _local.priority, _local.wait = previous
+
+def is_limited(endpoint):
+    """Endpoint yang dihitung flood limit Telegram (kirim / edit message)"""
+    if endpoint in UNLIMITED_ENDPOINTS:
+        return False
+    return endpoint.startswith(('send', 'edit')) or endpoint in ('copyMessage', 'forwardMessage')
+
+class TokenBucket:
+    """Token bucket sederhana dengan blokir sementara untuk RetryAfter"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.stamp = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now):
+        if now > self.stamp:
+            self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+
+    def delay(self, now):
+        """Detik sampai satu token tersedia (0 = bisa kirim sekarang)"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+    def block(self, seconds, now):
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 1.0   # Tepat satu kiriman boleh jalan begitu blokir selesai
+        self.stamp = max(self.stamp, self.blocked_until)
+
+class _Request:
+    """Satu kiriman yang menunggu giliran di SendQueue"""
+
+    __slots__ = ('priority', 'seq', 'chat_id', 'key', 'send', 'retry', 'wait',
+                 'attempts', 'granted', 'superseded')
+
+    def __init__(self, priority, seq, chat_id, key, send, retry, wait):
+        self.priority = priority
+        self.seq = seq
+        self.chat_id = chat_id
+        self.key = key
+        self.send = send
+        self.retry = retry
+        self.wait = wait
+        self.attempts = 0
+        self.granted = False
+        self.superseded = False
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+class SendQueue:
+    """Antrean pusat untuk semua kiriman ke Telegram.
+
+    Setiap request harus mendapat token dari bucket global dan bucket chat-nya. Yang menunggu
+    dilayani urut prioritas (interaktif > progress > bulk), RetryAfter memblokir bucket yang kena
+    lalu request diantrekan ulang, dan edit yang belum terkirim digantikan edit terbaru untuk
+    message yang sama.
+
+    Request biasa tetap jalan di thread pemanggil (return value dan exception seperti biasa);
+    thread scheduler hanya membagi giliran.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._pending_edits = {}   # key edit -> request yang masih menunggu
+        self._in_flight = set()    # key edit yang sedang dikirim (edit berikutnya harus menunggu)
+        self._global = TokenBucket(GLOBAL_RATE, GLOBAL_BURST)
+        self._chats = {}
+        self._seq = itertools.count()
+        self._executor = ThreadPoolExecutor(max_workers=ASYNC_WORKERS, thread_name_prefix='send')
+        self._scheduler = None
+        self.collapsed = 0
+        self.retried = 0
+
+    def call(self, endpoint, data, send, retry=True):
+        """Jalankan send() setelah dapat giliran. Return hasil send(), atau True untuk edit async / digantikan"""
+        priority = getattr(_local, 'priority', None)
+        if priority is None:
+            priority = INTERACTIVE
+        key = None
+        wait = True
+        if endpoint in EDIT_ENDPOINTS:
+            if priority == BULK:
+                priority = PROGRESS
+            key = data.get('inline_message_id') or (data.get('chat_id'), data.get('message_id'))
+            wait = getattr(_local, 'wait', None) is not False
+
+        request = self._enqueue(priority, data.get('chat_id'), key, send, retry, wait)
+        if not wait:
+            return True
+        while True:
+            with self._cond:
+                while not (request.granted or request.superseded):
+                    self._cond.wait()
+            if request.superseded:
+                return True
+            finished, result = self._attempt(request)
+            if finished:
+                return result
+
+    def _enqueue(self, priority, chat_id, key, send, retry, wait):
+        with self._cond:
+            self._ensure_scheduler()
+            seq = next(self._seq)
+            previous = self._pending_edits.get(key) if key is not None else None
+            if previous is not None:
+                # Edit lama belum terkirim: buang, edit baru mengambil tempatnya di antrean
+                previous.superseded = True
+                self._waiting.remove(previous)
+                priority = min(priority, previous.priority)
+                seq = previous.seq
+                self.collapsed += 1
+            request = _Request(priority, seq, chat_id, key, send, retry, wait)
+            if key is not None:
+                self._pending_edits[key] = request
+            self._waiting.append(request)
+            self._cond.notify_all()
+            return request
+
+    def _attempt(self, request):
+        """Kirim request yang sudah dapat giliran; return (selesai, hasil)"""
+        try:
+            result = request.send()
+        except RetryAfter as e:
+            self._penalize(request.chat_id, e.retry_after)
+            if request.retry and request.attempts < MAX_RETRY_AFTER:
+                request.attempts += 1
+                self.retried += 1
+                self._requeue(request)
+                return False, None
+            self._release(request)
+            raise
+        except BaseException:
+            self._release(request)
+            raise
+        self._release(request)
+        return True, result
+
+    def _attempt_async(self, request):
+        try:
+            self._attempt(request)
+        except BadRequest as e:
+            if 'not modified' not in str(e).lower():
+                self.logger.error(f"Queued edit failed: {e}")
+        except Exception as e:
+            self.logger.error(f"Queued edit failed: {e}")
+
+    def _requeue(self, request):
+        with self._cond:
+            self._in_flight.discard(request.key)
+            request.granted = False
+            if request.key is not None:
+                newer = self._pending_edits.get(request.key)
+                if newer is not None:
+                    # Sudah ada edit yang lebih baru untuk message ini, yang lama tidak perlu diulang
+                    request.superseded = True
+                    self._cond.notify_all()
+                    return
+                self._pending_edits[request.key] = request
+            self._waiting.append(request)
+            self._cond.notify_all()
+
+    def _release(self, request):
+        with self._cond:
+            self._in_flight.discard(request.key)
+            self._cond.notify_all()
+
+    def _penalize(self, chat_id, seconds):
+        now = time.monotonic()
+        with self._cond:
+            if chat_id is None:
+                self._global.block(seconds, now)
+            else:
+                self._bucket(chat_id).block(seconds, now)
+            self._cond.notify_all()
+        self.logger.warning(f"Flood limit hit (chat {chat_id}), pausing sends for {seconds}s")
+
+    def _bucket(self, chat_id):
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            group = isinstance(chat_id, str) or (isinstance(chat_id, int) and chat_id < 0)
+            if group:
+                bucket = TokenBucket(GROUP_RATE, GROUP_BURST)
+            else:
+                bucket = TokenBucket(CHAT_RATE, CHAT_BURST)
+            self._chats[chat_id] = bucket
+        return bucket
+
+    def _ensure_scheduler(self):
+        """Start thread scheduler saat request pertama (dipanggil dengan lock)"""
+        if self._scheduler is None:
+            self._scheduler = threading.Thread(target=self._schedule_loop, name='send-queue', daemon=True)
+            self._scheduler.start()
+
+    def _schedule_loop(self):
+        with self._cond:
+            while True:
+                wake = self._grant(time.monotonic())
+                self._cond.wait(timeout=wake)
+
+    def _grant(self, now):
+        """Beri giliran ke request yang bucket-nya punya token; return detik sampai perlu dicek lagi"""
+        wake = None
+        blocked_chats = set()
+        granted = False
+        for request in sorted(self._waiting):
+            if request.key is not None and request.key in self._in_flight:
+                continue
+            if request.chat_id in blocked_chats:
+                continue  # Urutan per chat dijaga: request chat ini yang lebih penting masih menunggu
+
+            global_delay = self._global.delay(now)
+            if global_delay > 0:
+                wake = global_delay if wake is None else min(wake, global_delay)
+                break
+            bucket = self._bucket(request.chat_id) if request.chat_id is not None else None
+            chat_delay = bucket.delay(now) if bucket is not None else 0.0
+            if chat_delay > 0:
+                blocked_chats.add(request.chat_id)
+                wake = chat_delay if wake is None else min(wake, chat_delay)
+                continue
+
+            if bucket is not None:
+                bucket.take(now)
+            self._global.take(now)
+            self._waiting.remove(request)
+            if request.key is not None:
+                self._in_flight.add(request.key)
+                if self._pending_edits.get(request.key) is request:
+                    del self._pending_edits[request.key]
+            request.granted = True
+            granted = True
+            if not request.wait:
+                self._executor.submit(self._attempt_async, request)
+
+        if granted:
+            self._cond.notify_all()
+        return wake
+
+class QueuedBot(ExtBot):
+    """ExtBot yang melewatkan semua send* / edit* ke SendQueue bersama"""
+
+    def _post(self, endpoint, data=None, timeout=DEFAULT_NONE, api_kwargs=None):
+        if not is_limited(endpoint):
+            return super()._post(endpoint, data, timeout, api_kwargs)
+        post = super()._post
+        data = {} if data is None else data
+        return get_send_queue().call(endpoint, data, lambda: post(endpoint, data, timeout, api_kwargs))
+
+_shared_queue = None
+_shared_lock = threading.Lock()
+
+def get_send_queue():
+    """SendQueue bersama untuk semua modul"""
+    global _shared_queue
+    with _shared_lock:
+        if _shared_queue is None:
+            _shared_queue = SendQueue()
+        return _shared_queue
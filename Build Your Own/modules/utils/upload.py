@@ -0,0 +1,130 @@
+# modules/utils/upload.py
+import io
+import os
+import json
+import uuid
+import logging
+import mimetypes
+from telegram import Message
+from telegram.vendor.ptb_urllib3 import urllib3
+from modules.utils.bot_api import get_bot_api
+from modules.utils.send_queue import get_send_queue
+
+UPLOAD_CHUNK = 256 * 1024   # Ukuran chunk yang dibaca dari disk dan ditulis ke socket
+UPLOAD_TIMEOUT = 300        # Read timeout default untuk upload file besar
+
+METHODS = {
+    'document': 'sendDocument',
+    'video': 'sendVideo',
+    'photo': 'sendPhoto',
+    'audio': 'sendAudio',
+}
+
+def _stream_length(file_obj):
+    """Sisa bytes yang akan dibaca dari file_obj (FileSlice, file biasa, atau BytesIO)"""
+    if hasattr(file_obj, 'length') and hasattr(file_obj, 'offset'):
+        return file_obj.length
+    if isinstance(file_obj, io.BytesIO):
+        return file_obj.getbuffer().nbytes - file_obj.tell()
+    try:
+        return os.fstat(file_obj.fileno()).st_size - file_obj.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        position = file_obj.tell()
+        end = file_obj.seek(0, os.SEEK_END)
+        file_obj.seek(position)
+        return end - position
+
+def _form_value(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if hasattr(value, 'to_json'):
+        return value.to_json()
+    return str(value)
+
+class StreamingUpload:
+    """Kirim file ke Bot API dengan body multipart yang di-stream dari disk.
+
+    InputFile di python-telegram-bot 13 membaca seluruh file ke memory lalu meng-encode body
+    multipart (salinan kedua). Di sini body dibangun sebagai generator chunk dengan Content-Length
+    yang dihitung di depan, jadi memory tetap sebesar satu chunk berapa pun ukuran file.
+    """
+
+    def __init__(self, bot, chunk_size=UPLOAD_CHUNK):
+        self.bot = bot
+        self.chunk_size = chunk_size
+        self.logger = logging.getLogger(__name__)
+
+    def send(self, kind, chat_id, file_obj, filename=None, timeout=UPLOAD_TIMEOUT, **params):
+        """Upload file_obj sebagai media `kind` ('document', 'video', ...) dan return Message"""
+        filename = filename or os.path.basename(getattr(file_obj, 'name', '') or kind)
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        boundary = uuid.uuid4().hex
+        fields = {'chat_id': chat_id}
+        fields.update({key: value for key, value in params.items() if value is not None})
+
+        head = b''.join(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode('utf-8')
+            + _form_value(value).encode('utf-8') + b'\r\n'
+            for name, value in fields.items()
+        )
+        safe_name = filename.replace('\\', '\\\\').replace('"', '\\"')
+        head += (
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{kind}"; filename="{safe_name}"\r\n'
+            f'Content-Type: {mimetype}\r\n\r\n'
+        ).encode('utf-8')
+        tail = f'\r\n--{boundary}--\r\n'.encode('utf-8')
+        length = _stream_length(file_obj)
+
+        def body():
+            yield head
+            remaining = length
+            while remaining > 0:
+                data = file_obj.read(min(self.chunk_size, remaining))
+                if not data:
+                    raise IOError(f"{filename} shrank while uploading")
+                remaining -= len(data)
+                yield data
+            yield tail
+
+        request = self.bot.request
+        url = f"{self.bot.base_url}/{METHODS[kind]}"
+
+        def post():
+            # _request_wrapper memetakan status HTTP ke TelegramError (RetryAfter, BadRequest, ...)
+            return request._request_wrapper(
+                'POST', url,
+                body=body(),
+                headers={
+                    'Content-Type': f'multipart/form-data; boundary={boundary}',
+                    'Content-Length': str(len(head) + length + len(tail)),
+                },
+                timeout=urllib3.Timeout(connect=request._connect_timeout, read=timeout),
+                retries=False  # Generator body tidak bisa diulang
+            )
+
+        # Tetap antre di SendQueue seperti kiriman lain, tapi tanpa retry karena stream sudah terbaca
+        result = get_send_queue().call(METHODS[kind], fields, post, retry=False)
+        return Message.de_json(request._parse(result), self.bot)
+
+def streaming_reply(message, kind):
+    """Pengganti message.reply_<kind> yang meng-upload file dengan StreamingUpload.
+
+    file_id (str) tetap dikirim lewat method bawaan, jadi bisa dipakai sebagai send_method FileIdCache.
+    Dengan Bot API server lokal, file yang dibuka dari disk dikirim sebagai URI file:// tanpa di-upload.
+    """
+    fallback = getattr(message, f"reply_{kind}")
+    uploader = StreamingUpload(message.bot)
+    endpoint = get_bot_api()
+
+    def send(media, **kwargs):
+        if not isinstance(media, str):
+            media = endpoint.local_input(media) or media
+        if isinstance(media, str):
+            kwargs.pop('filename', None)
+            return fallback(media, **kwargs)
+        return uploader.send(kind, message.chat_id, media, **kwargs)
+
+    return send
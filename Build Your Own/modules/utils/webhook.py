@@ -0,0 +1,130 @@
+# modules/utils/webhook.py
+import hmac
+import json
+import queue
+import logging
+import secrets
+import threading
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from telegram import Update
+from telegram.error import TelegramError
+from telegram.ext import Updater
+
+UPDATE_QUEUE_SIZE = 256       # Update yang menunggu dispatcher; lebih dari ini webhook menjawab 503
+QUEUE_PUT_TIMEOUT = 2         # Detik menunggu slot kosong sebelum menyerah (Telegram akan kirim ulang)
+MAX_UPDATE_BYTES = 1024 * 1024
+MAX_CONNECTIONS = 10          # Koneksi paralel dari Telegram ke webhook (default Telegram 40)
+SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+
+def generate_secret():
+    """Secret token acak (karakter A-Z a-z 0-9 _ - seperti yang diterima Telegram)"""
+    return secrets.token_urlsafe(32)
+
+class WebhookRequestHandler(BaseHTTPRequestHandler):
+    """Terima POST update dari Telegram, validasi secret token, lalu masukkan ke antrean dispatcher"""
+
+    def do_POST(self):
+        server = self.server
+        if urlsplit(self.path).path != server.webhook_path:
+            self._reply(404)
+            return
+        token = self.headers.get(SECRET_HEADER, '')
+        if not hmac.compare_digest(token.encode(), server.secret.encode()):
+            server.logger.warning(f"Rejected webhook request from {self.client_address[0]}: bad secret token")
+            self._reply(403)
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            self._reply(411)
+            return
+        if length > MAX_UPDATE_BYTES:
+            self._reply(413)
+            return
+        try:
+            data = json.loads(self.rfile.read(length).decode('utf-8'))
+            update = Update.de_json(data, server.bot)
+        except (ValueError, TypeError, KeyError) as e:
+            server.logger.error(f"Invalid webhook payload: {e}")
+            self._reply(400)
+            return
+
+        try:
+            server.update_queue.put(update, timeout=QUEUE_PUT_TIMEOUT)
+        except queue.Full:
+            # Dispatcher tertinggal: tolak, Telegram mengirim ulang update ini nanti
+            server.logger.warning("Update queue full, asking Telegram to retry later")
+            self._reply(503)
+            return
+        self._reply(200)
+
+    def _reply(self, status):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        self.server.logger.debug(f"{self.client_address[0]} - {format % args}")
+
+class WebhookServer(ThreadingHTTPServer):
+    """HTTP listener lokal untuk webhook (di belakang reverse proxy / tunnel HTTPS atau Bot API server lokal)"""
+
+    daemon_threads = True
+
+    def __init__(self, address, path, secret, bot, update_queue):
+        super().__init__(address, WebhookRequestHandler)
+        self.webhook_path = path
+        self.secret = secret
+        self.bot = bot
+        self.update_queue = update_queue
+        self.logger = logging.getLogger(__name__)
+
+    def shutdown(self):
+        # Dipanggil Updater.stop() lewat updater.httpd
+        super().shutdown()
+        self.server_close()
+
+class WebhookUpdater(Updater):
+    """Updater yang bisa menerima update lewat webhook dengan http.server bawaan (tanpa tornado)"""
+
+    def start_local_webhook(self, url, listen='127.0.0.1', port=8443, secret=None):
+        """Buka listener, daftarkan webhook ke Telegram, lalu jalankan dispatcher.
+
+        Listener dibuka sebelum setWebhook supaya port yang terpakai langsung gagal; jika bind atau
+        setWebhook gagal, OSError / TelegramError diteruskan dan tidak ada thread yang sudah jalan,
+        jadi pemanggil bisa langsung fallback ke start_polling().
+        """
+        path = urlsplit(url).path or '/'
+        server = WebhookServer((listen, port), path, secret or generate_secret(), self.bot, self.update_queue)
+        try:
+            self.bot.set_webhook(url=url, secret_token=server.secret, max_connections=MAX_CONNECTIONS)
+        except Exception:
+            server.server_close()
+            raise
+
+        self.running = True
+        self.httpd = server
+        self.job_queue.start()
+        dispatcher_ready = threading.Event()
+        self._init_thread(self.dispatcher.start, "dispatcher", ready=dispatcher_ready)
+        self._init_thread(server.serve_forever, "webhook")
+        dispatcher_ready.wait()
+        return self.update_queue
+
+    def start_receiving(self, url, listen='127.0.0.1', port=8443, secret=None, polling_timeout=30, read_latency=5):
+        """Webhook jika url diisi, long polling jika kosong atau setup webhook gagal; return 'webhook' / 'polling'"""
+        logger = logging.getLogger(__name__)
+        if url:
+            try:
+                self.start_local_webhook(url, listen=listen, port=port, secret=secret)
+                logger.info(f"Receiving updates via webhook {url} (listening on {listen}:{port})")
+                return 'webhook'
+            except (TelegramError, OSError) as e:
+                logger.warning(f"Webhook setup failed ({e}), falling back to polling")
+
+        # start_polling menghapus webhook yang masih terdaftar sebelum mulai getUpdates
+        logger.info("Starting polling...")
+        self.start_polling(timeout=polling_timeout, read_latency=read_latency)
+        return 'polling'
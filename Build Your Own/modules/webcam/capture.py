@@ -5,6 +5,7 @@ import logging
 import cv2
 from telegram.ext import CommandHandler
 from modules.utils.decorators import log_function_call
+from modules.utils.dispatch import runs_on
 
 class WebcamCapture:
     """Handle webcam image capture"""
@@ -13,6 +14,7 @@ class WebcamCapture:
         self.auth = auth_handler
         self.logger = logging.getLogger(__name__)
     
+    @runs_on('device')
     @log_function_call
     def capture_image(self, update, context):
         """Capture image from webcam"""
@@ -7,7 +7,10 @@ import datetime
 import cv2
 from telegram.ext import CommandHandler
 from modules.utils.decorators import log_function_call
+from modules.utils.dispatch import runs_on
 from modules.utils.helpers import format_size
+from modules.utils.upload import streaming_reply
+from modules.utils.jobs import get_job_manager
 
 class WebcamVideo:
     """Handle webcam video recording"""
@@ -16,6 +19,7 @@ class WebcamVideo:
         self.auth = auth_handler
         self.logger = logging.getLogger(__name__)
         self.config = auth_handler.config
+        self.jobs = get_job_manager()
     
     def check_ffmpeg(self):
         """Check apakah ffmpeg tersedia di sistem"""
@@ -25,6 +29,13 @@ class WebcamVideo:
         except (subprocess.CalledProcessError, FileNotFoundError):
             return False
     
+    def start_recording(self, update, context):
+        """Rekam + encode di job manager supaya dispatcher tidak terblokir selama ffmpeg jalan"""
+        if any(job.resource == 'device' for job in self.jobs.active_jobs()):
+            update.message.reply_text("⏳ Webcam sedang dipakai, rekaman akan dimulai setelah job sebelumnya selesai.")
+        self.jobs.submit("Webcam video", lambda job: self.record_video(update, context),
+                         resource='device', chat_id=update.effective_chat.id)
+    
     @log_function_call
     def record_video(self, update, context):
         """Record video dari webcam"""
@@ -95,7 +106,7 @@ class WebcamVideo:
                 with open(temp_filename, 'rb') as video:
                     file_size = format_size(os.path.getsize(temp_filename))
                     caption = f"🎬 Video webcam (10 detik) dengan audio!\n📦 Size: {file_size}\n📱 Mobile-friendly format"
-                    update.message.reply_video(
+                    streaming_reply(update.message, 'video')(
                         video,
                         caption=caption,
                         supports_streaming=True
@@ -141,7 +152,7 @@ class WebcamVideo:
                     with open(temp_filename, 'rb') as video:
                         file_size = format_size(os.path.getsize(temp_filename))
                         caption = f"🎬 Video webcam (10 detik, tanpa audio)\n📦 Size: {file_size}\n📱 Mobile-friendly format"
-                        update.message.reply_video(
+                        streaming_reply(update.message, 'video')(
                             video,
                             caption=caption,
                             supports_streaming=True
@@ -241,7 +252,7 @@ class WebcamVideo:
                     with open(temp_filename_final, 'rb') as video:
                         file_size = format_size(os.path.getsize(temp_filename_final))
                         caption = f"🎬 Video webcam (OpenCV + mobile encoding)\n📦 Size: {file_size}\n📱 Mobile-friendly format"
-                        update.message.reply_video(
+                        streaming_reply(update.message, 'video')(
                             video,
                             caption=caption,
                             supports_streaming=True
@@ -263,6 +274,7 @@ class WebcamVideo:
                 except:
                     pass
     
+    @runs_on('device')
     @log_function_call
     def detect_devices(self, update, context):
         """Command untuk mendeteksi nama device video dan audio yang tersedia"""
@@ -407,7 +419,7 @@ class WebcamVideo:
     
     def register_handlers(self, dispatcher):
         """Register webcam video handlers"""
-        dispatcher.add_handler(CommandHandler('webcamvideo', self.auth.require_auth(self.record_video)))
+        dispatcher.add_handler(CommandHandler('webcamvideo', self.auth.require_auth(self.start_recording)))
         dispatcher.add_handler(CommandHandler('detectdevices', self.auth.require_auth(self.detect_devices)))
         
         self.logger.info("Webcam video handlers registered")
\ No newline at end of file
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# Jalankan dari folder "Build Your Own": python -m pytest -q tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,100 @@
+# tests/test_dispatch.py
+import time
+import datetime
+import threading
+from queue import Queue
+from telegram import Update, Message, MessageEntity, Chat, User
+from telegram.ext import Defaults, ExtBot, CommandHandler, ConversationHandler, MessageHandler, Filters
+from modules.utils.dispatch import CategoryDispatcher, runs_on
+
+SLOW_STEP = 1.0
+
+class Recorder:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.events = []
+        self.lock = threading.Lock()
+
+    def mark(self, name):
+        with self.lock:
+            self.events.append((name, time.monotonic() - self.started))
+
+    def at(self, name, timeout=5):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self.lock:
+                for event, when in self.events:
+                    if event == name:
+                        return when
+            time.sleep(0.01)
+        raise AssertionError(f"{name} never happened: {self.events}")
+
+def make_update(bot, update_id, chat_id, text):
+    entities = []
+    if text.startswith('/'):
+        entities = [MessageEntity(MessageEntity.BOT_COMMAND, 0, len(text.split()[0]))]
+    message = Message(update_id, datetime.datetime.now(), Chat(chat_id, Chat.PRIVATE),
+                      from_user=User(chat_id, 'user', False), text=text, entities=entities, bot=bot)
+    return Update(update_id, message=message)
+
+def start_dispatcher(recorder):
+    bot = ExtBot('123456:' + 'A' * 35, defaults=Defaults(run_async=True))
+    bot._bot = User(1, 'bot', True, username='test_bot')  # Tanpa getMe ke Telegram
+    dispatcher = CategoryDispatcher(bot, Queue())
+
+    @runs_on('disk')
+    def slow_entry(update, context):
+        recorder.mark('entry start')
+        time.sleep(SLOW_STEP)  # Seperti list_directory di network drive
+        recorder.mark('entry end')
+        return 1
+
+    def answer(update, context):
+        recorder.mark(f"answer {update.message.text}")
+        return ConversationHandler.END
+
+    dispatcher.add_handler(ConversationHandler(
+        entry_points=[CommandHandler('browse', slow_entry)],
+        states={1: [MessageHandler(Filters.text & ~Filters.command, answer)]},
+        fallbacks=[]
+    ))
+    dispatcher.add_handler(CommandHandler('ping', lambda update, context: recorder.mark(
+        f"ping {update.effective_chat.id}")))
+
+    thread = threading.Thread(target=dispatcher.start, daemon=True)
+    thread.start()
+    return dispatcher, thread
+
+def test_slow_conversation_step_does_not_delay_other_chats():
+    recorder = Recorder()
+    dispatcher, thread = start_dispatcher(recorder)
+    try:
+        dispatcher.update_queue.put(make_update(dispatcher.bot, 1, 100, '/browse'))
+        recorder.at('entry start')
+        dispatcher.update_queue.put(make_update(dispatcher.bot, 2, 100, 'C:\\Data'))   # Balasan cepat di chat A
+        dispatcher.update_queue.put(make_update(dispatcher.bot, 3, 200, '/ping'))      # Command di chat B
+
+        ping_b = recorder.at('ping 200')
+        entry_end = recorder.at('entry end')
+        assert ping_b < entry_end - SLOW_STEP / 2, recorder.events
+
+        # Balasan chat A tidak dibuang: diproses setelah langkah entry selesai, dengan state baru
+        assert recorder.at('answer C:\\Data') >= entry_end
+    finally:
+        dispatcher.stop()
+        thread.join(timeout=5)
+
+def test_held_chat_keeps_update_order():
+    recorder = Recorder()
+    dispatcher, thread = start_dispatcher(recorder)
+    try:
+        dispatcher.update_queue.put(make_update(dispatcher.bot, 1, 100, '/browse'))
+        dispatcher.update_queue.put(make_update(dispatcher.bot, 2, 100, 'first'))
+        dispatcher.update_queue.put(make_update(dispatcher.bot, 3, 100, '/ping'))
+
+        answered = recorder.at('answer first')
+        assert recorder.at('ping 100') >= answered
+        assert 'answer /ping' not in [event for event, _ in recorder.events]
+    finally:
+        dispatcher.stop()
+        thread.join(timeout=5)
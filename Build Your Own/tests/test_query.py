@@ -0,0 +1,21 @@
+# tests/test_query.py
+from modules.file_manager.query import SearchQuery, split_terms
+
+def test_regex_keeps_backslashes():
+    query = SearchQuery(r're:^IMG_\d+')
+    test, = query.name_tests
+    assert test('IMG_0042.jpg')
+    assert not test('IMG_d.jpg')
+
+def test_windows_path_glob_keeps_separators():
+    query = SearchQuery(r'path:C:\Users\me\*.txt')
+    assert query.path_segments == ['c:', 'users', 'me', '*.txt']
+
+def test_relative_windows_path_glob_matches_and_prunes():
+    query = SearchQuery(r'path:src\**\*.py')
+    assert query.match_name('b.py', False, 'src\\a\\b.py', 3)
+    assert query.should_descend('src\\a', 2)
+    assert not query.should_descend('docs', 1)
+
+def test_plain_windows_path_term_is_kept():
+    assert split_terms(r'C:\temp "My Files\x.txt"') == ['C:\\temp', 'My Files\\x.txt']
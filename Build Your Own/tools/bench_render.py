@@ -0,0 +1,96 @@
+# tools/bench_render.py
+"""Microbenchmark escape / template / split MarkdownV2 (modules/utils/render.py).
+
+Jalankan dari folder "Build Your Own":
+    python tools/bench_render.py [--repeat 15]
+
+Versi lama (list comprehension, regex caption, splitter per baris) disalin di sini sebagai pembanding,
+bersama str.translate yang sempat diusulkan. Angka = waktu terbaik dari --repeat ulangan.
+"""
+import os
+import re
+import sys
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.utils import render
+
+MD_SPECIAL = '_*[]()~`>#+-=|{}.!\\'
+_TRANSLATE_TABLE = str.maketrans({char: '\\' + char for char in MD_SPECIAL})
+_CAPTION_PATTERN = re.compile(r'([_\*\[\]\(\)~`>#+\-=|{}\.!])')
+
+def escape_list_comprehension(text):
+    """helpers.escape_md sebelum render.py"""
+    return ''.join(['\\' + c if c in MD_SPECIAL else c for c in str(text)])
+
+def escape_regex(text):
+    """helpers.escape_md_caption sebelum render.py (tidak meng-escape backslash)"""
+    return _CAPTION_PATTERN.sub(r'\\\1', str(text))
+
+def escape_translate(text):
+    return str(text).translate(_TRANSLATE_TABLE)
+
+def split_by_lines(message, max_length=render.MAX_MESSAGE_LENGTH):
+    """Splitter send_long_message sebelum render.py (menghitung code point, bisa memotong escape)"""
+    parts = []
+    current_part = ""
+    for line in message.split('\n'):
+        if len(current_part) + len(line) + 1 > max_length:
+            if current_part:
+                parts.append(current_part)
+                current_part = line
+            else:
+                while len(line) > max_length:
+                    parts.append(line[:max_length])
+                    line = line[max_length:]
+                current_part = line
+        elif current_part:
+            current_part += "\n" + line
+        else:
+            current_part = line
+    if current_part:
+        parts.append(current_part)
+    return parts
+
+def best(func, number, repeat):
+    """Waktu terbaik per panggilan dalam ms"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e3
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=15)
+    args = parser.parse_args()
+
+    names = [f"IMG_{i:05d} (copy).final-v2.jpg" for i in range(500)]
+    long_text = "\n".join(names + [f"Document {i} final report" for i in range(500)]) * 20
+    for escape in (escape_list_comprehension, escape_translate):
+        assert escape(long_text) == render.escape_md(long_text)
+
+    print("escape")
+    for label, escape in (("list comprehension (old)", escape_list_comprehension),
+                          ("regex caption (old)", escape_regex),
+                          ("str.translate", escape_translate),
+                          ("chained str.replace (render)", render.escape_md)):
+        per_name = best(lambda: [escape(name) for name in names], 20, args.repeat)
+        per_text = best(lambda: escape(long_text), 3, args.repeat)
+        print(f"  {label:30s} 500 names {per_name:7.3f} ms   {len(long_text) // 1000} kB {per_text:7.2f} ms")
+
+    print("listing rows")
+    old_rows = best(lambda: [escape_list_comprehension(f"📄 {name} (1.2 MB, 3 days ago)") for name in names],
+                    20, args.repeat)
+    new_rows = best(lambda: [render.LISTING_FILE.render(name=name, size='1.2 MB', modified='3 days ago')
+                             for name in names], 20, args.repeat)
+    print(f"  {'f-string + escape (old)':30s} 500 rows {old_rows:7.3f} ms")
+    print(f"  {'Template (render)':30s} 500 rows {new_rows:7.3f} ms")
+
+    print("split")
+    for copies in (2, 40):
+        message = "\n".join(render.escape_md(name) for name in names * copies)
+        old_split = best(lambda: split_by_lines(message), 3, args.repeat)
+        new_split = best(lambda: render.split_markdown(message), 3, args.repeat)
+        print(f"  {len(message) // 1000:4d} kB  per line (old) {old_split:7.2f} ms   split_markdown {new_split:7.2f} ms")
+
+if __name__ == '__main__':
+    main()
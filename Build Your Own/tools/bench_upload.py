@@ -0,0 +1,110 @@
+# tools/bench_upload.py
+"""Bandingkan peak RSS upload bot.send_document (InputFile PTB) dengan StreamingUpload (modules/utils/upload.py).
+
+Jalankan dari folder "Build Your Own":
+    python tools/bench_upload.py [--size-mb 45]
+
+Upload dikirim ke fake Bot API server lokal yang membaca body per chunk lalu membuangnya, jadi tidak
+ada yang keluar ke Telegram. Setiap mode jalan di proses baru; RSS di-sample setiap beberapa ms.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FAKE_TOKEN = '123456:' + 'A' * 35
+READ_CHUNK = 64 * 1024
+SAMPLE_INTERVAL = 0.002
+
+class FakeBotApi(BaseHTTPRequestHandler):
+    """Jawab sendDocument dengan Message palsu, body hanya dihitung panjangnya"""
+
+    def do_POST(self):
+        remaining = int(self.headers.get('Content-Length', 0))
+        self.server.received = remaining
+        while remaining > 0:
+            remaining -= len(self.rfile.read(min(READ_CHUNK, remaining)))
+        message = {'message_id': 1, 'date': 0, 'chat': {'id': 1, 'type': 'private'},
+                   'document': {'file_id': 'DOC', 'file_unique_id': 'DOC'}}
+        out = json.dumps({'ok': True, 'result': message}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, format, *args):
+        pass
+
+def run_mode(mode, path):
+    """Dijalankan di proses anak: upload sekali, print JSON {peak_mb, body_bytes, seconds}"""
+    import psutil
+    from telegram import Bot
+    from modules.utils.upload import StreamingUpload
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeBotApi)
+    server.received = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    bot = Bot(FAKE_TOKEN, base_url=f"http://127.0.0.1:{server.server_port}/bot")
+
+    process = psutil.Process()
+    baseline = process.memory_info().rss
+    peak = [baseline]
+    done = threading.Event()
+
+    def sample():
+        while not done.is_set():
+            peak[0] = max(peak[0], process.memory_info().rss)
+            time.sleep(SAMPLE_INTERVAL)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    started = time.monotonic()
+    with open(path, 'rb') as f:
+        if mode == 'ptb':
+            bot.send_document(1, f, filename='bench.bin', timeout=300)
+        else:
+            StreamingUpload(bot).send('document', 1, f, filename='bench.bin')
+    elapsed = time.monotonic() - started
+    done.set()
+    sampler.join()
+    server.shutdown()
+    print(json.dumps({'peak_mb': (peak[0] - baseline) / 1024 ** 2, 'body_bytes': server.received,
+                      'seconds': elapsed}))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=45)
+    parser.add_argument('--mode', choices=('ptb', 'stream'), help=argparse.SUPPRESS)
+    parser.add_argument('--file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.file)
+        return
+
+    fd, path = tempfile.mkstemp(suffix='.bin')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            block = os.urandom(1024 * 1024)
+            for _ in range(args.size_mb):
+                f.write(block)
+        print(f"upload {args.size_mb} MB document")
+        for mode, label in (('ptb', 'bot.send_document (InputFile)'), ('stream', 'StreamingUpload')):
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), '--mode', mode, '--file', path],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"  {label:32s} peak RSS +{result['peak_mb']:6.1f} MB   "
+                  f"body {result['body_bytes']:,} bytes   {result['seconds']:.2f} s")
+    finally:
+        os.remove(path)
+
+if __name__ == '__main__':
+    main()
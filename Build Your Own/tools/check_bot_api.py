@@ -0,0 +1,86 @@
+# tools/check_bot_api.py
+"""Cek pilihan file:// vs upload multipart (modules/utils/bot_api.py) terhadap stand-in Bot API server lokal.
+
+Jalankan dari folder "Build Your Own":
+    python tools/check_bot_api.py
+
+Dengan local mode aktif, path biasa dan file yang baru dibuka harus dikirim sebagai URI file://;
+FileSlice dan stream yang sudah dibaca sebagian harus tetap di-upload sebagai multipart.
+"""
+import os
+import sys
+import datetime
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from telegram import Bot, Chat, Message
+from modules.utils.bot_api import configure_bot_api
+from modules.utils.upload import streaming_reply
+from modules.utils.file_cache import FileIdCache
+from modules.file_manager.transfer import FileSlice
+from fake_bot_api import FakeBotApi, FAKE_TOKEN
+
+def make_message(endpoint):
+    bot = Bot(FAKE_TOKEN, base_url=endpoint.base_url, base_file_url=endpoint.base_file_url)
+    return Message(1, datetime.datetime.now(), Chat(1, Chat.PRIVATE), bot=bot)
+
+def last_send(api):
+    return api.calls_to('sendDocument')[-1]
+
+def expect_uri(api, path, label):
+    call = last_send(api)
+    assert not call.multipart, f"{label}: uploaded instead of file://"
+    assert call.fields['document'] == Path(path).resolve().as_uri(), call.fields
+    print(f"  {label:28s} -> {call.fields['document']}")
+
+def expect_upload(api, data, label):
+    call = last_send(api)
+    assert call.multipart, f"{label}: sent as {call.fields.get('document')!r} instead of multipart"
+    assert call.form_file('document') == data, f"{label}: uploaded body differs"
+    print(f"  {label:28s} -> multipart, {len(data)} bytes")
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp, FakeBotApi() as api:
+        path = os.path.join(tmp, 'report.bin')
+        data = os.urandom(4096)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+        print("local mode")
+        endpoint = configure_bot_api(api.url, True)
+        message = make_message(endpoint)
+        send = streaming_reply(message, 'document')
+
+        FileIdCache(Path(tmp) / 'local.db').send(send, path, 'document')
+        expect_uri(api, path, "plain path (FileIdCache)")
+
+        with open(path, 'rb') as f:
+            send(f)
+        expect_uri(api, path, "freshly opened file")
+
+        with FileSlice(path, 1000, 2000, 'report.bin.001') as part:
+            send(part, filename=part.name)
+        expect_upload(api, data[1000:3000], "FileSlice")
+
+        with open(path, 'rb') as f:
+            f.read(100)
+            send(f)
+        expect_upload(api, data[100:], "partially read stream")
+
+        print("cloud mode")
+        endpoint = configure_bot_api(api.url, False)
+        send = streaming_reply(make_message(endpoint), 'document')
+        FileIdCache(Path(tmp) / 'cloud.db').send(send, path, 'document')
+        expect_upload(api, data, "plain path (FileIdCache)")
+
+        with open(path, 'rb') as f:
+            send(f)
+        expect_upload(api, data, "freshly opened file")
+    configure_bot_api()
+    print("all Bot API checks passed")
+
+if __name__ == '__main__':
+    main()
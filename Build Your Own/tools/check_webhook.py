@@ -0,0 +1,147 @@
+# tools/check_webhook.py
+"""Cek mode webhook (modules/utils/webhook.py) terhadap stand-in Bot API server lokal.
+
+Jalankan dari folder "Build Your Own":
+    python tools/check_webhook.py
+
+Update di-POST ke listener dengan secret benar / salah, body terlalu besar dan tanpa Content-Length;
+lalu fallback ke polling dicek untuk port yang sudah terpakai dan setWebhook yang ditolak.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import http.client
+from queue import Queue
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from telegram.ext import CommandHandler, Defaults, ExtBot, JobQueue
+from modules.utils.dispatch import CategoryDispatcher
+from modules.utils.webhook import WebhookUpdater, SECRET_HEADER, MAX_UPDATE_BYTES
+from fake_bot_api import FakeBotApi, FAKE_TOKEN
+
+WEBHOOK_PATH = '/telegram'
+PING = {
+    'update_id': 1,
+    'message': {
+        'message_id': 1, 'date': 0, 'text': '/ping',
+        'chat': {'id': 5, 'type': 'private'},
+        'from': {'id': 5, 'is_bot': False, 'first_name': 'Owner'},
+        'entities': [{'type': 'bot_command', 'offset': 0, 'length': 5}],
+    },
+}
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def make_updater(api):
+    bot = ExtBot(FAKE_TOKEN, base_url=f"{api.url}/bot", defaults=Defaults(run_async=True))
+    job_queue = JobQueue()
+    dispatcher = CategoryDispatcher(bot, Queue(maxsize=8), job_queue=job_queue)
+    job_queue.set_dispatcher(dispatcher)
+    return WebhookUpdater(dispatcher=dispatcher, workers=None)
+
+def post(port, body=b'', headers=None, path=WEBHOOK_PATH, length=True):
+    """POST mentah (http.client) supaya Content-Length bisa dihilangkan; return status"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    try:
+        conn.putrequest('POST', path)
+        for name, value in (headers or {}).items():
+            conn.putheader(name, value)
+        if length is True:
+            conn.putheader('Content-Length', str(len(body)))
+        elif length is not None:
+            conn.putheader('Content-Length', str(length))
+        conn.endheaders(body if length is True else None)
+        return conn.getresponse().status
+    finally:
+        conn.close()
+
+def check_listener(api):
+    port = free_port()
+    updater = make_updater(api)
+    handled = []
+    updater.dispatcher.add_handler(CommandHandler('ping', lambda update, context: handled.append(update.update_id)))
+    url = f"http://127.0.0.1:{port}{WEBHOOK_PATH}"
+    mode = updater.start_receiving(url, port=port, secret='s3cret')
+    try:
+        assert mode == 'webhook', mode
+        registered = api.calls_to('setWebhook')[-1].fields
+        assert registered['url'] == url and registered['secret_token'] == 's3cret', registered
+
+        body = json.dumps(PING).encode()
+        good = {SECRET_HEADER: 's3cret', 'Content-Type': 'application/json'}
+        assert post(port, body, good) == 200
+        deadline = time.monotonic() + 5
+        while not handled and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert handled == [1], handled
+        print("  correct secret          -> 200, /ping handled")
+
+        assert post(port, body, {SECRET_HEADER: 'wrong'}) == 403
+        assert post(port, body, {}) == 403
+        print("  wrong / missing secret  -> 403")
+
+        assert post(port, headers=good, length=MAX_UPDATE_BYTES + 1) == 413
+        print("  oversized body          -> 413")
+
+        assert post(port, headers=good, length=None) == 411
+        print("  no Content-Length       -> 411")
+
+        assert post(port, body, good, path='/other') == 404
+        assert post(port, b'{not json', good) == 400
+        print("  wrong path / bad JSON   -> 404 / 400")
+    finally:
+        updater.stop()
+    try:
+        post(port, body, good)
+        raise AssertionError("listener still accepting after stop()")
+    except OSError:
+        print("  stop() closes the listener")
+
+def check_fallback(api, break_webhook, label):
+    port = free_port()
+    updater = make_updater(api)
+    polls = len(api.calls_to('getUpdates'))
+    blocker = break_webhook(port)
+    try:
+        mode = updater.start_receiving(f"http://127.0.0.1:{port}{WEBHOOK_PATH}", port=port,
+                                       polling_timeout=0.1, read_latency=0.1)
+        assert mode == 'polling', mode
+        deadline = time.monotonic() + 5
+        while len(api.calls_to('getUpdates')) == polls and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(api.calls_to('getUpdates')) > polls, "polling never started"
+        assert api.calls_to('deleteWebhook'), "stale webhook not removed before polling"
+        print(f"  {label:23s} -> falls back to polling")
+    finally:
+        updater.stop()
+        api.failures.clear()
+        if blocker is not None:
+            blocker.close()
+
+def occupy_port(port):
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', port))
+    sock.listen(1)
+    return sock
+
+def main():
+    with FakeBotApi() as api:
+        print("webhook listener")
+        check_listener(api)
+        print("fallback")
+        check_fallback(api, occupy_port, "port already in use")
+
+        def reject_webhook(port):
+            api.failures['setWebhook'] = 'Bad Request: bad webhook: HTTPS url must be provided for webhook'
+        check_fallback(api, reject_webhook, "setWebhook rejected")
+    print("all webhook checks passed")
+
+if __name__ == '__main__':
+    main()
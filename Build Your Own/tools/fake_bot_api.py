@@ -0,0 +1,116 @@
+# tools/fake_bot_api.py
+"""Stand-in Bot API server lokal untuk script di tools/ (tidak ada yang keluar ke Telegram).
+
+Setiap request dicatat sebagai FakeCall (method, content type, body, field JSON / form). Method
+yang ada di `failures` dijawab 400 dengan deskripsi tersebut.
+"""
+import re
+import sys
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+FAKE_TOKEN = '123456:' + 'A' * 35
+POLL_DELAY = 0.2
+
+class FakeCall:
+    """Satu request ke stand-in server"""
+
+    def __init__(self, method, content_type, body):
+        self.method = method
+        self.content_type = content_type
+        self.body = body
+        self.fields = {}
+        if content_type.startswith('application/json') and body:
+            self.fields = json.loads(body)
+        elif content_type.startswith('application/x-www-form-urlencoded') and body:
+            from urllib.parse import parse_qsl
+            self.fields = dict(parse_qsl(body.decode('utf-8')))
+
+    @property
+    def multipart(self):
+        return self.content_type.startswith('multipart/form-data')
+
+    def form_file(self, name):
+        """Part multipart `name` yang berisi file (punya filename), atau None"""
+        if not self.multipart:
+            return None
+        boundary = self.content_type.split('boundary=', 1)[-1].strip('"').encode()
+        pattern = re.compile(rb'name="' + re.escape(name.encode()) + rb'"; filename="[^"]*"\r\n'
+                             rb'(?:[^\r\n]+\r\n)*\r\n(.*?)\r\n--' + re.escape(boundary), re.DOTALL)
+        match = pattern.search(self.body)
+        return match.group(1) if match else None
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        server = self.server
+        method = self.path.rsplit('/', 1)[-1]
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0) or 0))
+        call = FakeCall(method, self.headers.get('Content-Type', ''), body)
+        with server.lock:
+            server.calls.append(call)
+
+        if method in server.failures:
+            self._json(400, {'ok': False, 'error_code': 400, 'description': server.failures[method]})
+            return
+        if method == 'getMe':
+            result = {'id': 1, 'is_bot': True, 'first_name': 'Fake', 'username': 'fake_bot'}
+        elif method == 'getUpdates':
+            time.sleep(POLL_DELAY)
+            result = []
+        elif method.startswith('send'):
+            result = {'message_id': len(server.calls), 'date': 0, 'chat': {'id': 1, 'type': 'private'}}
+            kind = method[4:].lower()
+            media = {'file_id': f"{kind}-id", 'file_unique_id': f"{kind}-unique"}
+            if kind == 'photo':
+                result['photo'] = [dict(media, width=1, height=1)]
+            elif kind in ('document', 'video', 'audio'):
+                result[kind] = dict(media, width=1, height=1, duration=1) if kind == 'video' else media
+        else:
+            result = True
+        self._json(200, {'ok': True, 'result': result})
+
+    def _json(self, status, payload):
+        out = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeBotApi(ThreadingHTTPServer):
+    """Jalankan dengan `with FakeBotApi() as api:`; api.url dipakai sebagai BOT_API_URL"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.calls = []
+        self.failures = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def calls_to(self, method):
+        with self.lock:
+            return [call for call in self.calls if call.method == method]
+
+    def handle_error(self, request, client_address):
+        # Bot yang berhenti di tengah long polling memutus koneksi: bukan error stand-in
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()